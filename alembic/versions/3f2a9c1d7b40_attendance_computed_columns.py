@@ -0,0 +1,95 @@
+"""attendance computed duration and lateness columns
+
+Revision ID: 3f2a9c1d7b40
+Revises: 
+Create Date: 2026-10-19 09:00:00
+
+"""
+from datetime import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b40'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Figés ici pour que la migration ne dépende pas du code applicatif
+MORNING_START = time(8, 0)
+AFTERNOON_START = time(14, 30)
+BATCH_SIZE = 1000
+
+attendance = sa.table(
+    "attendance",
+    sa.column("id", sa.Integer),
+    sa.column("morning_arrival", sa.DateTime),
+    sa.column("morning_departure", sa.DateTime),
+    sa.column("afternoon_arrival", sa.DateTime),
+    sa.column("afternoon_departure", sa.DateTime),
+    sa.column("worked_minutes", sa.Integer),
+    sa.column("late_minutes_morning", sa.Integer),
+    sa.column("late_minutes_afternoon", sa.Integer),
+)
+
+
+def _late_minutes(arrival, start):
+    if not arrival or arrival.time() <= start:
+        return 0
+    return (arrival.hour - start.hour) * 60 + arrival.minute - start.minute
+
+
+def _metrics(row):
+    worked_seconds = 0
+    if row.morning_arrival and row.morning_departure:
+        worked_seconds += (row.morning_departure - row.morning_arrival).total_seconds()
+    if row.afternoon_arrival and row.afternoon_departure:
+        worked_seconds += (row.afternoon_departure - row.afternoon_arrival).total_seconds()
+    return {
+        "row_id": row.id,
+        "worked_minutes": int(worked_seconds // 60),
+        "late_minutes_morning": _late_minutes(row.morning_arrival, MORNING_START),
+        "late_minutes_afternoon": _late_minutes(row.afternoon_arrival, AFTERNOON_START),
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("attendance") as batch_op:
+        batch_op.add_column(sa.Column("worked_minutes", sa.Integer(), nullable=True, server_default="0"))
+        batch_op.add_column(sa.Column("late_minutes_morning", sa.Integer(), nullable=True, server_default="0"))
+        batch_op.add_column(sa.Column("late_minutes_afternoon", sa.Integer(), nullable=True, server_default="0"))
+
+    # Backfill par lots, sur les lignes ayant au moins un pointage
+    bind = op.get_bind()
+    update = attendance.update().where(attendance.c.id == sa.bindparam("row_id")).values(
+        worked_minutes=sa.bindparam("worked_minutes"),
+        late_minutes_morning=sa.bindparam("late_minutes_morning"),
+        late_minutes_afternoon=sa.bindparam("late_minutes_afternoon"),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(attendance).where(
+                attendance.c.id > last_id,
+                sa.or_(
+                    attendance.c.morning_arrival.isnot(None),
+                    attendance.c.afternoon_arrival.isnot(None),
+                ),
+            ).order_by(attendance.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(update, [_metrics(row) for row in rows])
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("attendance") as batch_op:
+        batch_op.drop_column("late_minutes_afternoon")
+        batch_op.drop_column("late_minutes_morning")
+        batch_op.drop_column("worked_minutes")
@@ -0,0 +1,28 @@
+"""leaves (employee_id, start_date, end_date) index
+
+Revision ID: 5d8e0f3b6a21
+Revises: b7c41e2a9d15
+Create Date: 2026-10-19 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e0f3b6a21'
+down_revision: Union[str, Sequence[str], None] = 'b7c41e2a9d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_leaves_employee_period", "leaves", ["employee_id", "start_date", "end_date"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_leaves_employee_period", table_name="leaves")
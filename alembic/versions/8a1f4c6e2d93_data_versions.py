@@ -0,0 +1,37 @@
+"""data_versions table
+
+Revision ID: 8a1f4c6e2d93
+Revises: 5d8e0f3b6a21
+Create Date: 2026-10-19 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a1f4c6e2d93'
+down_revision: Union[str, Sequence[str], None] = '5d8e0f3b6a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Figé ici : la migration ne doit pas dépendre du code applicatif
+TRACKED_TABLES = ("employees", "attendance", "leaves", "holidays")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    data_versions = op.create_table(
+        "data_versions",
+        sa.Column("table_name", sa.String(length=50), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.bulk_insert(data_versions, [{"table_name": name, "version": 0} for name in TRACKED_TABLES])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("data_versions")
@@ -0,0 +1,86 @@
+"""leave balances ledger
+
+Revision ID: b7c41e2a9d15
+Revises: 3f2a9c1d7b40
+Create Date: 2026-10-19 10:00:00
+
+"""
+from datetime import date, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41e2a9d15'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ANNUAL_LEAVE_DAYS = 25
+DEDUCTED_LEAVE_TYPES = ("congé",)
+
+
+def _working_days_by_year(start, end, holidays):
+    counts = {}
+    current = start
+    while current <= end:
+        if current.weekday() < 5 and current.isoformat() not in holidays:
+            counts[current.year] = counts.get(current.year, 0) + 1
+        current += timedelta(days=1)
+    return counts
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    leave_balances = op.create_table(
+        "leave_balances",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("entitled_days", sa.Integer(), nullable=False),
+        sa.Column("taken_days", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["employee_id"], ["employees.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("employee_id", "year", name="uq_leave_balances_employee_year"),
+    )
+    op.create_index("ix_leave_balances_id", "leave_balances", ["id"])
+
+    # Reconstituer les soldes à partir des congés déjà approuvés
+    bind = op.get_bind()
+    holiday_rows = bind.execute(sa.text("SELECT date, is_recurring FROM holidays")).all()
+    leaves = bind.execute(sa.text(
+        "SELECT employee_id, start_date, end_date, leave_type FROM leaves WHERE status = 'approved'"
+    )).all()
+
+    taken = {}
+    for employee_id, start_date, end_date, leave_type in leaves:
+        if leave_type not in DEDUCTED_LEAVE_TYPES:
+            continue
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        holidays = set()
+        for holiday_date, is_recurring in holiday_rows:
+            if is_recurring:
+                holidays.update(f"{year}{holiday_date[4:]}" for year in range(start.year, end.year + 1))
+            else:
+                holidays.add(holiday_date)
+        for year, days in _working_days_by_year(start, end, holidays).items():
+            taken[(employee_id, year)] = taken.get((employee_id, year), 0) + days
+
+    if taken:
+        op.bulk_insert(leave_balances, [
+            {
+                "employee_id": employee_id,
+                "year": year,
+                "entitled_days": ANNUAL_LEAVE_DAYS,
+                "taken_days": days,
+            }
+            for (employee_id, year), days in taken.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_leave_balances_id", table_name="leave_balances")
+    op.drop_table("leave_balances")
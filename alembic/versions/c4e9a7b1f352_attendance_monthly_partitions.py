@@ -0,0 +1,98 @@
+"""attendance monthly partitions
+
+Revision ID: c4e9a7b1f352
+Revises: 8a1f4c6e2d93
+Create Date: 2026-10-19 17:00:00
+
+PostgreSQL : attendance devient une table partitionnée par mois
+(PARTITION BY RANGE (date)) ; les lignes existantes y sont recopiées.
+Les partitions suivantes sont créées d'avance par app.utils.partitions.
+SQLite : pas de partitionnement natif, index (date, employee_id) seulement.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e9a7b1f352'
+down_revision: Union[str, Sequence[str], None] = '8a1f4c6e2d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Figé ici : la migration ne doit pas dépendre du code applicatif
+MONTHS_AHEAD = 3
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.create_index("ix_attendance_date_employee", "attendance", ["date", "employee_id"])
+        return
+
+    # Les noms d'index (clé primaire comprise) sont uniques par schéma : on libère ceux d'origine
+    op.execute("ALTER TABLE attendance RENAME TO attendance_unpartitioned")
+    op.execute("ALTER TABLE attendance_unpartitioned RENAME CONSTRAINT attendance_pkey TO attendance_unpartitioned_pkey")
+    op.execute("ALTER INDEX IF EXISTS ix_attendance_id RENAME TO ix_attendance_unpartitioned_id")
+    op.execute(
+        "CREATE TABLE attendance (LIKE attendance_unpartitioned INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (date)"
+    )
+    # La clé primaire d'une table partitionnée doit contenir la clé de partition
+    op.execute("ALTER TABLE attendance ADD PRIMARY KEY (id, date)")
+    op.execute(
+        "ALTER TABLE attendance ADD CONSTRAINT attendance_employee_id_fkey "
+        "FOREIGN KEY (employee_id) REFERENCES employees (id)"
+    )
+    op.create_index("ix_attendance_id", "attendance", ["id"])
+    op.create_index("ix_attendance_date_employee", "attendance", ["date", "employee_id"])
+
+    # Une partition par mois, des données existantes jusqu'à MONTHS_AHEAD mois d'avance
+    first = bind.execute(sa.text("SELECT min(date) FROM attendance_unpartitioned")).scalar()
+    today = date.today()
+    month = _add_months(date.fromisoformat(first) if first else today, 0)
+    last = _add_months(today, MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE attendance_p{month:%Y_%m} PARTITION OF attendance "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    # Filet de sécurité : les dates hors des partitions mensuelles ne font pas échouer l'insertion
+    op.execute("CREATE TABLE attendance_default PARTITION OF attendance DEFAULT")
+
+    op.execute("INSERT INTO attendance SELECT * FROM attendance_unpartitioned")
+    op.execute("ALTER SEQUENCE IF EXISTS attendance_id_seq OWNED BY attendance.id")
+    op.execute("DROP TABLE attendance_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.drop_index("ix_attendance_date_employee", table_name="attendance")
+        return
+
+    op.execute("ALTER TABLE attendance RENAME TO attendance_partitioned")
+    op.execute("ALTER TABLE attendance_partitioned RENAME CONSTRAINT attendance_pkey TO attendance_partitioned_pkey")
+    op.execute("ALTER INDEX ix_attendance_id RENAME TO ix_attendance_partitioned_id")
+    op.execute("ALTER INDEX ix_attendance_date_employee RENAME TO ix_attendance_partitioned_date_employee")
+    op.execute("CREATE TABLE attendance (LIKE attendance_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE attendance ADD PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE attendance ADD CONSTRAINT attendance_employee_id_fkey "
+        "FOREIGN KEY (employee_id) REFERENCES employees (id)"
+    )
+    op.create_index("ix_attendance_id", "attendance", ["id"])
+    op.execute("INSERT INTO attendance SELECT * FROM attendance_partitioned")
+    op.execute("ALTER SEQUENCE IF EXISTS attendance_id_seq OWNED BY attendance.id")
+    op.execute("DROP TABLE attendance_partitioned CASCADE")
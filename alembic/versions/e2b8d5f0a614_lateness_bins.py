@@ -0,0 +1,39 @@
+"""lateness bins
+
+Revision ID: e2b8d5f0a614
+Revises: c4e9a7b1f352
+Create Date: 2026-10-19 19:00:00
+
+Intervalles DDSketch des minutes de retard par service, par jour et par mois.
+Les pointages existants (archives comprises) sont repris par
+`python lateness_rollup.py` après la migration.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8d5f0a614'
+down_revision: Union[str, Sequence[str], None] = 'c4e9a7b1f352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "lateness_bins",
+        sa.Column("service", sa.String(length=50), nullable=False),
+        sa.Column("granularity", sa.String(length=5), nullable=False),
+        sa.Column("period", sa.String(length=10), nullable=False),
+        sa.Column("bin", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("service", "granularity", "period", "bin"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("lateness_bins")
@@ -0,0 +1,35 @@
+# analytics_snapshot.py
+"""Exporte la table attendance en Parquet pour le moteur analytique DuckDB.
+
+Usage : python analytics_snapshot.py
+
+Le fichier est écrit dans ANALYTICS_SNAPSHOT_DIR, là où le moteur analytique
+le lit (variable d'environnement ou .env, défaut ./archive/snapshot).
+
+À planifier (cron, toutes les heures par exemple) quand ANALYTICS_BACKEND=duckdb
+lit l'instantané (ANALYTICS_SOURCE=parquet, ou base PostgreSQL). Les chiffres
+analytiques reflètent la table au moment du dernier export.
+"""
+import argparse
+import sys
+
+sys.path.append('.')
+
+from app.database import SessionLocal
+from app.utils.analytics import export_snapshot, snapshot_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = export_snapshot(db)
+    finally:
+        db.close()
+    print(f"✅ {count} pointages exportés vers {snapshot_path()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# app/cache/__init__.py
+# Couche de cache commune : une API asynchrone (app.cache.core.Cache) et des
+# stockages interchangeables choisis par URL (CACHE_URL) :
+#   memory://?max_entries=10000
+#   sqlite:///./cache/pointage.sqlite
+#   redis://:motdepasse@localhost:6379/0
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from app.cache.backends import CacheBackend, MemoryBackend, RedisBackend, RedisProtocolError, SQLiteBackend
+from app.cache.core import Cache, CacheStats
+
+
+def create_backend(url: str) -> CacheBackend:
+    """Stockage correspondant à l'URL"""
+    parsed = urlparse(url)
+    options = {name: values[-1] for name, values in parse_qs(parsed.query).items()}
+    if parsed.scheme == "memory":
+        return MemoryBackend(max_entries=int(options.get("max_entries", 10_000)))
+    if parsed.scheme == "sqlite":
+        # Même convention que SQLAlchemy : sqlite:///relatif, sqlite:////absolu
+        path = url[len("sqlite:///"):].split("?", 1)[0]
+        return SQLiteBackend(path, max_entries=int(options.get("max_entries", 100_000)))
+    if parsed.scheme == "redis":
+        return RedisBackend(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=parsed.password,
+        )
+    raise ValueError(f"URL de cache non supportée : {url}")
+
+
+def create_cache(url: Optional[str] = None, name: str = "default", default_ttl: Optional[float] = 60.0) -> Cache:
+    """Cache nommé sur le stockage configuré (CACHE_URL par défaut)"""
+    from app.config import settings
+
+    return Cache(create_backend(url or settings.cache_url), name=name, default_ttl=default_ttl)
+
+
+__all__ = [
+    "Cache",
+    "CacheBackend",
+    "CacheStats",
+    "MemoryBackend",
+    "RedisBackend",
+    "RedisProtocolError",
+    "SQLiteBackend",
+    "create_backend",
+    "create_cache",
+]
@@ -0,0 +1,324 @@
+# app/cache/backends.py
+# Stockages du cache : octets par clé avec expiration, plus un compteur
+# atomique (incr) qui porte les versions des étiquettes. Trois implémentations :
+#   - MemoryBackend : LRU borné du processus ;
+#   - SQLiteBackend : fichier local, survit aux redémarrages, partagé par les
+#                     workers d'une même machine ;
+#   - RedisBackend  : tout serveur parlant le protocole Redis (RESP), client
+#                     asyncio minimal sans dépendance.
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class CacheBackend:
+    """Interface commune (asynchrone) des stockages"""
+
+    evictions = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def clear(self, prefix: str = "") -> None:
+        """Supprime les entrées et compteurs dont la clé commence par `prefix`"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """LRU en mémoire ; les entrées expirées sont écartées à la lecture"""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        # Compteurs hors LRU : une version d'étiquette ne doit jamais être évincée
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            counters = [self._counters.get(key) for key in keys]
+        if all(value is not None for value in counters):
+            return [str(value).encode() for value in counters]
+        return [
+            str(counter).encode() if counter is not None else await self.get(key)
+            for key, counter in zip(keys, counters)
+        ]
+
+    async def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            for mapping in (self._entries, self._counters):
+                for key in [key for key in mapping if key.startswith(prefix)]:
+                    del mapping[key]
+
+
+class SQLiteBackend(CacheBackend):
+    """Cache persistant dans un fichier SQLite (WAL), opérations dans un thread"""
+
+    PURGE_EVERY = 200  # Nettoyage des entrées expirées toutes les N écritures
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed ON cache_entries (accessed_at)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS cache_counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _run(self, function, *args):
+        def locked():
+            with self._lock:
+                return function(*args)
+        return asyncio.to_thread(locked)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        row = self._connection.execute(
+            "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= now:
+            self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            return None
+        self._connection.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def _set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        now = time.time()
+        self._connection.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, value, now + ttl if ttl else None, now)
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._purge(now)
+
+    def _purge(self, now: float) -> None:
+        self._connection.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        (count,) = self._connection.execute("SELECT count(*) FROM cache_entries").fetchone()
+        if count > self.max_entries:
+            # Moins récemment lues d'abord (LRU approximatif)
+            self._connection.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)", (count - self.max_entries,)
+            )
+            self.evictions += count - self.max_entries
+
+    def _incr(self, key: str) -> int:
+        return self._connection.execute(
+            "INSERT INTO cache_counters (key, value) VALUES (?, 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1 RETURNING value", (key,)
+        ).fetchone()[0]
+
+    def _get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        placeholders = ", ".join("?" * len(keys))
+        counters = dict(self._connection.execute(
+            f"SELECT key, value FROM cache_counters WHERE key IN ({placeholders})", tuple(keys)
+        ).fetchall()) if keys else {}
+        return [str(counters[key]).encode() if key in counters else self._get(key) for key in keys]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._run(self._get, key)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await self._run(self._get_many, list(keys))
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        await self._run(self._set, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._connection.execute, "DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    async def incr(self, key: str) -> int:
+        return await self._run(self._incr, key)
+
+    async def clear(self, prefix: str = "") -> None:
+        def clear():
+            for table in ("cache_entries", "cache_counters"):
+                self._connection.execute(f"DELETE FROM {table} WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        await self._run(clear)
+
+    async def close(self) -> None:
+        await self._run(self._connection.close)
+
+
+class RedisProtocolError(Exception):
+    pass
+
+
+class RedisBackend(CacheBackend):
+    """Client RESP2 minimal (GET, SET PX, DEL, INCR, MGET, SCAN) ; une connexion par boucle d'événements"""
+
+    SCAN_COUNT = 500  # Clés examinées par itération de SCAN
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0, password: Optional[str] = None,
+                 timeout_s: float = 1.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout_s = timeout_s
+        self._connections: Dict[int, Tuple[asyncio.StreamReader, asyncio.StreamWriter, asyncio.Lock]] = {}
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def _read_reply(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Connexion Redis fermée")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisProtocolError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [await self._read_reply(reader) for _ in range(count)]
+        raise RedisProtocolError(f"Réponse inattendue : {line!r}")
+
+    async def _connection(self):
+        loop_id = id(asyncio.get_running_loop())
+        connection = self._connections.get(loop_id)
+        if connection is None or connection[1].is_closing():
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.timeout_s)
+            connection = (reader, writer, asyncio.Lock())
+            self._connections[loop_id] = connection
+            if self.password:
+                await self._send(connection, "AUTH", self.password)
+            if self.db:
+                await self._send(connection, "SELECT", self.db)
+        return connection
+
+    async def _send(self, connection, *args):
+        reader, writer, lock = connection
+        async with lock:
+            writer.write(self._encode(*args))
+            await writer.drain()
+            return await asyncio.wait_for(self._read_reply(reader), self.timeout_s)
+
+    async def execute(self, *args):
+        connection = await self._connection()
+        try:
+            return await self._send(connection, *args)
+        except RedisProtocolError:
+            # Réponse d'erreur lue en entier : la connexion reste synchronisée
+            raise
+        except BaseException:
+            # Connexion cassée, ou commande annulée entre l'envoi et la lecture
+            # de sa réponse : celle-ci serait lue par la commande suivante.
+            # Connexion fermée, la suivante sera rouverte
+            connection[1].close()
+            loop_id = id(asyncio.get_running_loop())
+            if self._connections.get(loop_id) is connection:
+                del self._connections[loop_id]
+            raise
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await self.execute("MGET", *keys) if keys else []
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        if ttl:
+            await self.execute("SET", key, value, "PX", max(1, int(ttl * 1000)))
+        else:
+            await self.execute("SET", key, value)
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def incr(self, key: str) -> int:
+        return await self.execute("INCR", key)
+
+    async def clear(self, prefix: str = "") -> None:
+        # SCAN + DEL plutôt que FLUSHDB : la base Redis peut servir à d'autres
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", prefix) + "*"
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.execute("SCAN", cursor, "MATCH", pattern, "COUNT", self.SCAN_COUNT)
+            if keys:
+                await self.execute("DEL", *keys)
+            if cursor == b"0":
+                break
+
+    async def close(self) -> None:
+        for _, writer, _ in self._connections.values():
+            writer.close()
+        self._connections.clear()
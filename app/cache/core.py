@@ -0,0 +1,152 @@
+# app/cache/core.py
+# API unique du cache, au-dessus d'un stockage (app.cache.backends) :
+# get / set / delete avec durée de vie, étiquettes pour invalider un groupe
+# d'entrées, get_or_set avec regroupement des calculs concurrents.
+#
+# Étiquettes versionnées : chaque étiquette a un compteur dans le stockage ;
+# une entrée mémorise les versions de ses étiquettes à l'écriture et n'est
+# valide que si elles n'ont pas bougé. Invalider une étiquette = un INCR,
+# quel que soit le nombre d'entrées concernées.
+import asyncio
+import inspect
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+
+from app.cache import serialization
+from app.cache.backends import CacheBackend
+from app.utils.metrics import Counter, registry
+from app.utils.singleflight import join_inflight
+
+CACHE_REQUESTS = registry.register(Counter(
+    "cache_requests_total", "Lectures du cache par résultat (hit, miss, coalesced)", ("cache", "result")
+))
+CACHE_EVICTIONS = registry.register(Counter(
+    "cache_evictions_total", "Entrées évincées par le stockage (capacité atteinte)", ("cache",)
+))
+
+_DEFAULT = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    sets: int = 0
+    deletes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class Cache:
+    """Cache asynchrone : durée de vie, étiquettes et single-flight"""
+
+    def __init__(self, backend: CacheBackend, name: str = "default", namespace: str = "pointage",
+                 default_ttl: Optional[float] = 60.0):
+        self.backend = backend
+        self.name = name
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self._stats = CacheStats()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    def _record(self, result: str) -> None:
+        if result == "hit":
+            self._stats.hits += 1
+        elif result == "miss":
+            self._stats.misses += 1
+        else:
+            self._stats.coalesced += 1
+        CACHE_REQUESTS.inc(cache=self.name, result=result)
+
+    async def _tag_versions(self, tags: Sequence[str]) -> Dict[str, int]:
+        if not tags:
+            return {}
+        values = await self.backend.get_many([self._tag_key(tag) for tag in tags])
+        return {tag: int(value) if value is not None else 0 for tag, value in zip(tags, values)}
+
+    async def _lookup(self, key: str) -> Any:
+        data = await self.backend.get(self._key(key))
+        if data is not None:
+            value, tags = serialization.loads(data)
+            if not tags or await self._tag_versions(list(tags)) == tags:
+                self._record("hit")
+                return value
+        self._record("miss")
+        return _DEFAULT
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = await self._lookup(key)
+        return default if value is _DEFAULT else value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = _DEFAULT, tags: Iterable[str] = ()) -> None:
+        """`ttl` en secondes (None : sans expiration, par défaut `default_ttl`)"""
+        await self._store(key, value, ttl, await self._tag_versions(sorted(set(tags))))
+
+    async def _store(self, key: str, value: Any, ttl: Optional[float], versions: Dict[str, int]) -> None:
+        await self.backend.set(
+            self._key(key), serialization.dumps((value, versions)), self.default_ttl if ttl is _DEFAULT else ttl
+        )
+        self._stats.sets += 1
+
+    async def delete(self, key: str) -> None:
+        await self.backend.delete(self._key(key))
+        self._stats.deletes += 1
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Rend invalides toutes les entrées portant l'une de ces étiquettes"""
+        for tag in tags:
+            await self.backend.incr(self._tag_key(tag))
+
+    async def clear(self) -> None:
+        """Vide les entrées et étiquettes de cet espace de noms, et elles seules"""
+        await self.backend.clear(f"{self.namespace}:")
+
+    async def get_or_set(self, key: str, factory: Callable[[], Any], ttl: Optional[float] = _DEFAULT,
+                         tags: Iterable[str] = ()) -> Any:
+        """Valeur en cache, sinon calculée une seule fois pour tous les appelants concurrents ;
+        `factory` est une fonction coroutine ou une fonction bloquante (pool de threads)"""
+        value = await self._lookup(key)
+        if value is not _DEFAULT:
+            return value
+
+        async def compute():
+            # Versions lues avant le calcul : une invalidation pendant celui-ci
+            # rend le résultat périmé dès son écriture
+            versions = await self._tag_versions(sorted(set(tags)))
+            if inspect.iscoroutinefunction(factory):
+                result = await factory()
+            else:
+                result = await run_in_threadpool(factory)
+            await self._store(key, result, ttl, versions)
+            return result
+
+        task, started = join_inflight(self._inflight, key, compute)
+        if not started:
+            self._record("coalesced")
+        return await asyncio.shield(task)
+
+    def stats(self) -> CacheStats:
+        evicted = self.backend.evictions - self._stats.evictions
+        if evicted > 0:
+            CACHE_EVICTIONS.inc(evicted, cache=self.name)
+        self._stats.evictions = self.backend.evictions
+        return self._stats
+
+    async def close(self) -> None:
+        await self.backend.close()
@@ -0,0 +1,56 @@
+# app/cache/serialization.py
+# Sérialisation compacte des valeurs en cache : msgpack (dates, datetimes et
+# ensembles en types d'extension), pickle si msgpack n'est pas installé. Le
+# premier octet indique le format, pour relire sans ambiguïté. Comme en JSON,
+# les tuples sont relus en listes.
+import pickle
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # msgpack est optionnel : repli sur pickle
+    msgpack = None
+
+MSGPACK = b"M"
+PICKLE = b"P"
+
+_DATETIME = 1
+_DATE = 2
+_SET = 3
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return msgpack.ExtType(_DATETIME, value.isoformat().encode())
+    if isinstance(value, date):
+        return msgpack.ExtType(_DATE, value.isoformat().encode())
+    if isinstance(value, (set, frozenset)):
+        return msgpack.ExtType(_SET, msgpack.packb(list(value), default=_default, use_bin_type=True))
+    if hasattr(value, "_asdict"):  # Row SQLAlchemy, namedtuple
+        return value._asdict()
+    raise TypeError(f"Type non sérialisable en cache : {type(value).__name__}")
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == _DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _DATE:
+        return date.fromisoformat(data.decode())
+    if code == _SET:
+        return set(msgpack.unpackb(data, ext_hook=_ext_hook, raw=False))
+    return msgpack.ExtType(code, data)
+
+
+def dumps(value: Any) -> bytes:
+    if msgpack is None:
+        return PICKLE + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return MSGPACK + msgpack.packb(value, default=_default, use_bin_type=True, datetime=False)
+
+
+def loads(data: bytes) -> Any:
+    if data[:1] == PICKLE:
+        return pickle.loads(data[1:])
+    if msgpack is None:
+        raise RuntimeError("msgpack est requis pour relire cette entrée de cache")
+    return msgpack.unpackb(data[1:], ext_hook=_ext_hook, raw=False, strict_map_key=False)
@@ -1,4 +1,7 @@
-from pydantic import BaseSettings
+try:
+    from pydantic_settings import BaseSettings
+except ImportError:  # pydantic v1
+    from pydantic import BaseSettings
 
 class Settings(BaseSettings):
     app_name: str = "Pointage API"
@@ -6,6 +9,53 @@ class Settings(BaseSettings):
     secret_key: str = "votre_secret_key_tres_secret"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    database_url: str = "sqlite:///./pointage.db"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    
+    # Création des tables au démarrage (développement). En production, mettre
+    # CREATE_SCHEMA=false et gérer le schéma avec `alembic upgrade head`.
+    create_schema: bool = True
+    
+    # Partitions mensuelles de attendance créées d'avance (PostgreSQL)
+    attendance_partitions_ahead: int = 3
+    
+    # Archive froide : mois conservés dans la table, le reste en Parquet (archive_attendance.py)
+    attendance_hot_months: int = 13
+    attendance_archive_dir: str = "./archive/attendance"
+    
+    # Agrégats des longues périodes via DuckDB (backend "sql" ou "duckdb") ;
+    # source "auto" : fichier SQLite attaché, sinon instantané Parquet (analytics_snapshot.py)
+    analytics_backend: str = "sql"
+    analytics_source: str = "auto"
+    analytics_snapshot_dir: str = "./archive/snapshot"
+    analytics_min_days: int = 90
+    
+    # Instrumentation SQL de debug (en-têtes X-SQL-*, détection N+1)
+    sql_debug: bool = False
+    sql_n_plus_one_threshold: int = 10
+    
+    # Compression des réponses (octets en dessous desquels on n'en fait rien)
+    compression_minimum_size: int = 1024
+    
+    # Contrôle d'admission : connexions du pool réservées aux pointages,
+    # concurrence et débit (par utilisateur) des rapports et exports
+    admission_enabled: bool = True
+    admission_clockin_reserved: int = 4
+    admission_heavy_concurrency: int = 2
+    admission_heavy_burst: int = 5
+    admission_heavy_per_minute: float = 10
+    admission_queue_timeout_s: float = 5.0
+    
+    # Durée de vie des résultats partagés par single-flight (/admin/employees, /admin/stats)
+    result_cache_ttl_s: float = 5.0
+    
+    # Sondage de data_versions par chaque worker : délai maximal avant
+    # invalidation des caches locaux après une écriture d'un autre worker
+    invalidation_poll_s: float = 1.0
+    
+    # Stockage du cache applicatif (app.cache) : memory://, sqlite:///chemin, redis://hôte:port/db
+    cache_url: str = "memory://"
     
     class Config:
         env_file = ".env"
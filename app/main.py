@@ -1,9 +1,75 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import activity, auth, employees, attendance, leaves, reports, admin, stats
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal
 from app.routes import qrcodes  # Ajouter cette ligne
-app = FastAPI(title="Pointage API", version="1.0.0")
+from app.utils.leave_index import leave_index
+from app.utils.data_versions import ensure_data_versions
+from app.utils.metrics import MetricsMiddleware, install_sql_hooks
+from app.routes import metrics
+from app.routes import exports
+from app.utils.sql_profiler import SQLDebugMiddleware
+from app.config import settings
+from app.utils.responses import ORJSONResponse
+from app.utils.compression import CompressionMiddleware
+from app.utils.admission import AdmissionMiddleware
+from app.utils.partitions import ensure_partitions
+from app.utils.invalidation import invalidation_bus
+
+logger = logging.getLogger("app.partitions")
+
+PARTITION_MAINTENANCE_INTERVAL_S = 24 * 3600
+
+def warm_up():
+    """Ouvre une première connexion du pool et précharge les caches en mémoire"""
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        ensure_data_versions(db)
+        # Référence des versions prise avant le chargement : une écriture d'un autre
+        # worker pendant celui-ci est livrée au premier sondage du bus
+        invalidation_bus.poll(engine)
+        leave_index.load(db)
+    finally:
+        db.close()
+
+async def maintain_partitions():
+    """Crée chaque jour les partitions mensuelles à venir de attendance"""
+    while True:
+        await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL_S)
+        try:
+            await run_in_threadpool(ensure_partitions, engine, settings.attendance_partitions_ahead)
+        except Exception:
+            logger.exception("Maintenance des partitions en échec")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Le schéma n'est plus créé à l'import du module, mais au démarrage du serveur
+    if settings.create_schema:
+        Base.metadata.create_all(bind=engine)
+    warm_up()
+    tasks = []
+    # Partitions mensuelles : PostgreSQL seulement (SQLite se contente de l'index (date, employee_id))
+    if engine.dialect.name == "postgresql":
+        ensure_partitions(engine, settings.attendance_partitions_ahead)
+        tasks.append(asyncio.create_task(maintain_partitions()))
+    # Caches locaux invalidés par les écritures des autres workers
+    tasks.append(asyncio.create_task(invalidation_bus.run(engine, settings.invalidation_poll_s)))
+    yield
+    for task in tasks:
+        task.cancel()
+
+app = FastAPI(
+    title="Pointage API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # CORS
 # Configuration CORS
@@ -24,8 +90,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Créer les tables de la base de données
-Base.metadata.create_all(bind=engine)
+# Compression gzip / brotli (à l'intérieur des métriques, qui en mesurent le coût)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
+# Instrumentation SQL de debug (doit rester à l'intérieur du middleware de métriques)
+if settings.sql_debug:
+    app.add_middleware(SQLDebugMiddleware, threshold=settings.sql_n_plus_one_threshold)
+
+# Couloirs d'admission (dans les métriques, qui comptent aussi les 429)
+app.add_middleware(AdmissionMiddleware)
+
+# Métriques : latence par route et coût SQL par requête
+app.add_middleware(MetricsMiddleware)
+install_sql_hooks(engine)
 
 # Inclure les routes
 app.include_router(auth.router)
@@ -37,6 +114,8 @@ app.include_router(qrcodes.router)
 app.include_router(admin.router)# Ajouter cette ligne
 app.include_router(stats.router)
 app.include_router(activity.router)
+app.include_router(metrics.router)
+app.include_router(exports.router)
 @app.get("/")
 def read_root():
     return {"message": "Bienvenue sur l'API de pointage"}
\ No newline at end of file
@@ -2,7 +2,10 @@
 from .employee import Employee
 from .attendance import Attendance
 from .leave import Leave
+from .leave_balance import LeaveBalance
 from .holiday import Holiday
+from .data_version import DataVersion
+from .lateness import LatenessBin
 from .qrcode import GlobalQRCode  # Si vous avez ce fichier
 
-__all__ = ['Employee', 'Attendance', 'Leave', 'Holiday', 'GlobalQRCode']
\ No newline at end of file
+__all__ = ['Employee', 'Attendance', 'Leave', 'LeaveBalance', 'Holiday', 'DataVersion', 'LatenessBin', 'GlobalQRCode']
\ No newline at end of file
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from datetime import datetime
 from app.database import Base
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # Lectures par période (PostgreSQL : en plus de l'élagage des partitions mensuelles)
+        Index("ix_attendance_date_employee", "date", "employee_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -17,6 +21,10 @@ class Attendance(Base):
     is_absent = Column(Boolean, default=False)
     is_holiday = Column(Boolean, default=False)
     is_on_leave = Column(Boolean, default=False)
+    # Colonnes calculées à l'écriture (voir compute_attendance_metrics)
+    worked_minutes = Column(Integer, default=0)
+    late_minutes_morning = Column(Integer, default=0)
+    late_minutes_afternoon = Column(Integer, default=0)
     
     def __repr__(self):
         return f"<Attendance {self.employee_id} {self.date}>"
\ No newline at end of file
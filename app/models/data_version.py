@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database import Base
+
+class DataVersion(Base):
+    """Compteur de version par table, incrémenté à chaque écriture (ETag, caches)"""
+    __tablename__ = "data_versions"
+    
+    table_name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<DataVersion {self.table_name} v{self.version}>"
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+class LatenessBin(Base):
+    """Compteur d'un intervalle DDSketch des minutes de retard, par service et par jour ou mois"""
+    __tablename__ = "lateness_bins"
+
+    service = Column(String(50), primary_key=True)  # "" : employés sans service
+    granularity = Column(String(5), primary_key=True)  # "day" ou "month"
+    period = Column(String(10), primary_key=True)  # YYYY-MM-DD (premier du mois pour "month")
+    bin = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<LatenessBin {self.service} {self.period} {self.bin}={self.count}>"
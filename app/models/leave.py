@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from datetime import datetime
 from app.database import Base
 
 class Leave(Base):
     __tablename__ = "leaves"
+    __table_args__ = (
+        # Détection des chevauchements par employé et par période
+        Index("ix_leaves_employee_period", "employee_id", "start_date", "end_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from app.database import Base
+
+class LeaveBalance(Base):
+    __tablename__ = "leave_balances"
+    __table_args__ = (
+        UniqueConstraint("employee_id", "year", name="uq_leave_balances_employee_year"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    entitled_days = Column(Integer, nullable=False, default=25)
+    taken_days = Column(Integer, nullable=False, default=0)  # Jours ouvrés de congés approuvés
+    
+    @property
+    def remaining_days(self) -> int:
+        return self.entitled_days - self.taken_days
+    
+    def __repr__(self):
+        return f"<LeaveBalance {self.employee_id} {self.year}: {self.taken_days}/{self.entitled_days}>"
@@ -1,59 +1,74 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import List
 
 from app.database import get_db
 from app.models import Attendance, Leave, Employee
+from app.schemas.stats import ActivityItem
 from app.utils.auth import get_current_admin
 
+# Ordre inverse de la journée : le premier renseigné est le dernier pointage
+PUNCH_TYPES = ("afternoon_departure", "afternoon_arrival", "morning_departure", "morning_arrival")
+
 router = APIRouter(prefix="/activity", tags=["Activity"])
 
-@router.get("/recent")
+@router.get("/recent", response_model=List[ActivityItem])
 async def get_recent_activity(
     limit: int = 10,
     db: Session = Depends(get_db),
     admin = Depends(get_current_admin)
-) -> List[Dict]:
+):
     """Retourne les activités récentes"""
-    # Derniers pointages
+    # Derniers pointages (la table n'a pas d'horodatage de création : on prend
+    # le pointage le plus tardif de chaque journée)
+    last_punch = func.coalesce(*(getattr(Attendance, punch) for punch in PUNCH_TYPES))
     recent_attendances = db.query(
-        Attendance, Employee.first_name, Employee.last_name
+        last_punch.label("timestamp"),
+        *(getattr(Attendance, punch) for punch in PUNCH_TYPES),
+        Attendance.is_late_morning,
+        Attendance.is_late_afternoon,
+        Employee.first_name,
+        Employee.last_name
     ).join(
         Employee, Attendance.employee_id == Employee.id
+    ).filter(
+        last_punch.isnot(None)
     ).order_by(
-        Attendance.created_at.desc()
+        last_punch.desc()
     ).limit(limit).all()
     
     activities = []
     
-    for attendance, first_name, last_name in recent_attendances:
+    for row in recent_attendances:
+        attendance_type = next(punch for punch in PUNCH_TYPES if getattr(row, punch) is not None)
         activities.append({
             "type": "attendance",
-            "employee_name": f"{first_name} {last_name}",
-            "timestamp": attendance.created_at,
-            "details": f"Pointage {attendance.attendance_type}",
-            "status": "on_time" if not (attendance.is_late_morning or attendance.is_late_afternoon) else "late"
+            "employee_name": f"{row.first_name} {row.last_name}",
+            "timestamp": row.timestamp,
+            "details": f"Pointage {attendance_type}",
+            "status": "on_time" if not (row.is_late_morning or row.is_late_afternoon) else "late"
         })
     
     # Dernières demandes de congé
     recent_leaves = db.query(
-        Leave, Employee.first_name, Employee.last_name
+        Leave.created_at, Leave.leave_type, Leave.status, Employee.first_name, Employee.last_name
     ).join(
         Employee, Leave.employee_id == Employee.id
     ).order_by(
         Leave.created_at.desc()
     ).limit(limit).all()
     
-    for leave, first_name, last_name in recent_leaves:
+    for leave in recent_leaves:
         activities.append({
             "type": "leave",
-            "employee_name": f"{first_name} {last_name}",
+            "employee_name": f"{leave.first_name} {leave.last_name}",
             "timestamp": leave.created_at,
             "details": f"Demande de {leave.leave_type}",
             "status": leave.status
         })
     
     # Trier par date et limiter
-    activities.sort(key=lambda x: x["timestamp"], reverse=True)
+    activities.sort(key=lambda x: x["timestamp"] or datetime.min, reverse=True)
     return activities[:limit]
\ No newline at end of file
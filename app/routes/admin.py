@@ -2,13 +2,17 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from app.utils.auth import get_current_admin
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models import Employee, Attendance, Leave, Holiday
 from app.utils.auth import get_current_admin
 from app.utils.stats_calculations import calculate_employee_stats
-from app.utils.time_calculations import get_time_periods
+from app.utils.time_calculations import (
+    get_time_periods,
+    calculate_employees_stats,
+    empty_employee_stats
+)
 from app.utils.reports import (
     generate_employees_report_pdf,
     generate_attendance_report_pdf,
@@ -25,7 +29,16 @@ from app.utils.stats_calculations import (
     calculate_worked_hours,
     calculate_employee_stats
 )
-from app.schemas.admin import PeriodFilter
+from app.schemas.admin import PeriodFilter, BulkLeaveDecision, BulkLeaveDecisionResult
+from app.schemas.leave import LeaveResponse
+from app.schemas.stats import AdminStats, EmployeeReportRow
+from app.utils.responses import ORJSONResponse, rows_response
+from app.utils.etag import conditional_get
+from app.utils.leave_index import leave_index
+from app.utils.leave_balances import set_leave_status
+from app.utils.leave_review import find_leave_conflicts, apply_bulk_decision
+from app.utils.singleflight import SingleFlight
+from app.utils.employee_directory import EmployeeRecord
 # app/routes/admin.py
 from app.utils.reports import (
     generate_employees_report_pdf,
@@ -36,34 +49,45 @@ from app.utils.reports import (
 )
 router = APIRouter(prefix="/admin", tags=["Administration"])
 
+# Calculs regroupés par ETag (route, paramètres, versions des données)
+employees_report_flight = SingleFlight("admin_employees")
+admin_stats_flight = SingleFlight("admin_stats")
+
 # Liste des employés avec statistiques
-@router.get("/employees")
+@router.get("/employees", response_model=List[EmployeeReportRow])
 async def get_employees_report(
     period: str = "month",
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
-    admin: Employee = Depends(get_current_admin)
+    admin: EmployeeRecord = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees", "attendance"))
 ):
     try:
         start, end = get_time_periods(period, start_date, end_date)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    employees = db.query(Employee).all()
-    employees_data = []
-    
-    for emp in employees:
-        stats = calculate_employee_stats(db, emp.id, start, end)
-        employees_data.append({
-            "id": emp.id,
-            "first_name": emp.first_name,
-            "last_name": emp.last_name,
-            "email": emp.email,
-            "stats": stats
-        })
-    
-    return employees_data
+    # Les requêtes identiques simultanées (même ETag) partagent un seul calcul,
+    # sur sa propre session : celle de la requête est fermée si le client part
+    rows = await employees_report_flight.do(cache_headers["ETag"], _employees_report_rows, db.get_bind(), start, end)
+    return ORJSONResponse(rows, headers=cache_headers)
+
+def _employees_report_rows(bind, start: date, end: date) -> list:
+    db = SessionLocal(bind=bind)
+    try:
+        employees = db.query(Employee.id, Employee.first_name, Employee.last_name, Employee.email)
+        
+        # Une seule requête groupée pour tous les employés
+        all_stats = calculate_employees_stats(db, start, end)
+        
+        # Réponse construite directement depuis les lignes (pas d'objets ORM)
+        return [
+            {**row._asdict(), "stats": all_stats.get(row.id) or empty_employee_stats()}
+            for row in employees
+        ]
+    finally:
+        db.close()
 
 @router.get("/employees/pdf")
 async def get_employees_pdf_report(
@@ -71,7 +95,7 @@ async def get_employees_pdf_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
-    admin: Employee = Depends(get_current_admin)
+    admin: EmployeeRecord = Depends(get_current_admin)
 ):
     try:
         start, end = get_time_periods(period, start_date, end_date)
@@ -88,63 +112,104 @@ async def get_employees_pdf_report(
     )
 
 # Gestion des congés
-@router.get("/leaves")
+@router.get("/leaves", response_model=List[LeaveResponse])
 async def get_leaves(
     status: Optional[str] = None,
     period: str = "month",
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
-    admin: Employee = Depends(get_current_admin)
+    admin: EmployeeRecord = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("leaves"))
 ):
     try:
         start, end = get_time_periods(period, start_date, end_date)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    query = db.query(Leave).filter(
-        Leave.start_date <= end,
-        Leave.end_date >= start
+    query = db.query(*Leave.__table__.columns).filter(
+        Leave.start_date <= end.isoformat(),
+        Leave.end_date >= start.isoformat()
     )
     
     if status:
         query = query.filter(Leave.status == status)
         
-    return query.all()
+    return rows_response(query, headers=cache_headers)
 
 @router.post("/leaves/{leave_id}/approve")
 async def approve_leave(
     leave_id: int,
     db: Session = Depends(get_db),
-    admin: Employee = Depends(get_current_admin)
+    admin: EmployeeRecord = Depends(get_current_admin)
 ):
     leave = db.query(Leave).filter(Leave.id == leave_id).first()
     if not leave:
         raise HTTPException(status_code=404, detail="Congé non trouvé")
     
-    leave.status = "approved"
+    conflicts = find_leave_conflicts(db, {leave_id}, set())
+    if conflicts:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Chevauche les congés approuvés {conflicts[leave_id]}"
+        )
+    
+    set_leave_status(db, leave, "approved")
     db.commit()
+    leave_index.apply(leave)
     return {"message": "Congé approuvé"}
 
+@router.post("/leaves/{leave_id}/reject")
+async def reject_leave(
+    leave_id: int,
+    db: Session = Depends(get_db),
+    admin: EmployeeRecord = Depends(get_current_admin)
+):
+    leave = db.query(Leave).filter(Leave.id == leave_id).first()
+    if not leave:
+        raise HTTPException(status_code=404, detail="Congé non trouvé")
+    
+    set_leave_status(db, leave, "rejected")
+    db.commit()
+    leave_index.apply(leave)
+    return {"message": "Congé refusé"}
+
+@router.post("/leaves/bulk-decision", response_model=BulkLeaveDecisionResult)
+async def bulk_leave_decision(
+    decision: BulkLeaveDecision,
+    db: Session = Depends(get_db),
+    admin: EmployeeRecord = Depends(get_current_admin)
+):
+    """Approuve et refuse plusieurs congés en une fois, conflits renvoyés par congé"""
+    return apply_bulk_decision(db, decision.approve, decision.reject)
+
 # Statistiques globales
-@router.get("/stats")
+@router.get("/stats", response_model=AdminStats)
 async def get_stats(
     period: str = "month",
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
-    admin: Employee = Depends(get_current_admin)
+    admin: EmployeeRecord = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees", "attendance", "leaves", "holidays"))
 ):
     try:
         start, end = get_time_periods(period, start_date, end_date)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    total_employees = calculate_total_employees(db)
-    on_time = calculate_on_time_employees(db, start, end)
-    late = calculate_late_employees(db, start, end)
-    leaves = calculate_total_leaves(db, start, end)
-    holidays = calculate_holidays(db, start, end)
+    return await admin_stats_flight.do(cache_headers["ETag"], _admin_stats, db.get_bind(), start, end)
+
+def _admin_stats(bind, start: date, end: date) -> dict:
+    db = SessionLocal(bind=bind)
+    try:
+        total_employees = calculate_total_employees(db)
+        on_time = calculate_on_time_employees(db, start, end)
+        late = calculate_late_employees(db, start, end)
+        leaves = calculate_total_leaves(db, start, end)
+        holidays = calculate_holidays(db, start, end)
+    finally:
+        db.close()
     
     # Calcul des pourcentages
     on_time_percent = (on_time / total_employees * 100) if total_employees > 0 else 0
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, date
 from typing import List
-from app.models.leave import Leave
 from app.routes import qrcodes  # Ajouter cette ligne
 from app.database import get_db
 from app.models.attendance import Attendance
@@ -16,11 +15,13 @@ from app.schemas.attendance import (
 from app.utils.auth import oauth2_scheme, decode_token
 from app.utils.qrcode import verify_qr_code, generate_qr_code_data
 from app.utils.time_calculations import (
-    calculate_working_hours,
+    compute_attendance_metrics,
     MORNING_START,
     AFTERNOON_START
 )
 from app.utils.holidays import is_holiday
+from app.utils.leave_index import leave_index
+from app.utils.lateness import arrival_lateness, record_arrivals
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
@@ -49,13 +50,9 @@ async def record_attendance(
     # Vérifier si c'est un jour férié
     holiday = is_holiday(today)
     
-    # Vérifier si l'employé est en congé
-    on_leave = db.query(Leave).filter(
-        Leave.employee_id == data.employee_id,
-        Leave.start_date <= today,
-        Leave.end_date >= today,
-        Leave.status == "approved"
-    ).first() is not None
+    # Vérifier si l'employé est en congé (index en mémoire, sans requête)
+    leave_index.ensure_loaded(db)
+    on_leave = leave_index.is_on_leave(data.employee_id, today)
     
     # Récupérer ou créer l'enregistrement de pointage
     attendance = db.query(Attendance).filter(
@@ -73,6 +70,7 @@ async def record_attendance(
         )
         db.add(attendance)
     
+    arrivals_before = dict(arrival_lateness(attendance))
     now = datetime.now()
     
     # Enregistrer le pointage selon le type
@@ -96,12 +94,18 @@ async def record_attendance(
         attendance.afternoon_departure = now
         message = "Bravo vous avez pointé pour la dernière fois de la journée"
     
+    # Durée travaillée et minutes de retard calculées une fois pour toutes à l'écriture
+    compute_attendance_metrics(attendance)
+    
+    # Esquisses de la distribution des retards, dans la même transaction
+    record_arrivals(db, employee.service, today, arrivals_before, dict(arrival_lateness(attendance)))
+    
     db.commit()
     db.refresh(attendance)
     
     return {
         "message": message,
-        "attendance": attendance,
+        "attendance": {column.name: getattr(attendance, column.name) for column in Attendance.__table__.columns},
         "is_late": (
             (data.attendance_type == "morning_arrival" and attendance.is_late_morning) or
             (data.attendance_type == "afternoon_arrival" and attendance.is_late_afternoon)
@@ -120,14 +124,17 @@ async def get_attendance_stats(
     if not payload:
         raise HTTPException(status_code=401, detail="Token invalide")
     
-    # Récupérer les enregistrements de pointage pour la période
-    # Implémentation à compléter selon la période (jour, semaine, mois, etc.)
-    records = db.query(Attendance).filter(
-        Attendance.employee_id == employee_id,
-        # Filtre par période à ajouter
-    ).all()
+    try:
+        start_date = date.fromisoformat(period.start_date)
+        end_date = date.fromisoformat(period.end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Période invalide")
+    
+    # Charger les colonnes de la période en tableaux typés et calculer les statistiques
+    # (numpy n'est importé qu'au premier calcul)
+    from app.utils.timesheet import load_timesheet, compute_timesheet_stats
     
-    # Calculer les statistiques
-    stats = calculate_working_hours([r.__dict__ for r in records])
+    timesheet = load_timesheet(db, employee_id, start_date, end_date)
+    stats = compute_timesheet_stats(timesheet)
     
     return stats
\ No newline at end of file
@@ -3,7 +3,6 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, date
-import pandas as pd
 from io import BytesIO
 import json
 
@@ -17,10 +16,21 @@ from app.schemas.employee import (
     EmployeeUpdate,
     EmployeeStats
 )
+from app.schemas.stats import EmployeePeriodStats
 from app.utils.auth import get_password_hash, get_current_admin, oauth2_scheme, decode_token
 from app.utils.qrcode import generate_qr_code_data, create_qr_code_image
 from app.utils.reports import generate_employees_report_pdf
-from app.utils.time_calculations import get_time_periods, calculate_employee_stats
+from app.utils.leave_index import leave_index
+from app.utils.leave_balances import total_remaining_leaves
+from app.utils.responses import rows_response
+from app.utils.etag import conditional_get
+from app.utils.employee_directory import DirectorySnapshot, current_directory, employee_directory
+from app.utils.time_calculations import (
+    get_time_periods,
+    calculate_employee_stats,
+    calculate_employees_stats,
+    empty_employee_stats
+)
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
@@ -29,38 +39,21 @@ async def get_employees(
     service: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees")),
+    directory: DirectorySnapshot = Depends(current_directory)
 ):
     """Récupérer tous les employés avec filtres"""
-    query = db.query(Employee)
-    
-    if service and service != "all":
-        query = query.filter(Employee.service == service)
-    
-    if status and status != "all":
-        if status == "active":
-            query = query.filter(Employee.is_active == True)
-        elif status == "inactive":
-            query = query.filter(Employee.is_active == False)
-    
-    if search:
-        query = query.filter(
-            (Employee.first_name.ilike(f"%{search}%")) |
-            (Employee.last_name.ilike(f"%{search}%")) |
-            (Employee.email.ilike(f"%{search}%")) |
-            (Employee.matricule.ilike(f"%{search}%")) |
-            (Employee.service.ilike(f"%{search}%"))
-        )
-    
-    employees = query.order_by(Employee.first_name, Employee.last_name).all()
-    return employees
+    # Filtrés dans l'annuaire en mémoire, sérialisés sans objets ORM ni validation
+    return rows_response(directory.filter(service, status, search), headers=cache_headers)
 
 @router.get("/stats", response_model=EmployeeStats)
 async def get_employees_stats(
     period: str = "month",
     db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees", "attendance", "leaves")),
+    directory: DirectorySnapshot = Depends(current_directory)
 ):
     """Récupérer les statistiques des employés"""
     try:
@@ -68,30 +61,21 @@ async def get_employees_stats(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    total_employees = db.query(Employee).count()
-    active_employees = db.query(Employee).filter(Employee.is_active == True).count()
-    
-    # Employés en congé
-    on_leave_employees = db.query(Employee).join(Leave).filter(
-        Leave.status == "approved",
-        Leave.start_date <= end_date.isoformat(),
-        Leave.end_date >= start_date.isoformat(),
-        Employee.is_active == True
-    ).distinct().count()
+    total_employees = len(directory.records)
+    active_ids = [emp.id for emp in directory.active]
+    active_employees = len(active_ids)
     
-    # Calculer les heures totales et pénalités
-    total_hours = 0
-    total_penalties = 0
+    # Employés en congé (index en mémoire des congés approuvés)
+    leave_index.ensure_loaded(db)
+    on_leave_employees = len(leave_index.employees_on_leave(start_date, end_date, active_ids))
     
-    # Pour chaque employé actif, calculer les stats
-    active_emps = db.query(Employee).filter(Employee.is_active == True).all()
-    for emp in active_emps:
-        stats = calculate_employee_stats(db, emp.id, start_date, end_date)
-        total_hours += stats.get("worked_hours", 0)
-        total_penalties += stats.get("penalty_hours", 0)
+    # Calculer les heures totales et pénalités des employés actifs (sommes SQL)
+    all_stats = calculate_employees_stats(db, start_date, end_date, active_ids)
+    total_hours = sum(stats["worked_hours"] for stats in all_stats.values())
+    total_penalties = sum(stats["penalty_hours"] for stats in all_stats.values())
     
-    # Congés restants (estimation)
-    total_remaining_leaves = active_employees * 25  # 25 jours par an par employé
+    # Congés restants : somme des soldes du grand livre pour l'année de la période
+    remaining_leaves = total_remaining_leaves(db, start_date.year)
     
     return {
         "total_employees": total_employees,
@@ -99,7 +83,7 @@ async def get_employees_stats(
         "on_leave_employees": on_leave_employees,
         "total_hours_month": round(total_hours, 2),
         "total_penalties": round(total_penalties, 2),
-        "total_remaining_leaves": total_remaining_leaves
+        "total_remaining_leaves": remaining_leaves
     }
 
 @router.post("/", response_model=EmployeeResponse)
@@ -109,16 +93,15 @@ async def create_employee(
     admin = Depends(get_current_admin)
 ):
     """Créer un nouvel employé"""
+    directory = employee_directory.snapshot(db)
+    
     # Vérifier si l'email existe déjà
-    existing_employee = db.query(Employee).filter(Employee.email == employee.email).first()
-    if existing_employee:
+    if employee.email in directory.by_email:
         raise HTTPException(status_code=400, detail="Email déjà utilisé")
     
     # Vérifier si le matricule existe déjà
-    if employee.matricule:
-        existing_matricule = db.query(Employee).filter(Employee.matricule == employee.matricule).first()
-        if existing_matricule:
-            raise HTTPException(status_code=400, detail="Matricule déjà utilisé")
+    if employee.matricule and employee.matricule in directory.by_matricule:
+        raise HTTPException(status_code=400, detail="Matricule déjà utilisé")
     
     # Créer l'employé
     db_employee = Employee(
@@ -137,17 +120,18 @@ async def create_employee(
     db.add(db_employee)
     db.commit()
     db.refresh(db_employee)
+    employee_directory.apply(db, db_employee)
     
     return db_employee
 
 @router.get("/{employee_id}", response_model=EmployeeResponse)
 async def get_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
+    admin = Depends(get_current_admin),
+    directory: DirectorySnapshot = Depends(current_directory)
 ):
     """Récupérer un employé spécifique"""
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    employee = directory.by_id.get(employee_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employé non trouvé")
     
@@ -176,6 +160,7 @@ async def update_employee(
     
     db.commit()
     db.refresh(db_employee)
+    employee_directory.apply(db, db_employee)
     
     return db_employee
 
@@ -193,6 +178,7 @@ async def delete_employee(
     # Pour la sécurité, on désactive plutôt que supprimer
     employee.is_active = False
     db.commit()
+    employee_directory.apply(db, employee)
     
     return {"message": "Employé désactivé avec succès"}
 
@@ -212,7 +198,7 @@ async def generate_employee_qr_code(
     
     return {"qr_code": qr_image, "employee_id": employee_id}
 
-@router.get("/{employee_id}/stats")
+@router.get("/{employee_id}/stats", response_model=EmployeePeriodStats)
 async def get_employee_stats(
     employee_id: int,
     period: str = "month",
@@ -242,29 +228,22 @@ async def export_employees_pdf(
     service: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees", "attendance")),
+    directory: DirectorySnapshot = Depends(current_directory)
 ):
     """Exporter les employés en PDF"""
-    # Récupérer les employés avec filtres
-    query = db.query(Employee)
+    # Employés filtrés dans l'annuaire en mémoire
+    employees = directory.filter(service, status)
     
-    if service and service != "all":
-        query = query.filter(Employee.service == service)
-    
-    if status and status != "all":
-        if status == "active":
-            query = query.filter(Employee.is_active == True)
-        elif status == "inactive":
-            query = query.filter(Employee.is_active == False)
-    
-    employees = query.all()
+    # Calculer les stats de tous les employés en une requête
+    start_date, end_date = get_time_periods("month")
+    all_stats = calculate_employees_stats(db, start_date, end_date, [emp.id for emp in employees])
     
     # Préparer les données pour le PDF
     employees_data = []
     for emp in employees:
-        # Calculer les stats pour chaque employé
-        start_date, end_date = get_time_periods("month")
-        stats = calculate_employee_stats(db, emp.id, start_date, end_date)
+        stats = all_stats.get(emp.id) or empty_employee_stats()
         
         employees_data.append({
             "id": emp.id,
@@ -292,29 +271,21 @@ async def export_employees_pdf(
     return StreamingResponse(
         pdf_buffer,
         media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=employees_report.pdf"}
+        headers={**cache_headers, "Content-Disposition": "attachment; filename=employees_report.pdf"}
     )
 
 @router.get("/export/excel")
 async def export_employees_excel(
     service: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees")),
+    directory: DirectorySnapshot = Depends(current_directory)
 ):
     """Exporter les employés en Excel"""
-    query = db.query(Employee)
-    
-    if service and service != "all":
-        query = query.filter(Employee.service == service)
+    import pandas as pd  # Chargé au premier export seulement
     
-    if status and status != "all":
-        if status == "active":
-            query = query.filter(Employee.is_active == True)
-        elif status == "inactive":
-            query = query.filter(Employee.is_active == False)
-    
-    employees = query.all()
+    employees = directory.filter(service, status)
     
     # Préparer les données pour Excel
     data = []
@@ -343,16 +314,14 @@ async def export_employees_excel(
     return StreamingResponse(
         buffer,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=employees.xlsx"}
+        headers={**cache_headers, "Content-Disposition": "attachment; filename=employees.xlsx"}
     )
 
 @router.get("/services/list")
 async def get_services_list(
-    db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees")),
+    directory: DirectorySnapshot = Depends(current_directory)
 ):
     """Récupérer la liste des services distincts"""
-    services = db.query(Employee.service).distinct().all()
-    services_list = [service[0] for service in services if service[0]]
-    
-    return {"services": services_list}
\ No newline at end of file
+    return {"services": directory.services}
\ No newline at end of file
@@ -0,0 +1,65 @@
+# app/routes/exports.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
+
+from app.database import get_db
+from app.utils.auth import get_current_admin
+from app.utils.etag import conditional_get
+from app.utils.employee_directory import DirectorySnapshot, current_directory
+from app.utils.arrow_export import AttendanceExport, PARQUET_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+def _attendance_export(db: Session, start_date: Optional[date], end_date: Optional[date], service: Optional[str],
+                       directory: DirectorySnapshot):
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="La date de début doit précéder la date de fin")
+    try:
+        return AttendanceExport(db, start_date, end_date, service, directory)
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+@router.get("/attendance.parquet")
+def export_attendance_parquet(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    service: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("attendance", "employees")),
+    directory: DirectorySnapshot = Depends(current_directory)
+):
+    """Pointages au format Parquet (archives comprises), produits et envoyés par lots"""
+    export = _attendance_export(db, start_date, end_date, service, directory)
+    return StreamingResponse(
+        export.iter_parquet(),
+        media_type=PARQUET_MEDIA_TYPE,
+        headers={
+            **cache_headers,
+            "Content-Disposition": f"attachment; filename=pointages_{export.start_date}_{export.end_date}.parquet"
+        }
+    )
+
+@router.get("/attendance.arrow")
+def export_attendance_arrow(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    service: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("attendance", "employees")),
+    directory: DirectorySnapshot = Depends(current_directory)
+):
+    """Pointages en flux Arrow IPC (pyarrow.ipc.open_stream, pandas, polars, DuckDB)"""
+    export = _attendance_export(db, start_date, end_date, service, directory)
+    return StreamingResponse(
+        export.iter_arrow_stream(),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers={
+            **cache_headers,
+            "Content-Disposition": f"attachment; filename=pointages_{export.start_date}_{export.end_date}.arrows"
+        }
+    )
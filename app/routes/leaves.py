@@ -2,12 +2,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Optional
 
 from app.database import get_db
 from app.models.employee import Employee
 from app.models.leave import Leave
-from app.schemas.leave import LeaveCreate, LeaveResponse
+from app.schemas.leave import LeaveCreate, LeaveResponse, LeaveBalanceResponse
 from app.utils.auth import oauth2_scheme, decode_token
+from app.utils.leave_balances import get_leave_balance
+from app.utils.leave_index import leave_index
 
 router = APIRouter(prefix="/leaves", tags=["Leaves"])
 
@@ -40,7 +43,22 @@ async def create_leave(
     db.add(db_leave)
     db.commit()
     db.refresh(db_leave)
+    leave_index.apply(db_leave)
     
     return db_leave
 
+@router.get("/balance/{employee_id}", response_model=LeaveBalanceResponse)
+async def get_employee_leave_balance(
+    employee_id: int,
+    year: Optional[int] = None,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """Solde de congés d'un employé pour l'année (année en cours par défaut)"""
+    payload = decode_token(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Token invalide")
+    
+    return get_leave_balance(db, employee_id, year or datetime.now().year)
+
 # Ajoutez d'autres endpoints si nécessaire
\ No newline at end of file
@@ -0,0 +1,15 @@
+# app/routes/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.utils.metrics import registry
+
+router = APIRouter(tags=["Monitoring"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Métriques au format texte Prometheus"""
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
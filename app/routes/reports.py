@@ -2,11 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
 from datetime import datetime, date, timedelta
-from reportlab.lib.styles import getSampleStyleSheet
 import io
 from app.routes import qrcodes  # Ajouter cette ligne
 from app.database import get_db
@@ -14,6 +10,7 @@ from app.models.employee import Employee
 from app.models.attendance import Attendance
 from app.models.leave import Leave
 from app.utils.auth import oauth2_scheme, decode_token
+from app.utils.employee_directory import employee_directory
 from app.utils.reports import (
     generate_employees_report_pdf,      # Changé
     generate_attendance_report_pdf,     # Changé (au lieu de generate_attendance_pdf)
@@ -22,9 +19,16 @@ from app.utils.reports import (
     generate_global_qr_pdf              # Changé
 )
 from app.schemas.reports import ReportPeriod
+from app.utils.metrics import timed, PDF_RENDER_LATENCY
+from app.utils.archive import load_attendance
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+REPORT_COLUMNS = (
+    "date", "morning_arrival", "morning_departure", "afternoon_arrival", "afternoon_departure",
+    "is_holiday", "is_on_leave", "is_absent", "is_late_morning", "is_late_afternoon"
+)
+
 @router.get("/attendance/{employee_id}")
 async def generate_employee_attendance_report(
     employee_id: int,
@@ -82,12 +86,12 @@ async def generate_employee_attendance_report(
     else:
         raise HTTPException(status_code=400, detail="Type de période invalide")
     
-    # Récupérer les données de pointage
-    attendance_records = db.query(Attendance).filter(
-        Attendance.employee_id == employee_id,
-        Attendance.date >= start_date,
-        Attendance.date <= end_date
-    ).all()
+    # Récupérer les données de pointage (archives comprises)
+    try:
+        period = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format de date invalide (AAAA-MM-JJ)")
+    attendance_records = load_attendance(db, *period, REPORT_COLUMNS, [employee_id])
     
     # Convertir en format dictionnaire pour le PDF
     records_data = [{
@@ -130,8 +134,8 @@ async def generate_employees_report(
     if not payload or not payload.get("is_admin"):
         raise HTTPException(status_code=403, detail="Permission refusée")
     
-    # Récupérer les employés
-    employees = db.query(Employee).all()
+    # Récupérer les employés (annuaire en mémoire)
+    employees = employee_directory.snapshot(db).records
     
     # Convertir en format dictionnaire pour le PDF
     employees_data = [{
@@ -204,7 +208,13 @@ async def generate_leaves_report(
     
     
     
+@timed(PDF_RENDER_LATENCY, report="employees")
 def generate_employees_report_pdf(employees_data, start_date, end_date):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+    
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     
@@ -1,21 +1,36 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, date
-from typing import Dict
+from typing import Optional
 
 from app.database import get_db
 from app.models import Employee, Attendance, Leave
+from app.schemas.stats import (
+    AttendanceTrend,
+    DashboardStats,
+    LatenessDistribution,
+    ServiceBreakdown,
+    ServiceStats
+)
 from app.utils.auth import get_current_admin
+from app.utils.etag import conditional_get
+from app.utils.employee_directory import DirectorySnapshot, current_directory
+from app.utils.responses import ORJSONResponse
+from app.utils.stats_calculations import calculate_service_breakdown, calculate_service_stats
 from app.utils.time_calculations import get_time_periods
+from app.utils.leave_index import leave_index
+from app.utils.lateness import RELATIVE_ACCURACY, lateness_by_service, lateness_by_week
+from app.utils.trends import BUCKETS, attendance_trend, choose_bucket
 
 router = APIRouter(prefix="/stats", tags=["Statistics"])
 
-@router.get("/dashboard")
+@router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
     period: str = "month",
     db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
-) -> Dict:
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees", "attendance", "leaves"))
+):
     """Retourne les statistiques pour le dashboard admin"""
     start_date, end_date = get_time_periods(period)
     
@@ -36,12 +51,9 @@ async def get_dashboard_stats(
         (Attendance.is_late_morning == True) | (Attendance.is_late_afternoon == True)
     ).count()
     
-    # Congés en cours
-    current_leaves = db.query(Leave).filter(
-        Leave.status == "approved",
-        Leave.start_date <= end_date.isoformat(),
-        Leave.end_date >= start_date.isoformat()
-    ).count()
+    # Congés en cours (index en mémoire des congés approuvés)
+    leave_index.ensure_loaded(db)
+    current_leaves = leave_index.count_leaves(start_date, end_date)
     
     # Pourcentages
     presence_rate = (present_today / total_employees * 100) if total_employees > 0 else 0
@@ -55,40 +67,113 @@ async def get_dashboard_stats(
         "period": f"{start_date} to {end_date}"
     }
 
-@router.get("/attendance-trend")
+@router.get("/attendance-trend", response_model=AttendanceTrend)
 async def get_attendance_trend(
     days: int = 7,
+    bucket: str = "auto",
+    service: Optional[str] = None,
     db: Session = Depends(get_db),
-    admin = Depends(get_current_admin)
-) -> Dict:
-    """Retourne les données pour le graphique des pointages"""
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("attendance", "employees")),
+    directory: DirectorySnapshot = Depends(current_directory)
+):
+    """Retourne les données pour le graphique des pointages, par jour, semaine ou mois"""
     from datetime import timedelta
     
+    if days < 1:
+        raise HTTPException(status_code=400, detail="Le nombre de jours doit être positif")
+    if bucket == "auto":
+        bucket = choose_bucket(days)
+    elif bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail="bucket doit valoir day, week, month ou auto")
+    
     end_date = date.today()
     start_date = end_date - timedelta(days=days-1)
     
-    trend_data = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        day_stats = db.query(Attendance).filter(
-            Attendance.date == current_date.isoformat()
-        ).all()
-        
-        present = sum(1 for a in day_stats if not a.is_absent)
-        late = sum(1 for a in day_stats if a.is_late_morning or a.is_late_afternoon)
-        absent = sum(1 for a in day_stats if a.is_absent)
-        
-        trend_data.append({
-            "date": current_date.isoformat(),
-            "present": present,
-            "late": late,
-            "absent": absent
-        })
-        
-        current_date += timedelta(days=1)
+    # Employés du service pris dans l'annuaire en mémoire (pas de jointure)
+    employee_ids = None
+    if service and service != "all":
+        employee_ids = [employee.id for employee in directory.by_service.get(service, ())]
     
     return {
         "period": f"{start_date} to {end_date}",
-        "data": trend_data
-    }
\ No newline at end of file
+        "bucket": bucket,
+        "data": attendance_trend(db, start_date, end_date, bucket, employee_ids)
+    }
+
+@router.get("/by-service", response_model=ServiceStats)
+async def get_stats_by_service(
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees", "attendance", "leaves")),
+    directory: DirectorySnapshot = Depends(current_directory)
+):
+    """Présences, retards, absences, congés, heures et pénalités par service"""
+    try:
+        start, end = get_time_periods(period, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ORJSONResponse({
+        "period": f"{start} to {end}",
+        "services": calculate_service_stats(db, directory, start, end)
+    }, headers=cache_headers)
+
+@router.get("/by-service/{service}", response_model=ServiceBreakdown)
+async def get_service_breakdown(
+    service: str,
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("employees", "attendance", "leaves")),
+    directory: DirectorySnapshot = Depends(current_directory)
+):
+    """Détail par employé d'un service (seuls ses pointages sont lus)"""
+    try:
+        start, end = get_time_periods(period, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    breakdown = calculate_service_breakdown(db, directory, service, start, end)
+    if breakdown is None:
+        raise HTTPException(status_code=404, detail="Service non trouvé")
+    
+    return ORJSONResponse({"period": f"{start} to {end}", **breakdown}, headers=cache_headers)
+
+@router.get("/lateness-distribution", response_model=LatenessDistribution)
+async def get_lateness_distribution(
+    period: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    service: Optional[str] = None,
+    group_by: str = "service",
+    db: Session = Depends(get_db),
+    admin = Depends(get_current_admin),
+    cache_headers: dict = Depends(conditional_get("attendance"))
+):
+    """Minutes de retard à l'arrivée (p50, p90, p99) par service ou par semaine, depuis les esquisses"""
+    if group_by not in ("service", "week"):
+        raise HTTPException(status_code=400, detail="group_by doit valoir service ou week")
+    try:
+        start, end = get_time_periods(period, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if group_by == "service":
+        sketches = lateness_by_service(db, start, end, service)
+        groups = [{"service": name or None, "week": None, **sketch.summary()} for name, sketch in sorted(sketches.items())]
+    else:
+        sketches = lateness_by_week(db, start, end, service)
+        groups = [{"service": service, "week": week, **sketch.summary()} for week, sketch in sketches.items()]
+    
+    return ORJSONResponse({
+        "period": f"{start} to {end}",
+        "group_by": group_by,
+        "relative_accuracy": RELATIVE_ACCURACY,
+        "groups": groups
+    }, headers=cache_headers)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from typing import Optional
+from typing import Dict, List, Optional
 
 class PeriodFilter(BaseModel):
     period: str = "month"
@@ -9,4 +9,14 @@ class PeriodFilter(BaseModel):
 
 class LeaveDecision(BaseModel):
     decision: str  # "approve" or "reject"
-    reason: Optional[str] = None
\ No newline at end of file
+    reason: Optional[str] = None
+
+class BulkLeaveDecision(BaseModel):
+    approve: List[int] = []
+    reject: List[int] = []
+
+class BulkLeaveDecisionResult(BaseModel):
+    approved: List[int]
+    rejected: List[int]
+    conflicts: Dict[int, List[int]]  # congé -> congés approuvés qui le chevauchent
+    not_found: List[int]
\ No newline at end of file
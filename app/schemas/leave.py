@@ -17,4 +17,11 @@ class LeaveResponse(BaseModel):
     leave_type: str
     status: str
     reason: str | None
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+class LeaveBalanceResponse(BaseModel):
+    employee_id: int
+    year: int
+    entitled_days: int
+    taken_days: int
+    remaining_days: int
\ No newline at end of file
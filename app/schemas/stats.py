@@ -0,0 +1,100 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+class PeriodStats(BaseModel):
+    present_days: int
+    late_days: int
+    absent_days: int
+    worked_hours: float
+    late_minutes: int
+    penalty_hours: float
+
+class EmployeeReportRow(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    stats: PeriodStats
+
+class EmployeePeriodStats(BaseModel):
+    employee_id: int
+    period: str
+    stats: PeriodStats
+
+class ServiceTotals(PeriodStats):
+    service: Optional[str]
+    employees: int
+    on_leave_employees: int
+
+class ServiceStats(BaseModel):
+    period: str
+    services: List[ServiceTotals]
+
+class ServiceEmployeeStats(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    matricule: Optional[str]
+    is_active: bool
+    on_leave: bool
+    stats: PeriodStats
+
+class ServiceBreakdown(BaseModel):
+    period: str
+    service: ServiceTotals
+    employees: List[ServiceEmployeeStats]
+
+class LatenessGroup(BaseModel):
+    service: Optional[str] = None
+    week: Optional[str] = None  # Lundi de la semaine (group_by=week)
+    count: int
+    late: int
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+class LatenessDistribution(BaseModel):
+    period: str
+    group_by: str
+    relative_accuracy: float
+    groups: List[LatenessGroup]
+
+class DashboardStats(BaseModel):
+    total_employees: int
+    present_today: int
+    late_this_month: int
+    current_leaves: int
+    presence_rate: float
+    period: str
+
+class TrendPoint(BaseModel):
+    date: str
+    present: int
+    late: int
+    absent: int
+
+class AttendanceTrend(BaseModel):
+    period: str
+    bucket: str = "day"  # day, week ou month ; date d'un point = premier jour de sa tranche
+    data: List[TrendPoint]
+
+class StatsPercentages(BaseModel):
+    on_time: float
+    late: float
+
+class AdminStats(BaseModel):
+    period: str
+    total_employees: int
+    on_time_employees: int
+    late_employees: int
+    total_leaves: int
+    holidays: int
+    percentages: StatsPercentages
+
+class ActivityItem(BaseModel):
+    type: str  # "attendance" ou "leave"
+    employee_name: str
+    timestamp: Optional[datetime]
+    details: str
+    status: str
@@ -0,0 +1,125 @@
+# tests/conftest.py
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+from app.models import Employee, Attendance
+from app.utils.auth import create_access_token
+from app.utils.employee_directory import employee_directory
+from app.utils.admission import admission
+from app.utils.leave_index import leave_index
+from app.utils.metrics import install_sql_hooks
+from app.utils.singleflight import SingleFlight
+from app.utils.time_calculations import compute_attendance_metrics
+
+
+@pytest.fixture
+def engine():
+    # Base SQLite en mémoire partagée entre les threads du TestClient
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    install_sql_hooks(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine):
+    TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = TestingSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    leave_index.loaded = False
+    employee_directory.invalidate()
+    admission.reset()
+    SingleFlight.clear_all()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    leave_index.loaded = False
+    employee_directory.invalidate()
+
+
+@pytest.fixture
+def admin_headers(db):
+    admin = Employee(
+        first_name="Admin",
+        last_name="System",
+        email="admin@pointagepro.com",
+        hashed_password="-",
+        service="Administration",
+        fonction="Administrateur",
+        matricule="ADM001",
+        date_embauche=date(2020, 1, 1),
+        is_admin=True,
+        is_active=True
+    )
+    db.add(admin)
+    db.commit()
+    token = create_access_token({"sub": admin.email, "role": "admin", "is_admin": True})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def seed_employees(db):
+    """seed_employees(count, days=10) : employés répartis sur trois services avec `days` jours de pointages"""
+    return lambda count, days=10: _seed_employees(db, count, days)
+
+
+def _seed_employees(db, count: int, days: int) -> None:
+    today = date.today()
+    employees = [
+        Employee(
+            first_name=f"Prenom{i}",
+            last_name=f"Nom{i}",
+            email=f"employe{i}@pointagepro.com",
+            hashed_password="-",
+            service=("Comptabilité", "Informatique", "Production")[i % 3],
+            fonction="Agent",
+            matricule=f"EMP{i:05d}",
+            date_embauche=date(2020, 1, 1),
+            is_active=True
+        )
+        for i in range(count)
+    ]
+    db.add_all(employees)
+    db.flush()
+    for employee in employees:
+        for offset in range(days):
+            day = today - timedelta(days=offset)
+            start = datetime(day.year, day.month, day.day)
+            attendance = Attendance(
+                employee_id=employee.id,
+                date=day.isoformat(),
+                morning_arrival=start.replace(hour=8, minute=(employee.id + offset) % 15),
+                morning_departure=start.replace(hour=12),
+                afternoon_arrival=start.replace(hour=14, minute=30),
+                afternoon_departure=start.replace(hour=18),
+                is_late_morning=(employee.id + offset) % 15 > 0,
+                is_absent=False
+            )
+            compute_attendance_metrics(attendance)
+            db.add(attendance)
+    db.commit()
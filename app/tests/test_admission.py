@@ -0,0 +1,154 @@
+# tests/test_admission.py
+import asyncio
+
+import pytest
+
+from app.utils.admission import (
+    CLOCKIN, HEAVY, INTERACTIVE, AdmissionController, AdmissionMiddleware, Lane, classify
+)
+
+
+def test_classify():
+    assert classify("/attendance/record") == CLOCKIN
+    assert classify("/admin/employees/pdf") == HEAVY
+    assert classify("/employees/export/excel") == HEAVY
+    assert classify("/exports/attendance.parquet") == HEAVY
+    assert classify("/reports/leaves") == HEAVY
+    assert classify("/admin/stats") == INTERACTIVE
+
+
+def test_heavy_requests_are_rate_limited_per_user(client, admin_headers, monkeypatch):
+    from app.config import settings
+    from app.utils.admission import admission
+
+    monkeypatch.setattr(settings, "admission_heavy_burst", 2)
+    monkeypatch.setattr(settings, "admission_heavy_per_minute", 1)
+    admission.reset()
+
+    statuses = [client.get("/employees/export/excel", headers=admin_headers).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    rejected = client.get("/employees/export/excel", headers=admin_headers)
+    assert int(rejected.headers["retry-after"]) >= 1
+    # Les lectures interactives ne sont pas concernées
+    assert client.get("/employees/", headers=admin_headers).status_code == 200
+
+
+def test_saturated_heavy_lane_rejects_but_clockins_pass():
+    release = None
+
+    async def slow_app(scope, receive, send):
+        if scope["path"].endswith("/pdf"):
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    def request(path):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": path, "headers": [], "client": ("10.0.0.1", 1234)}
+        return middleware(scope, None, send), sent
+
+    controller = AdmissionController()
+    controller.lanes[HEAVY] = Lane(HEAVY, limit=1, max_queue=1, timeout_s=0.05)
+    middleware = AdmissionMiddleware(slow_app, controller)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        first, first_sent = request("/admin/employees/pdf")
+        queued, queued_sent = request("/admin/employees/pdf")
+        overflow, overflow_sent = request("/admin/employees/pdf")
+        clockin, clockin_sent = request("/attendance/record")
+
+        running = asyncio.ensure_future(first)
+        await asyncio.sleep(0)
+        await asyncio.gather(queued, overflow, clockin)
+        release.set()
+        await running
+        return first_sent, queued_sent, overflow_sent, clockin_sent
+
+    first_sent, queued_sent, overflow_sent, clockin_sent = asyncio.run(scenario())
+    assert first_sent[0]["status"] == 200
+    assert clockin_sent[0]["status"] == 200
+    # L'une attend puis expire, l'autre trouve la file pleine : 429 dans les deux cas
+    for sent in (queued_sent, overflow_sent):
+        assert sent[0]["status"] == 429
+        assert (b"retry-after", b"1") in sent[0]["headers"]
+
+
+def test_lane_hands_slot_to_waiter_in_order():
+    lane = Lane(INTERACTIVE, limit=1, max_queue=5, timeout_s=1)
+
+    async def scenario():
+        await lane.acquire()
+        waiter = asyncio.ensure_future(lane.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        lane.release(0.1)
+        await waiter
+        assert lane.active == 1
+        lane.release(0.1)
+        assert lane.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_passes_on_the_slot_it_was_given():
+    lane = Lane(INTERACTIVE, limit=1, max_queue=5, timeout_s=1)
+
+    async def scenario():
+        await lane.acquire()
+        first = asyncio.ensure_future(lane.acquire())
+        second = asyncio.ensure_future(lane.acquire())
+        await asyncio.sleep(0)
+        lane.release(0.1)  # Place transmise à `first`...
+        first.cancel()  # ... annulé avant d'avoir repris la main
+        outcome = (await asyncio.gather(first, return_exceptions=True))[0]
+        if outcome is None:
+            lane.release(0.1)  # Annulation absorbée par wait_for (Python < 3.12) : la place est à lui
+        await asyncio.wait_for(second, 1)
+        lane.release(0.1)
+        assert lane.active == 0 and not lane._waiters
+
+    asyncio.run(scenario())
+
+
+def test_full_rate_buckets_are_forgotten(monkeypatch):
+    from app.utils import admission as module
+
+    monkeypatch.setattr(module, "BUCKET_SWEEP_MIN", 4)
+    controller = module.AdmissionController()
+    for address in range(50):
+        controller.check_rate(f"10.0.0.{address}")
+        # Un seau entamé se remplit avec le temps ; simulé en reculant sa dernière mise à jour
+        controller.buckets[f"10.0.0.{address}"].updated -= 3600
+    assert len(controller.buckets) <= 8
+
+    # Un seau épuisé n'est pas oublié : la limite tient toujours
+    controller.buckets.clear()
+    while controller.check_rate("lourd") is None:
+        pass
+    for address in range(50):
+        controller.check_rate(f"10.0.1.{address}")
+    assert controller.check_rate("lourd") is not None
+
+
+def test_pool_too_small_for_the_clockin_reserve_is_rejected(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "db_pool_size", 5)
+    monkeypatch.setattr(settings, "db_max_overflow", 0)
+    monkeypatch.setattr(settings, "admission_clockin_reserved", 4)
+    monkeypatch.setattr(settings, "admission_heavy_concurrency", 1)
+    with pytest.raises(ValueError, match="ADMISSION_CLOCKIN_RESERVED"):
+        AdmissionController()
+
+    monkeypatch.setattr(settings, "db_max_overflow", 1)
+    assert AdmissionController().lanes[INTERACTIVE].limit == 1
+    monkeypatch.setattr(settings, "admission_enabled", False)
+    monkeypatch.setattr(settings, "db_max_overflow", 0)
+    AdmissionController()  # Couloirs inutilisés : pas de contrôle
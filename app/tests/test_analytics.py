@@ -0,0 +1,69 @@
+# tests/test_analytics.py
+from datetime import date, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models import Attendance
+from app.utils.analytics import export_snapshot, reset_connection, use_analytics
+from app.utils.archive import archive_attendance
+from app.utils.stats_calculations import calculate_late_employees, calculate_on_time_employees
+from app.utils.time_calculations import calculate_employee_stats, calculate_employees_stats
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def analytics(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "attendance_archive_dir", str(tmp_path / "archive"))
+    monkeypatch.setattr(settings, "analytics_snapshot_dir", str(tmp_path / "snapshot"))
+    monkeypatch.setattr(settings, "analytics_source", "parquet")
+    reset_connection()
+    yield monkeypatch
+    reset_connection()
+
+
+def test_duckdb_results_match_sql(db, analytics, seed_employees):
+    seed_employees(12, days=120)
+    # Drapeaux NULL et absences : même sémantique des deux côtés
+    db.query(Attendance).filter(Attendance.id % 7 == 0).update({Attendance.is_absent: True}, synchronize_session=False)
+    db.query(Attendance).filter(Attendance.id % 11 == 0).update({Attendance.is_late_afternoon: None}, synchronize_session=False)
+    db.commit()
+    archive_attendance(db, date.today() - timedelta(days=60))
+    export_snapshot(db)
+
+    start, end = date.today() - timedelta(days=119), date.today()
+
+    def figures():
+        return (
+            calculate_employees_stats(db, start, end),
+            calculate_employees_stats(db, start, end, [2, 5, 99]),
+            calculate_employee_stats(db, 3, start, end),
+            calculate_late_employees(db, start, end),
+            calculate_on_time_employees(db, start, end),
+        )
+
+    expected = figures()
+    analytics.setattr(settings, "analytics_backend", "duckdb")
+    assert use_analytics(start, end)
+    assert figures() == expected
+
+
+def test_rows_archived_after_snapshot_are_counted_once(db, analytics, seed_employees):
+    seed_employees(6, days=120)
+    export_snapshot(db)
+    # Archivage postérieur à l'export : les lignes sont à la fois dans l'instantané et les archives
+    archive_attendance(db, date.today() - timedelta(days=60))
+
+    start, end = date.today() - timedelta(days=119), date.today()
+    expected = (calculate_employees_stats(db, start, end), calculate_late_employees(db, start, end))
+    analytics.setattr(settings, "analytics_backend", "duckdb")
+    assert (calculate_employees_stats(db, start, end), calculate_late_employees(db, start, end)) == expected
+    assert sum(stats["present_days"] for stats in expected[0].values()) == 6 * 120
+
+
+def test_short_periods_stay_on_sql(analytics):
+    analytics.setattr(settings, "analytics_backend", "duckdb")
+    assert not use_analytics(date(2024, 6, 1), date(2024, 6, 30))
+    assert use_analytics(date(2024, 1, 1), date(2024, 3, 31))
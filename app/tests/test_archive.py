@@ -0,0 +1,71 @@
+# tests/test_archive.py
+from datetime import date, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models import Attendance
+from app.utils.archive import archive_attendance, archived_months, load_attendance
+from app.utils.stats_calculations import calculate_late_employees, calculate_on_time_employees
+from app.utils.time_calculations import calculate_employees_stats
+from app.utils.timesheet import compute_timesheet_stats, load_timesheet
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "attendance_archive_dir", str(tmp_path))
+    return tmp_path
+
+
+def test_archived_months_are_read_transparently(db, archive_dir, seed_employees):
+    seed_employees(6, days=70)
+    start, end = date.today() - timedelta(days=69), date.today()
+    # Pointages réels (datetime.now()) : secondes et microsecondes
+    for attendance in db.query(Attendance).filter(Attendance.id % 3 == 0):
+        attendance.morning_arrival = attendance.morning_arrival.replace(second=41, microsecond=250_731)
+        attendance.afternoon_departure = attendance.afternoon_departure.replace(second=7, microsecond=999_999)
+    db.commit()
+
+    def snapshot():
+        return (
+            calculate_employees_stats(db, start, end),
+            compute_timesheet_stats(load_timesheet(db, 1, start, end)),
+            calculate_late_employees(db, start, end),
+            calculate_on_time_employees(db, start, end),
+            [tuple(row) for row in load_attendance(db, start, end, ("date", "employee_id", "worked_minutes"), [2])],
+            sorted(tuple(row) for row in load_attendance(
+                db, start, end, ("id", "morning_arrival", "afternoon_departure")
+            )),
+        )
+
+    before = snapshot()
+    archived = archive_attendance(db, date.today() - timedelta(days=30))
+
+    assert sum(archived.values()) == 6 * 39
+    assert db.query(Attendance).count() == 6 * 31
+    assert all(name.suffix == ".parquet" for name in archive_dir.iterdir())
+    assert archived_months(start, end)
+    assert snapshot() == before
+
+
+def test_archiving_twice_does_not_duplicate_rows(db, archive_dir, seed_employees):
+    seed_employees(2, days=40)
+    cutoff = date.today() - timedelta(days=20)
+    start = date.today() - timedelta(days=39)
+
+    archive_attendance(db, cutoff)
+    # Interruption simulée : fichiers écrits mais lignes encore présentes dans la table
+    columns = [column.name for column in Attendance.__table__.columns]
+    rows = load_attendance(db, start, cutoff - timedelta(days=1), columns)
+    db.execute(Attendance.__table__.insert(), [row._asdict() for row in rows])
+    db.commit()
+    archive_attendance(db, cutoff)
+
+    assert len(load_attendance(db, start, cutoff - timedelta(days=1), ("employee_id",))) == 2 * 19
+
+
+def test_recent_period_touches_no_archive(db, archive_dir):
+    assert archived_months(date(2024, 1, 1), date(2024, 12, 31)) == []
+    assert load_attendance(db, date(2024, 1, 1), date(2024, 12, 31), ("employee_id",)) == []
@@ -0,0 +1,278 @@
+# tests/test_cache.py
+import asyncio
+import fnmatch
+import time
+from datetime import date, datetime
+
+import pytest
+
+from app.cache import Cache, MemoryBackend, RedisBackend, SQLiteBackend, create_backend
+from app.cache import serialization
+
+
+class FakeRedis:
+    """Serveur RESP minimal en mémoire (GET, SET PX, DEL, INCR, MGET, SCAN)"""
+
+    def __init__(self):
+        self.data = {}
+        self.server = None
+        self.delay = 0.0  # Latence avant chaque réponse
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _value(self, key):
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry and entry[0]
+
+    @staticmethod
+    def _bulk(value) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(self._reply(args[0].upper(), args[1:]))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _reply(self, command, args) -> bytes:
+        if command == b"GET":
+            return self._bulk(self._value(args[0]))
+        if command == b"MGET":
+            return b"*%d\r\n" % len(args) + b"".join(self._bulk(self._value(key)) for key in args)
+        if command == b"SET":
+            expires_at = time.monotonic() + int(args[3]) / 1000 if len(args) > 2 else None
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(key, None) is not None for key in args)
+        if command == b"INCR":
+            value = int(self._value(args[0]) or 0) + 1
+            self.data[args[0]] = (str(value).encode(), None)
+            return b":%d\r\n" % value
+        if command == b"SCAN":
+            # Un seul passage : curseur final 0, glob Redis approché par fnmatch
+            keys = [key for key in self.data if fnmatch.fnmatchcase(key.decode(), args[2].decode())]
+            return b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(self._bulk(key) for key in keys)
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def run_with_cache(request, tmp_path):
+    """Exécute `scenario(cache)` dans une boucle neuve, sur chacun des stockages"""
+
+    def run(scenario, **options):
+        async def main():
+            fake = None
+            if request.param == "memory":
+                backend = MemoryBackend()
+            elif request.param == "sqlite":
+                backend = SQLiteBackend(str(tmp_path / "cache.sqlite"))
+            else:
+                fake = FakeRedis()
+                backend = RedisBackend(port=await fake.start())
+            cache = Cache(backend, name=f"test-{request.param}", **options)
+            try:
+                return await scenario(cache)
+            finally:
+                await cache.close()
+                if fake is not None:
+                    await fake.stop()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_get_set_delete_round_trip(run_with_cache):
+    value = {"date": date(2024, 3, 1), "at": datetime(2024, 3, 1, 8, 30), "ids": {1, 2}, "rows": [1, "a", None]}
+
+    async def scenario(cache):
+        assert await cache.get("k") is None
+        await cache.set("k", value)
+        assert await cache.get("k") == value
+        await cache.delete("k")
+        assert await cache.get("k", "absent") == "absent"
+        return cache.stats()
+
+    stats = run_with_cache(scenario)
+    assert (stats.hits, stats.misses, stats.sets, stats.deletes) == (1, 2, 1, 1)
+
+
+def test_entries_expire_after_ttl(run_with_cache):
+    async def scenario(cache):
+        await cache.set("short", 1, ttl=0.05)
+        await cache.set("forever", 2, ttl=None)
+        assert await cache.get("short") == 1
+        await asyncio.sleep(0.1)
+        return await cache.get("short"), await cache.get("forever")
+
+    assert run_with_cache(scenario) == (None, 2)
+
+
+def test_tags_invalidate_a_group_of_entries(run_with_cache):
+    async def scenario(cache):
+        await cache.set("stats:jan", 10, tags=["attendance"])
+        await cache.set("stats:feb", 20, tags=["attendance", "employees"])
+        await cache.set("services", ["A"], tags=["employees"])
+        await cache.invalidate_tags("attendance")
+        values = [await cache.get(key) for key in ("stats:jan", "stats:feb", "services")]
+        # Réécrite après invalidation, l'entrée porte la nouvelle version
+        await cache.set("stats:jan", 11, tags=["attendance"])
+        return values, await cache.get("stats:jan")
+
+    assert run_with_cache(scenario) == ([None, None, ["A"]], 11)
+
+
+def test_clear_keeps_other_namespaces(run_with_cache):
+    async def scenario(cache):
+        other = Cache(cache.backend, name="other", namespace="autre")
+        await cache.set("k", 1, tags=["attendance"])
+        await other.set("k", 2, tags=["attendance"])
+        await other.invalidate_tags("attendance")
+        await other.set("k", 2, tags=["attendance"])
+        await cache.clear()
+        return await cache.get("k"), await other.get("k")
+
+    assert run_with_cache(scenario) == (None, 2)
+
+
+def test_get_or_set_computes_once_for_concurrent_callers(run_with_cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"total": 42}
+
+    async def compute_async():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [1, 2]
+
+    async def scenario(cache):
+        sync = await asyncio.gather(*(cache.get_or_set("sync", compute) for _ in range(8)))
+        coroutine = await asyncio.gather(*(cache.get_or_set("async", compute_async) for _ in range(8)))
+        again = await cache.get_or_set("sync", compute)
+        return sync, coroutine, again, cache.stats()
+
+    sync, coroutine, again, stats = run_with_cache(scenario)
+    assert sync == [{"total": 42}] * 8
+    assert coroutine == [[1, 2]] * 8
+    assert again == {"total": 42}
+    assert len(calls) == 2
+    assert stats.coalesced == 14
+
+
+def test_invalidation_during_computation_is_not_lost(run_with_cache):
+    async def scenario(cache):
+        async def compute():
+            # Écriture concurrente pendant le calcul : le résultat est déjà périmé
+            await cache.invalidate_tags("attendance")
+            return "stale"
+
+        first = await cache.get_or_set("stats", compute, tags=["attendance"])
+
+        async def recompute():
+            return "fresh"
+
+        return first, await cache.get_or_set("stats", recompute, tags=["attendance"])
+
+    assert run_with_cache(scenario) == ("stale", "fresh")
+
+
+def test_redis_command_cancelled_before_its_reply():
+    async def scenario():
+        fake = FakeRedis()
+        backend = RedisBackend(port=await fake.start())
+        try:
+            await backend.set("a", b"AAA", None)
+            await backend.set("b", b"BBB", None)
+            fake.delay = 0.1
+            pending = asyncio.ensure_future(backend.get("a"))
+            await asyncio.sleep(0.02)  # GET a envoyé, réponse pas encore reçue
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+            fake.delay = 0.0
+            # La réponse de GET a ne doit pas être lue comme celle de GET b
+            return await backend.get("b")
+        finally:
+            await backend.close()
+            await fake.stop()
+
+    assert asyncio.run(scenario()) == b"BBB"
+
+
+def test_memory_backend_evicts_least_recently_used():
+    async def scenario():
+        cache = Cache(MemoryBackend(max_entries=2), name="test-lru")
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+        return [await cache.get(key) for key in "abc"], cache.stats()
+
+    values, stats = asyncio.run(scenario())
+    assert values == [1, None, 3]
+    assert stats.evictions == 1
+
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+
+    async def write():
+        cache = Cache(SQLiteBackend(path), default_ttl=None)
+        await cache.set("report", {"rows": 3}, tags=["attendance"])
+        await cache.close()
+
+    async def read():
+        cache = Cache(SQLiteBackend(path))
+        try:
+            return await cache.get("report")
+        finally:
+            await cache.close()
+
+    asyncio.run(write())
+    assert asyncio.run(read()) == {"rows": 3}
+
+
+def test_create_backend_from_url(tmp_path):
+    assert isinstance(create_backend("memory://?max_entries=5"), MemoryBackend)
+    assert create_backend("memory://?max_entries=5").max_entries == 5
+    backend = create_backend(f"sqlite:///{tmp_path}/cache.sqlite")
+    assert backend.path == f"{tmp_path}/cache.sqlite"
+    redis = create_backend("redis://:secret@cache.local:6380/2")
+    assert (redis.host, redis.port, redis.db, redis.password) == ("cache.local", 6380, 2, "secret")
+    with pytest.raises(ValueError):
+        create_backend("memcached://localhost")
+
+
+def test_serialization_falls_back_to_pickle(monkeypatch):
+    value = {"at": datetime(2024, 1, 2, 3, 4), "ids": {3}}
+    packed = serialization.dumps(value)
+    assert packed[:1] == serialization.MSGPACK
+
+    monkeypatch.setattr(serialization, "msgpack", None)
+    pickled = serialization.dumps(value)
+    assert pickled[:1] == serialization.PICKLE
+    assert serialization.loads(pickled) == value
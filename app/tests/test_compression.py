@@ -0,0 +1,57 @@
+# tests/test_compression.py
+import asyncio
+import gzip
+
+from app.utils.compression import CompressionMiddleware, brotli, negotiate_encoding
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("br;q=1.0, gzip;q=0.8") == ("br" if brotli else "gzip")
+
+
+def test_json_listing_is_compressed_and_small_responses_are_not(client, db, admin_headers, seed_employees):
+    seed_employees(30)
+
+    response = client.get("/employees/", headers={**admin_headers, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"].startswith("W/")
+    assert len(response.json()) == 31
+
+    small = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_xlsx_export_is_not_recompressed(client, db, admin_headers, seed_employees):
+    seed_employees(30)
+
+    response = client.get("/employees/export/excel", headers={**admin_headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_streamed_body_is_compressed_chunk_by_chunk():
+    chunks = [(f"ligne {i};" * 200).encode() for i in range(5)]
+
+    async def streaming_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/csv")]})
+        for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(streaming_app, minimum_size=10**6)(scope, None, send))
+
+    bodies = [message for message in sent if message["type"] == "http.response.body"]
+    # Compressé malgré le seuil (taille totale inconnue) et envoyé en plusieurs morceaux
+    assert (b"content-encoding", b"gzip") in sent[0]["headers"]
+    assert len(bodies) > 1
+    assert gzip.decompress(b"".join(message["body"] for message in bodies)) == b"".join(chunks)
@@ -0,0 +1,109 @@
+# tests/test_employee_directory.py
+from datetime import date
+
+from app.models import Employee
+from app.utils.employee_directory import DirectorySnapshot, EmployeeRecord, employee_directory
+from app.utils.sql_profiler import record_queries
+
+
+def _record(id, first_name, service, is_active=True, matricule=None):
+    return EmployeeRecord(
+        id, first_name, "Test", f"{first_name.lower()}@pointagepro.com", service, "Agent",
+        matricule or f"M{id:03d}", date(2024, 1, 1), is_active, False
+    )
+
+
+def test_snapshot_filters_like_the_sql_query():
+    snapshot = DirectorySnapshot.build([
+        _record(3, "Chloé", "Informatique"),
+        _record(1, "Alice", "Comptabilité", is_active=False),
+        _record(2, "Bruno", "Informatique", matricule="INF042"),
+        _record(4, "Denis", None),
+    ], version=7)
+
+    assert [r.first_name for r in snapshot.records] == ["Alice", "Bruno", "Chloé", "Denis"]
+    assert snapshot.services == ["Comptabilité", "Informatique"]
+    assert snapshot.by_matricule["INF042"].id == 2
+    assert snapshot.by_email["alice@pointagepro.com"].id == 1
+
+    assert [r.id for r in snapshot.filter(service="Informatique")] == [2, 3]
+    assert [r.id for r in snapshot.filter(service="all", status="inactive")] == [1]
+    assert [r.id for r in snapshot.filter(status="active", search="INFO")] == [2, 3]
+    assert [r.id for r in snapshot.filter(search="inf042")] == [2]
+    assert snapshot.filter(service="Production") == []
+
+
+def test_reads_are_served_from_memory(client, db, engine, admin_headers, seed_employees):
+    seed_employees(6)
+    first = client.get("/employees/", headers=admin_headers).json()
+    assert len(first) == 7
+
+    with record_queries(engine) as recorder:
+        services = client.get("/employees/services/list", headers=admin_headers).json()
+        searched = client.get("/employees/?search=employe1@", headers=admin_headers).json()
+    # Seule la lecture des versions (ETag) touche la base
+    assert recorder.count == 2
+    assert services == {"services": ["Administration", "Comptabilité", "Informatique", "Production"]}
+    assert [row["email"] for row in searched] == ["employe1@pointagepro.com"]
+
+    employee_id = searched[0]["id"]
+    assert client.get(f"/employees/{employee_id}", headers=admin_headers).json()["email"] == "employe1@pointagepro.com"
+
+
+def test_writes_rebuild_the_snapshot_copy_on_write(client, db, admin_headers, seed_employees):
+    seed_employees(3)
+    client.get("/employees/", headers=admin_headers)
+    before = employee_directory._snapshot
+
+    created = client.post("/employees/", headers=admin_headers, json={
+        "first_name": "Zoé",
+        "last_name": "Martin",
+        "email": "zoe@pointagepro.com",
+        "password": "secret",
+        "service": "Qualité",
+        "fonction": "Auditrice",
+        "matricule": "QUA001",
+        "date_embauche": "2024-05-02"
+    }).json()
+
+    after = employee_directory._snapshot
+    assert after is not before and after.version == before.version + 1
+    assert len(before.records) == 4  # L'ancien instantané n'est pas modifié
+    assert after.by_id[created["id"]].service == "Qualité"
+
+    duplicate = client.post("/employees/", headers=admin_headers, json={
+        "first_name": "Autre",
+        "last_name": "Zoé",
+        "email": "zoe@pointagepro.com",
+        "password": "secret",
+        "service": "Qualité",
+        "fonction": "Agent",
+        "matricule": "QUA002",
+        "date_embauche": "2024-05-02"
+    })
+    assert duplicate.status_code == 400
+
+    client.delete(f"/employees/{created['id']}", headers=admin_headers)
+    inactive = client.get("/employees/?status=inactive", headers=admin_headers).json()
+    assert [row["email"] for row in inactive] == ["zoe@pointagepro.com"]
+
+
+def test_external_writes_reload_the_snapshot(client, db, admin_headers, seed_employees):
+    seed_employees(2)
+    assert len(client.get("/employees/", headers=admin_headers).json()) == 3
+
+    db.add(Employee(
+        first_name="Externe",
+        last_name="Script",
+        email="externe@pointagepro.com",
+        hashed_password="-",
+        service="Logistique",
+        matricule="EXT001",
+        is_active=True
+    ))
+    db.commit()
+
+    assert "Logistique" in client.get("/employees/services/list", headers=admin_headers).json()["services"]
+    # Nouvelle version publiée par un autre worker : l'instantané local est abandonné
+    employee_directory.invalidate(version=employee_directory._snapshot.version + 1)
+    assert employee_directory._snapshot is None
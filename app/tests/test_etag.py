@@ -0,0 +1,85 @@
+# tests/test_etag.py
+from datetime import date
+
+from app.models import Employee, Leave
+from app.utils.data_versions import get_versions
+from app.utils.sql_profiler import record_queries
+
+
+def test_conditional_get_returns_304_until_data_changes(client, db, engine, admin_headers, seed_employees):
+    seed_employees(5)
+
+    first = client.get("/employees/", headers=admin_headers)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and "last-modified" in first.headers
+
+    with record_queries(engine) as recorder:
+        cached = client.get("/employees/", headers={**admin_headers, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    # Authentification + lecture des versions : la liste n'est pas requêtée
+    assert recorder.count <= 2
+
+    # D'autres paramètres donnent un autre ETag
+    filtered = client.get("/employees/?service=Informatique", headers={**admin_headers, "If-None-Match": etag})
+    assert filtered.status_code == 200
+
+    db.add(Employee(
+        first_name="Nouvel",
+        last_name="Employe",
+        email="nouvel@pointagepro.com",
+        hashed_password="-",
+        service="Informatique",
+        fonction="Agent",
+        matricule="NEW001",
+        date_embauche=date(2024, 1, 1),
+        is_active=True
+    ))
+    db.commit()
+
+    refreshed = client.get("/employees/", headers={**admin_headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert len(refreshed.json()) == len(first.json()) + 1
+
+
+def test_versions_bumped_by_flush_and_bulk_update(db):
+    db.add(Leave(employee_id=1, start_date="2025-07-01", end_date="2025-07-05", leave_type="congé", status="pending"))
+    db.commit()
+    assert get_versions(db, ["leaves", "attendance"])["leaves"][0] == 1
+    assert get_versions(db, ["attendance"])["attendance"][0] == 0
+
+    db.query(Leave).filter(Leave.employee_id == 1).update({Leave.status: "approved"}, synchronize_session=False)
+    db.commit()
+    assert get_versions(db, ["leaves"])["leaves"][0] == 2
+
+
+def test_versions_bumped_after_commit_only(db, engine):
+    from app.utils.sql_profiler import record_queries
+
+    db.add(Leave(employee_id=1, start_date="2025-07-01", end_date="2025-07-05", leave_type="congé", status="pending"))
+    with record_queries(engine) as recorder:
+        db.flush()
+    # Rien sur data_versions pendant la transaction d'écriture
+    assert not any("data_versions" in statement for statement in recorder.statements)
+    db.rollback()
+    assert get_versions(db, ["leaves"])["leaves"][0] == 0
+
+    db.add(Leave(employee_id=1, start_date="2025-07-01", end_date="2025-07-05", leave_type="congé", status="pending"))
+    db.commit()
+    assert get_versions(db, ["leaves"])["leaves"][0] == 1
+
+
+def test_failed_version_bump_does_not_fail_commit(db, monkeypatch, caplog):
+    from app.utils import data_versions
+
+    def fail(connection, tables):
+        raise RuntimeError("data_versions verrouillée")
+
+    monkeypatch.setattr(data_versions, "bump_versions", fail)
+    db.add(Leave(employee_id=1, start_date="2025-07-01", end_date="2025-07-05", leave_type="congé", status="pending"))
+    db.commit()  # Données déjà validées : pas d'exception pour l'appelant
+
+    assert db.query(Leave).count() == 1
+    assert get_versions(db, ["leaves"])["leaves"][0] == 0
+    assert len([record for record in caplog.records if record.name == "app.data_versions"]) == \
+        data_versions.BUMP_ATTEMPTS
@@ -0,0 +1,54 @@
+# tests/test_exports.py
+import io
+from datetime import date, timedelta
+
+import pytest
+
+from app.config import settings
+from app.utils import arrow_export
+from app.utils.archive import archive_attendance
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc  # noqa: E402
+import pyarrow.parquet  # noqa: E402
+
+
+def test_parquet_export_is_typed_and_includes_archives(client, db, admin_headers, tmp_path, monkeypatch, seed_employees):
+    monkeypatch.setattr(settings, "attendance_archive_dir", str(tmp_path))
+    monkeypatch.setattr(arrow_export, "EXPORT_BATCH_SIZE", 50)
+    seed_employees(9, days=45)
+    archive_attendance(db, date.today() - timedelta(days=20))
+
+    response = client.get("/exports/attendance.parquet", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == arrow_export.PARQUET_MEDIA_TYPE
+
+    table = pa.parquet.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 9 * 45
+    assert table.schema.field("date").type == pa.date32()
+    assert pa.types.is_timestamp(table.schema.field("morning_arrival").type)
+    assert pa.types.is_dictionary(table.schema.field("service").type)
+    assert set(table.column("service").to_pylist()) == {"Comptabilité", "Informatique", "Production"}
+    # Plusieurs groupes de lignes : le fichier a bien été produit par lots
+    assert pa.parquet.ParquetFile(io.BytesIO(response.content)).num_row_groups > 1
+
+
+def test_arrow_stream_filters_period_and_service(client, db, admin_headers, seed_employees):
+    seed_employees(9, days=10)
+    start = date.today() - timedelta(days=4)
+
+    response = client.get(
+        "/exports/attendance.arrow",
+        params={"start_date": start.isoformat(), "service": "Informatique"},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 3 * 5
+    assert min(table.column("date").to_pylist()) == start
+    assert set(table.column("service").to_pylist()) == {"Informatique"}
+
+
+def test_export_requires_admin(client):
+    assert client.get("/exports/attendance.parquet").status_code == 401
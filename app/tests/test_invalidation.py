@@ -0,0 +1,71 @@
+# tests/test_invalidation.py
+from datetime import date
+
+from sqlalchemy.orm import sessionmaker
+
+from app import main
+from app.models import Employee, Leave
+from app.utils.data_versions import ensure_data_versions
+from app.utils.invalidation import InvalidationBus
+from app.utils.leave_index import leave_index
+
+
+def test_writes_from_another_session_reach_subscribers(engine, db):
+    ensure_data_versions(db)
+    bus = InvalidationBus()
+    received = []
+    bus.subscribe(["employees", "holidays"], lambda table, version: received.append((table, version)))
+
+    assert bus.poll(engine) == []  # référence
+
+    # Un autre « worker » : une autre session sur la même base
+    other = sessionmaker(bind=engine)()
+    other.add(Employee(first_name="A", last_name="B", email="a@pointagepro.com", hashed_password="-",
+                       service="Production", fonction="Agent", matricule="EMP1", is_active=True))
+    other.commit()
+    other.close()
+
+    assert bus.poll(engine) == ["employees"]
+    assert received == [("employees", 1)]
+    assert bus.poll(engine) == []
+
+    bus.notify(engine, "holidays")
+    bus.poll(engine)
+    assert received[-1] == ("holidays", 1)
+
+
+def test_leave_index_reloads_after_remote_leave_change(engine, db):
+    from app.utils.invalidation import invalidation_bus
+
+    ensure_data_versions(db)
+    leave_index.load(db)
+    invalidation_bus.poll(engine)
+
+    invalidation_bus.notify(engine, "leaves")
+    invalidation_bus.poll(engine)
+    assert not leave_index.loaded
+
+
+def test_write_during_warm_up_is_not_missed(engine, db, monkeypatch):
+    from app.utils.invalidation import invalidation_bus
+
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(invalidation_bus, "_seen", None)  # Processus neuf
+    main.warm_up()
+    assert leave_index.loaded
+
+    # Congé approuvé par un autre worker juste après le chargement de l'index
+    other = sessionmaker(bind=engine)()
+    other.add(Employee(first_name="A", last_name="B", email="a@pointagepro.com", hashed_password="-",
+                       service="Production", fonction="Agent", matricule="EMP1", is_active=True))
+    other.flush()
+    today = date.today().isoformat()
+    other.add(Leave(employee_id=1, start_date=today, end_date=today, leave_type="congé", status="approved"))
+    other.commit()
+    other.close()
+
+    assert "leaves" in invalidation_bus.poll(engine)
+    leave_index.ensure_loaded(db)
+    assert leave_index.is_on_leave(1, today)
+    leave_index.invalidate()
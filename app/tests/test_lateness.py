@@ -0,0 +1,119 @@
+# tests/test_lateness.py
+import random
+import threading
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Attendance, LatenessBin
+from app.utils.lateness import (
+    LatenessSketch,
+    RELATIVE_ACCURACY,
+    _spans,
+    _bump_statement,
+    bump_lateness,
+    lateness_by_service,
+    rebuild_lateness,
+    record_arrivals,
+)
+
+
+def _exact(values, q):
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def test_sketch_quantiles_within_relative_accuracy_and_mergeable():
+    rng = random.Random(7)
+    values = [0] * 300 + [rng.randint(1, 240) for _ in range(700)]
+    left, right, whole = LatenessSketch(), LatenessSketch(), LatenessSketch()
+    for index, value in enumerate(values):
+        (left if index % 2 else right).add(value)
+        whole.add(value)
+
+    merged = left.merge(right)
+    assert merged.counts == whole.counts
+    for q in (0.1, 0.5, 0.9, 0.99):
+        exact = _exact(values, q)
+        assert abs(merged.quantile(q) - exact) <= RELATIVE_ACCURACY * exact + 1e-9
+    assert merged.summary()["late"] == 700
+
+
+def test_period_is_split_into_whole_months_and_edges():
+    months, days = _spans(date(2025, 1, 15), date(2025, 4, 10))
+    assert months == ["2025-02-01", "2025-03-01"]
+    assert days == [("2025-01-15", "2025-01-31"), ("2025-04-01", "2025-04-10")]
+    assert _spans(date(2025, 2, 1), date(2025, 2, 28)) == (["2025-02-01"], [])
+
+
+def test_record_arrivals_counts_corrections_once(db):
+    record_arrivals(db, "Informatique", "2025-03-04", {}, {"morning": 12})
+    record_arrivals(db, "Informatique", "2025-03-04", {"morning": 12}, {"morning": 0, "afternoon": 5})
+    db.commit()
+
+    sketch = lateness_by_service(db, date(2025, 3, 1), date(2025, 3, 31))["Informatique"]
+    assert sketch.count == 2 and sketch.summary()["late"] == 1
+    # Le mois et le jour portent les mêmes compteurs
+    day = lateness_by_service(db, date(2025, 3, 4), date(2025, 3, 4))["Informatique"]
+    assert day.counts == sketch.counts
+
+
+def test_first_arrivals_from_two_sessions_add_up(tmp_path):
+    # Deux pointages simultanés qui créent le même compteur (première arrivée à l'heure du jour)
+    engine = create_engine(f"sqlite:///{tmp_path / 'bins.db'}", connect_args={"timeout": 5})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    first, second = Session(), Session()
+
+    bump_lateness(first, "Production", "2025-03-04", 0)
+    other = threading.Thread(target=lambda: (bump_lateness(second, "Production", "2025-03-04", 0), second.commit()))
+    other.start()
+    first.commit()
+    other.join()
+    first.close()
+    second.close()
+
+    with Session() as session:
+        counts = {(row.granularity, row.count) for row in session.query(LatenessBin)}
+    assert counts == {("day", 2), ("month", 2)}
+    engine.dispose()
+
+
+def test_bump_is_an_upsert_on_postgresql():
+    from sqlalchemy.dialects import postgresql
+
+    sql = str(_bump_statement("postgresql").compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (service, granularity, period, bin) DO UPDATE" in sql
+    assert "lateness_bins.count + excluded.count" in sql
+
+
+def test_distribution_endpoint_matches_exact_percentiles(client, db, admin_headers, seed_employees):
+    seed_employees(9, days=40)
+    assert rebuild_lateness(db, date.today() - timedelta(days=45), date.today()) == 9 * 40 * 2
+    assert db.query(LatenessBin).filter(LatenessBin.granularity == "month").count() > 0
+
+    start = date.today() - timedelta(days=39)
+    params = {"period": "custom", "start_date": start.isoformat(), "end_date": date.today().isoformat()}
+    response = client.get("/stats/lateness-distribution", params=params, headers=admin_headers)
+    assert response.status_code == 200
+    groups = {group["service"]: group for group in response.json()["groups"]}
+    assert set(groups) == {"Comptabilité", "Informatique", "Production"}
+
+    rows = db.query(Attendance.employee_id, Attendance.late_minutes_morning, Attendance.late_minutes_afternoon).all()
+    services = {2 + i: ("Comptabilité", "Informatique", "Production")[i % 3] for i in range(9)}
+    production = [minutes for row in rows if services[row[0]] == "Production" for minutes in row[1:]]
+    assert groups["Production"]["count"] == len(production)
+    for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        exact = _exact(production, q)
+        assert abs(groups["Production"][name] - exact) <= RELATIVE_ACCURACY * exact + 0.05
+
+    weekly = client.get(
+        "/stats/lateness-distribution", params={**params, "group_by": "week", "service": "Production"},
+        headers=admin_headers
+    ).json()["groups"]
+    assert sum(group["count"] for group in weekly) == len(production)
+    assert all(date.fromisoformat(group["week"]).weekday() == 0 for group in weekly)
+
+    invalid = client.get("/stats/lateness-distribution", params={"group_by": "day"}, headers=admin_headers)
+    assert invalid.status_code == 400
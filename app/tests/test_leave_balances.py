@@ -0,0 +1,70 @@
+# tests/test_leave_balances.py
+from datetime import date
+
+from app.models import Employee, Holiday, Leave, LeaveBalance
+from app.utils.holidays import count_working_days_by_year
+from app.utils.leave_balances import ANNUAL_LEAVE_DAYS, set_leave_status, total_remaining_leaves
+
+
+def add_holidays(db):
+    db.add_all([
+        Holiday(date="2020-01-01", name="Nouvel An", is_recurring=True),
+        Holiday(date="2024-12-30", name="Pont 2024", is_recurring=False),  # Une seule année
+    ])
+    db.commit()
+
+
+def taken_days(db, employee_id):
+    db.expire_all()
+    return dict(db.query(LeaveBalance.year, LeaveBalance.taken_days).filter(LeaveBalance.employee_id == employee_id))
+
+
+def test_working_days_across_years_skip_weekends_and_holidays(db):
+    add_holidays(db)
+    # Lundi 29/12/2025 au lundi 05/01/2026 : le 1er janvier est férié tous les ans
+    assert count_working_days_by_year(db, date(2025, 12, 29), date(2026, 1, 5)) == {2025: 3, 2026: 2}
+    assert count_working_days_by_year(db, date(2024, 12, 30), date(2024, 12, 31)) == {2024: 1}
+
+
+def test_status_changes_debit_and_credit_the_ledger(db, seed_employees):
+    seed_employees(1, days=0)
+    add_holidays(db)
+    leave = Leave(employee_id=1, start_date="2025-12-29", end_date="2026-01-05", leave_type="congé", status="pending")
+    permission = Leave(employee_id=1, start_date="2025-06-02", end_date="2025-06-03", leave_type="permission",
+                       status="pending")
+    db.add_all([leave, permission])
+    db.commit()
+
+    set_leave_status(db, leave, "approved")
+    set_leave_status(db, permission, "approved")  # Les permissions ne sont pas décomptées
+    db.commit()
+    assert taken_days(db, 1) == {2025: 3, 2026: 2}
+
+    set_leave_status(db, leave, "approved")  # Aucun double débit
+    db.commit()
+    assert taken_days(db, 1) == {2025: 3, 2026: 2}
+
+    set_leave_status(db, leave, "rejected")
+    db.commit()
+    assert taken_days(db, 1) == {2025: 0, 2026: 0}
+
+
+def test_balance_endpoint_and_total_remaining(client, db, admin_headers, seed_employees):
+    seed_employees(3, days=0)
+    db.add(LeaveBalance(employee_id=2, year=2025, entitled_days=ANNUAL_LEAVE_DAYS, taken_days=7))
+    db.query(Employee).filter(Employee.id == 4).update({Employee.is_active: False})
+    db.commit()
+
+    response = client.get("/leaves/balance/2", params={"year": 2025}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "employee_id": 2, "year": 2025, "entitled_days": ANNUAL_LEAVE_DAYS, "taken_days": 7,
+        "remaining_days": ANNUAL_LEAVE_DAYS - 7
+    }
+    # Sans ligne de solde : droits annuels entiers
+    assert client.get("/leaves/balance/3", params={"year": 2025}, headers=admin_headers).json()["remaining_days"] == \
+        ANNUAL_LEAVE_DAYS
+
+    # Admin, employés 2 et 3 actifs ; l'employé 4 est inactif
+    assert total_remaining_leaves(db, 2025) == 3 * ANNUAL_LEAVE_DAYS - 7
+    assert total_remaining_leaves(db, 2025, [2, 4]) == 2 * ANNUAL_LEAVE_DAYS - 7
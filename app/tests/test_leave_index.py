@@ -0,0 +1,46 @@
+# tests/test_leave_index.py
+from datetime import date
+from types import SimpleNamespace
+
+from app.utils.leave_index import LeaveIndex
+
+
+def leave(id, employee_id, start, end, status="approved"):
+    return SimpleNamespace(id=id, employee_id=employee_id, start_date=start, end_date=end, status=status)
+
+
+def build_index():
+    index = LeaveIndex()
+    index.apply(leave(1, 10, "2024-07-01", "2024-07-31"))
+    index.apply(leave(2, 10, "2024-07-10", "2024-07-12"))  # chevauche le premier
+    index.apply(leave(3, 10, "2024-09-02", "2024-09-06"))
+    index.apply(leave(4, 20, date(2024, 8, 5), date(2024, 8, 9)))
+    index.apply(leave(5, 30, "2024-08-01", "2024-08-02", status="pending"))
+    return index
+
+
+def test_point_queries():
+    index = build_index()
+    assert index.is_on_leave(10, "2024-07-20")
+    assert index.is_on_leave(10, date(2024, 9, 6))
+    assert not index.is_on_leave(10, "2024-08-15")
+    assert index.is_on_leave(20, "2024-08-05")
+    assert not index.is_on_leave(30, "2024-08-01")
+
+
+def test_range_queries():
+    index = build_index()
+    assert index.employees_on_leave("2024-08-01", "2024-08-31") == {20}
+    assert index.employees_on_leave("2024-07-31", "2024-08-05") == {10, 20}
+    assert index.employees_on_leave("2024-07-31", "2024-08-05", [20, 30]) == {20}
+    assert index.overlaps_many([(10, "2024-08-01", "2024-09-01"), (10, "2024-08-01", "2024-09-02")]) == [False, True]
+    assert index.count_leaves("2024-07-11", "2024-08-05") == 3
+    assert index.leave_periods(10, "2024-07-25", "2024-09-03") == [("2024-07-25", "2024-07-31"), ("2024-09-02", "2024-09-03")]
+
+
+def test_reject_removes_leave():
+    index = build_index()
+    index.apply(leave(1, 10, "2024-07-01", "2024-07-31", status="rejected"))
+    assert not index.is_on_leave(10, "2024-07-20")
+    assert index.is_on_leave(10, "2024-07-11")
+    assert index.count_leaves("2024-01-01", "2024-12-31") == 3
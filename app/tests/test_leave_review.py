@@ -0,0 +1,78 @@
+# tests/test_leave_review.py
+from app.models import Leave, LeaveBalance
+from app.utils.leave_review import find_leave_conflicts
+
+
+def add_leaves(db, employee_id, *periods):
+    leaves = [
+        Leave(employee_id=employee_id, start_date=start, end_date=end, leave_type="congé", status=status)
+        for start, end, status in periods
+    ]
+    db.add_all(leaves)
+    db.commit()
+    return [leave.id for leave in leaves]
+
+
+def test_batch_conflicts_only_count_accepted_leaves(db, seed_employees):
+    seed_employees(2, days=0)
+    fixed, first, second, third = add_leaves(
+        db, 1,
+        ("2025-07-01", "2025-07-05", "approved"),
+        ("2025-07-04", "2025-07-10", "pending"),  # chevauche le congé déjà approuvé
+        ("2025-07-08", "2025-07-12", "pending"),  # ne chevauche que `first`, écarté
+        ("2025-07-11", "2025-07-15", "pending"),  # chevauche `second`, retenu avant lui
+    )
+    other_employee = add_leaves(db, 2, ("2025-07-01", "2025-07-31", "pending"))[0]
+
+    conflicts = find_leave_conflicts(db, {first, second, third, other_employee}, set())
+    assert conflicts == {first: [fixed], third: [second]}
+    # Refuser le congé approuvé dans le même lot lève le conflit
+    assert find_leave_conflicts(db, {first, second}, {fixed}) == {second: [first]}
+
+
+def test_bulk_decision_endpoint(client, db, admin_headers, seed_employees):
+    seed_employees(1, days=0)
+    employee_id = 2
+    fixed, conflicting, accepted, rejected = add_leaves(
+        db, employee_id,
+        ("2025-03-03", "2025-03-07", "approved"),
+        ("2025-03-06", "2025-03-06", "pending"),
+        ("2025-03-10", "2025-03-14", "pending"),
+        ("2025-03-17", "2025-03-18", "pending"),
+    )
+
+    response = client.post(
+        "/admin/leaves/bulk-decision",
+        json={"approve": [conflicting, accepted, 999], "reject": [rejected]},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "approved": [accepted],
+        "rejected": [rejected],
+        "conflicts": {str(conflicting): [fixed]},
+        "not_found": [999]
+    }
+
+    db.expire_all()
+    statuses = dict(db.query(Leave.id, Leave.status))
+    assert [statuses[leave_id] for leave_id in (conflicting, accepted, rejected)] == ["pending", "approved", "rejected"]
+    # Le congé approuvé (5 jours ouvrés) est débité du solde 2025
+    assert db.query(LeaveBalance.taken_days).filter(LeaveBalance.employee_id == employee_id).scalar() == 5
+
+
+def test_single_approve_refuses_overlap(client, db, admin_headers, seed_employees):
+    seed_employees(1, days=0)
+    fixed, overlapping = add_leaves(
+        db, 2,
+        ("2025-03-03", "2025-03-07", "approved"),
+        ("2025-03-07", "2025-03-10", "pending"),
+    )
+
+    response = client.post(f"/admin/leaves/{overlapping}/approve", headers=admin_headers)
+    assert response.status_code == 409
+    assert str(fixed) in response.json()["detail"]
+    assert client.post(f"/admin/leaves/{fixed + 100}/approve", headers=admin_headers).status_code == 404
+
+    assert client.post(f"/admin/leaves/{fixed}/reject", headers=admin_headers).status_code == 200
+    assert client.post(f"/admin/leaves/{overlapping}/approve", headers=admin_headers).status_code == 200
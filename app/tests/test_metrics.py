@@ -0,0 +1,79 @@
+# tests/test_metrics.py
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.utils.metrics import POOL_CHECKOUT_WAIT, Counter, Gauge, Histogram, Registry, install_sql_hooks
+
+
+def test_registry_renders_counters_and_gauges():
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requêtes", ("route",)))
+    in_flight = registry.register(Gauge("in_flight", "En cours"))
+    requests.inc(route="/a")
+    requests.inc(2, route='/b"x')
+    in_flight.inc()
+    in_flight.dec()
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requêtes",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a"} 1',
+        'requests_total{route="/b\\"x"} 2',
+        "# HELP in_flight En cours",
+        "# TYPE in_flight gauge",
+        "in_flight 0",
+    ]
+
+
+def test_histogram_exposition_is_cumulative():
+    histogram = Histogram("latency_seconds", "Latence", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, route="/a")
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def _count(histogram):
+    return sum(state[2] for state in histogram._values.values())
+
+
+def test_metrics_endpoint_and_lazy_checkout(client, admin_headers):
+    checkouts = _count(POOL_CHECKOUT_WAIT)
+    assert client.get("/employees/", headers=admin_headers).status_code == 200
+    assert _count(POOL_CHECKOUT_WAIT) > checkouts
+    # Sans requête SQL, aucune connexion prise au pool
+    checkouts = _count(POOL_CHECKOUT_WAIT)
+    response = client.get("/metrics")
+    assert _count(POOL_CHECKOUT_WAIT) == checkouts
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/employees/",status="200"}' in response.text
+    assert "# TYPE db_statement_duration_seconds histogram" in response.text
+
+
+def test_failed_statement_leaves_no_timing_behind(engine):
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing_table"))
+        assert connection.info.get("query_started") == []
+        connection.execute(text("SELECT 1"))
+        assert connection.info["query_started"] == []
+
+
+def test_pool_wait_still_recorded_after_dispose():
+    engine = create_engine("sqlite://")
+    install_sql_hooks(engine)
+    for _ in range(2):
+        checkouts = _count(POOL_CHECKOUT_WAIT)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert _count(POOL_CHECKOUT_WAIT) == checkouts + 1
+        engine.dispose()  # Nouveau pool
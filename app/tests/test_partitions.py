@@ -0,0 +1,33 @@
+# tests/test_partitions.py
+from datetime import date
+
+from sqlalchemy import text
+
+from app.utils.partitions import add_months, ensure_partitions, month_bounds, partitions_for_period
+
+
+def test_month_arithmetic():
+    assert add_months(date(2024, 11, 15), 0) == date(2024, 11, 1)
+    assert add_months(date(2024, 11, 15), 2) == date(2025, 1, 1)
+    assert add_months(date(2024, 1, 31), -1) == date(2023, 12, 1)
+    assert month_bounds(date(2024, 12, 9)) == ("2024-12-01", "2025-01-01")
+
+
+def test_partitions_for_period():
+    assert partitions_for_period(date(2024, 11, 20), date(2025, 1, 5)) == [
+        "attendance_p2024_11", "attendance_p2024_12", "attendance_p2025_01"
+    ]
+    assert partitions_for_period(date(2024, 3, 1), date(2024, 3, 31)) == ["attendance_p2024_03"]
+
+
+def test_ensure_partitions_is_noop_without_native_partitioning(engine):
+    assert ensure_partitions(engine, today=date(2024, 6, 1)) == []
+
+
+def test_period_query_uses_date_index(engine):
+    with engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT employee_id FROM attendance "
+            "WHERE date >= '2024-06-01' AND date <= '2024-06-30'"
+        )).fetchall()
+    assert any("ix_attendance_date_employee" in row[-1] for row in plan)
@@ -0,0 +1,38 @@
+# tests/test_qrcode.py
+from datetime import datetime
+
+import pytest
+
+from app.utils import qrcode
+
+
+class FrozenDatetime(datetime):
+    current = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    monkeypatch.setattr(qrcode, "datetime", FrozenDatetime)
+    monkeypatch.setattr(FrozenDatetime, "current", datetime(2025, 3, 4, 9, 30, 15, 123456))
+    return FrozenDatetime
+
+
+@pytest.mark.parametrize("qr_type", ["morning", "evening"])
+def test_global_qr_code_round_trip(frozen_now, qr_type):
+    data = qrcode.generate_global_qr_code_data(qr_type)
+    assert qrcode.verify_global_qr_code(data, qr_type)
+    assert not qrcode.verify_global_qr_code(data, "evening" if qr_type == "morning" else "morning")
+
+    frozen_now.current = datetime(2025, 3, 4, 18, 0, 1)  # Après la fin de validité
+    assert not qrcode.verify_global_qr_code(data, qr_type)
+
+
+def test_employee_qr_code_round_trip(frozen_now):
+    data = qrcode.generate_qr_code_data(7)
+    assert qrcode.verify_qr_code(data, 7)
+    assert not qrcode.verify_qr_code(data, 8)
+    assert not qrcode.verify_global_qr_code(data, "morning")
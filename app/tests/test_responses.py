@@ -0,0 +1,79 @@
+# tests/test_responses.py
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+from app.models import Attendance, Employee, Leave
+from app.routes import activity, admin, employees, stats
+from app.utils.lateness import rebuild_lateness
+
+# Réponses construites à la main (rows_response, ORJSONResponse) : le
+# response_model déclaré n'est pas appliqué par FastAPI, il est vérifié ici
+FAST_PATHS = [
+    ("/employees/", {}),
+    ("/admin/employees", {}),
+    ("/admin/leaves", {}),
+    ("/stats/by-service", {}),
+    ("/stats/by-service/{service}", {"service": "Production"}),
+    ("/stats/lateness-distribution", {}),
+    ("/stats/lateness-distribution", {"group_by": "week"}),
+    ("/stats/attendance-trend", {"bucket": "week"}),
+    ("/activity/recent", {}),
+]
+
+
+def _response_model(path: str):
+    for router in (activity.router, admin.router, employees.router, stats.router):
+        for route in router.routes:
+            if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+                return route.response_model
+    raise LookupError(path)
+
+
+@pytest.mark.parametrize("path, params", FAST_PATHS)
+def test_fast_path_payload_matches_declared_model(client, db, admin_headers, path, params, seed_employees):
+    seed_employees(6, days=10)
+    db.add(Leave(employee_id=2, start_date=date.today().isoformat(), end_date=date.today().isoformat(),
+                 leave_type="congé", status="approved", created_at=datetime.now()))
+    db.commit()
+    rebuild_lateness(db, date.today() - timedelta(days=10), date.today())
+
+    url = path.format(**params)
+    query = {key: value for key, value in params.items() if "{" + key + "}" not in path}
+    response = client.get(url, params=query, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    payload = response.json()
+
+    model = _response_model(path)
+    adapter = TypeAdapter(model)
+    # Ni champ manquant ni champ en trop par rapport au schéma OpenAPI
+    assert adapter.dump_python(adapter.validate_python(payload), mode="json") == payload
+
+
+def test_recent_activity_orders_by_last_punch(client, db, admin_headers, seed_employees):
+    seed_employees(2, days=0)
+    today = datetime.combine(date.today(), datetime.min.time())
+    db.add_all([
+        # Journée complète d'hier : dernier pointage = départ de l'après-midi
+        Attendance(employee_id=2, date=(today - timedelta(days=1)).date().isoformat(),
+                   morning_arrival=today - timedelta(hours=16), afternoon_departure=today - timedelta(hours=6),
+                   is_late_morning=False, is_late_afternoon=False, is_absent=False),
+        # Aujourd'hui, arrivée du matin seulement, en retard
+        Attendance(employee_id=3, date=today.date().isoformat(), morning_arrival=today.replace(hour=8, minute=20),
+                   is_late_morning=True, is_late_afternoon=False, is_absent=False),
+        Attendance(employee_id=2, date=(today - timedelta(days=3)).date().isoformat(), is_absent=True),
+        Leave(employee_id=3, start_date="2025-01-06", end_date="2025-01-07", leave_type="congé",
+              status="pending", created_at=today - timedelta(hours=3)),
+    ])
+    db.commit()
+
+    items = client.get("/activity/recent", params={"limit": 3}, headers=admin_headers).json()
+    assert [(item["type"], item["details"], item["status"]) for item in items] == [
+        ("attendance", "Pointage morning_arrival", "late"),
+        ("leave", "Demande de congé", "pending"),
+        ("attendance", "Pointage afternoon_departure", "on_time"),
+    ]
+    names = {row.id: f"{row.first_name} {row.last_name}" for row in db.query(Employee)}
+    assert items[0]["employee_name"] == names[3]
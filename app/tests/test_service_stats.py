@@ -0,0 +1,59 @@
+# tests/test_service_stats.py
+from datetime import date, timedelta
+
+from app.models import Leave
+from app.utils.sql_profiler import record_queries
+
+TOTAL_FIELDS = ("present_days", "late_days", "absent_days", "late_minutes", "penalty_hours")
+
+
+def _period():
+    today = date.today()
+    return {"period": "custom", "start_date": (today - timedelta(days=3)).isoformat(), "end_date": today.isoformat()}
+
+
+def test_by_service_matches_per_employee_report(client, db, admin_headers, seed_employees):
+    seed_employees(9, days=6)
+    db.add(Leave(employee_id=2, start_date=date.today().isoformat(), end_date=date.today().isoformat(),
+                 leave_type="congé", status="approved"))
+    db.commit()
+
+    response = client.get("/stats/by-service", params=_period(), headers=admin_headers)
+    assert response.status_code == 200 and "etag" in response.headers
+    services = {row["service"]: row for row in response.json()["services"]}
+    assert set(services) == {"Administration", "Comptabilité", "Informatique", "Production"}
+    assert services["Informatique"]["employees"] == 3
+    assert services["Informatique"]["present_days"] == 12
+    assert services["Administration"]["present_days"] == 0
+
+    report = client.get("/admin/employees", params=_period(), headers=admin_headers).json()
+    for field in TOTAL_FIELDS:
+        assert sum(row[field] for row in services.values()) == sum(row["stats"][field] for row in report)
+
+    # L'admin a l'id 1 : l'employé 2 est le premier de Comptabilité
+    assert {name: row["on_leave_employees"] for name, row in services.items()} == {
+        "Administration": 0, "Comptabilité": 1, "Informatique": 0, "Production": 0
+    }
+
+
+def test_drill_down_reads_only_one_service(client, db, engine, admin_headers, seed_employees):
+    seed_employees(9, days=6)
+    rollup = {
+        row["service"]: row
+        for row in client.get("/stats/by-service", params=_period(), headers=admin_headers).json()["services"]
+    }
+
+    with record_queries(engine) as recorder:
+        response = client.get("/stats/by-service/Production", params=_period(), headers=admin_headers)
+    assert response.status_code == 200
+    breakdown = response.json()
+    assert breakdown["service"] == rollup["Production"]
+    assert [row["first_name"] for row in breakdown["employees"]] == ["Prenom2", "Prenom5", "Prenom8"]
+    assert sum(row["stats"]["present_days"] for row in breakdown["employees"]) == 12
+
+    # Agrégat restreint aux employés du service
+    attendance_queries = [statement for statement in recorder.statements if "FROM attendance" in statement]
+    assert len(attendance_queries) == 1 and " IN " in attendance_queries[0]
+
+    missing = client.get("/stats/by-service/Marketing", headers=admin_headers)
+    assert missing.status_code == 404
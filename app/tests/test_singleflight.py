@@ -0,0 +1,86 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.models import Employee
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight("test", ttl_s=0)
+    calls = []
+
+    def compute(value):
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return value * 2
+
+    async def scenario():
+        same = await asyncio.gather(*(flight.do("a", compute, 21) for _ in range(10)))
+        other = await flight.do("b", compute, 1)
+        return same, other
+
+    same, other = asyncio.run(scenario())
+    assert same == [42] * 10
+    assert other == 2
+    assert len(calls) == 2
+
+
+def test_errors_are_shared_but_not_cached():
+    flight = SingleFlight("test", ttl_s=60)
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            await flight.do("k", fail)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+def test_admin_stats_reuses_result_until_data_changes(client, db, admin_headers, seed_employees):
+    from app.routes.admin import admin_stats_flight
+
+    seed_employees(6)
+    first = client.get("/admin/stats", headers=admin_headers).json()
+    assert client.get("/admin/stats", headers=admin_headers).json() == first
+    assert len(admin_stats_flight._results) == 1
+
+    # Une écriture change la version des employés, donc la clé
+    db.add(Employee(first_name="N", last_name="N", email="n@pointagepro.com", hashed_password="-",
+                    service="Production", fonction="Agent", matricule="EMPNEW", is_active=True))
+    db.commit()
+    assert client.get("/admin/stats", headers=admin_headers).json()["total_employees"] == first["total_employees"] + 1
+
+
+def test_shared_computation_survives_first_caller_leaving(db, engine, seed_employees):
+    from datetime import date
+
+    from app.routes.admin import _admin_stats
+
+    seed_employees(6)
+    flight = SingleFlight("test", ttl_s=0)
+    today = date.today()
+
+    async def scenario():
+        # Le calcul reçoit le moteur, pas la session de la requête : fermer
+        # celle-ci (déconnexion du premier appelant) ne casse pas les autres
+        first = asyncio.ensure_future(flight.do("k", _admin_stats, engine, today, today))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("k", _admin_stats, engine, today, today))
+        await asyncio.sleep(0)
+        first.cancel()
+        db.close()
+        return await second
+
+    assert asyncio.run(scenario())["total_employees"] == 6
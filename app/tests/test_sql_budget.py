@@ -0,0 +1,42 @@
+# tests/test_sql_budget.py
+import pytest
+
+from app.utils.sql_profiler import fingerprint, sql_budget
+
+# Nombre maximal de requêtes SQL par endpoint, indépendant du nombre d'employés
+SQL_BUDGETS = {
+    "/admin/employees": 4,
+    "/admin/stats": 8,
+    "/employees/": 3,
+    "/employees/stats": 8,
+    "/employees/export/pdf": 4,
+    "/employees/services/list": 3,
+    "/stats/by-service": 5,
+    "/stats/attendance-trend?days=365": 4,
+    "/stats/attendance-trend?days=90&service=Informatique": 4,
+    "/stats/dashboard": 6,
+}
+
+
+@pytest.mark.parametrize("url", sorted(SQL_BUDGETS))
+def test_endpoint_sql_budget(client, db, engine, admin_headers, url, seed_employees):
+    seed_employees(30)
+
+    with sql_budget(engine, SQL_BUDGETS[url], threshold=5):
+        response = client.get(url, headers=admin_headers)
+
+    assert response.status_code == 200
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?) AND d = '2024-01-01'") == \
+        fingerprint("SELECT * FROM t WHERE id IN (?)  AND d = '2025-02-02'")
+
+
+def test_sql_budget_reports_n_plus_one(engine, db):
+    from app.models import Employee
+
+    with pytest.raises(AssertionError, match="N\\+1"):
+        with sql_budget(engine, 100, threshold=3):
+            for employee_id in range(5):
+                db.query(Employee).filter(Employee.id == employee_id).first()
@@ -0,0 +1,52 @@
+# tests/test_startup.py
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pandas", "numpy", "reportlab", "qrcode", "PIL", "openpyxl")
+
+
+def _run(code: str, database_path) -> dict:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{database_path}"}
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _tables(database_path) -> set:
+    connection = sqlite3.connect(database_path)
+    try:
+        return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        connection.close()
+
+
+def test_import_is_light_and_has_no_side_effect(tmp_path):
+    database_path = tmp_path / "startup.db"
+    result = _run(
+        "import json, sys\n"
+        "import app.main\n"
+        "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))",
+        database_path
+    )
+    assert not set(HEAVY_MODULES) & set(result)
+    # Aucune table créée à l'import
+    assert not database_path.exists() or not _tables(database_path)
+
+
+def test_lifespan_creates_schema_and_warms_up(tmp_path):
+    database_path = tmp_path / "startup.db"
+    result = _run(
+        "import json\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "from app.utils.leave_index import leave_index\n"
+        "with TestClient(app):\n"
+        "    print(json.dumps({'loaded': leave_index.loaded}))",
+        database_path
+    )
+    assert result["loaded"]
+    assert {"employees", "attendance", "leaves"} <= _tables(database_path)
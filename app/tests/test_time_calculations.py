@@ -0,0 +1,51 @@
+# tests/test_time_calculations.py
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from app.models import Attendance
+from app.utils.time_calculations import (
+    calculate_employee_stats,
+    calculate_employees_stats,
+    compute_attendance_metrics,
+    empty_employee_stats,
+)
+
+
+def test_attendance_metrics_from_arrivals_and_departures():
+    day = datetime(2025, 3, 4)
+    attendance = SimpleNamespace(
+        morning_arrival=day.replace(hour=8, minute=12, second=59),  # Secondes ignorées
+        morning_departure=day.replace(hour=12),
+        afternoon_arrival=day.replace(hour=14, minute=20),  # En avance : aucun retard
+        afternoon_departure=None  # Demi-journée non terminée : pas de durée
+    )
+    compute_attendance_metrics(attendance)
+    assert (attendance.late_minutes_morning, attendance.late_minutes_afternoon) == (12, 0)
+    assert attendance.worked_minutes == 227
+
+    attendance.afternoon_arrival = day.replace(hour=15, minute=5)
+    attendance.afternoon_departure = day.replace(hour=18)
+    compute_attendance_metrics(attendance)
+    assert attendance.late_minutes_afternoon == 35
+    assert attendance.worked_minutes == 227 + 175
+
+
+def test_grouped_stats_match_per_employee_path(db, seed_employees):
+    seed_employees(6, days=12)
+    db.query(Attendance).filter(Attendance.id % 5 == 0).update({Attendance.is_absent: True}, synchronize_session=False)
+    db.commit()
+    start, end = date.today() - timedelta(days=11), date.today()
+
+    grouped = calculate_employees_stats(db, start, end)
+    assert set(grouped) == set(range(1, 7))
+    for employee_id, stats in grouped.items():
+        assert stats == calculate_employee_stats(db, employee_id, start, end)
+    assert sum(stats["present_days"] + stats["absent_days"] for stats in grouped.values()) == 6 * 12
+    assert calculate_employees_stats(db, start, end, [2, 99]) == {2: grouped[2]}
+    assert calculate_employee_stats(db, 99, start, end) == empty_employee_stats()
+
+
+def test_empty_stats_are_not_shared():
+    stats = empty_employee_stats()
+    stats["present_days"] = 3
+    assert empty_employee_stats()["present_days"] == 0
@@ -0,0 +1,67 @@
+# tests/test_timesheet.py
+from datetime import datetime
+
+from app.utils.time_calculations import calculate_working_hours
+
+
+def record(**overrides):
+    data = {
+        "morning_arrival": None,
+        "morning_departure": None,
+        "afternoon_arrival": None,
+        "afternoon_departure": None,
+        "is_absent": False,
+        "is_holiday": False,
+        "is_on_leave": False,
+    }
+    data.update(overrides)
+    return data
+
+
+def test_calculate_working_hours_with_datetimes():
+    records = [
+        record(
+            morning_arrival=datetime(2024, 3, 4, 8, 10, 30),
+            morning_departure=datetime(2024, 3, 4, 12, 0),
+            afternoon_arrival=datetime(2024, 3, 4, 14, 25),
+            afternoon_departure=datetime(2024, 3, 4, 18, 0),
+        ),
+        record(is_absent=True),
+        record(is_holiday=True, is_absent=True),
+        record(is_on_leave=True),
+    ]
+
+    stats = calculate_working_hours(records)
+
+    assert stats["late_minutes"] == 10
+    assert stats["absent_days"] == 1
+    assert stats["total_hours"] == round((3 * 3600 + 49 * 60 + 30 + 3 * 3600 + 35 * 60) / 3600, 2)
+    assert stats["penalty_hours"] == (8 + 10 / 60) * 0.10
+
+
+def test_calculate_working_hours_accepts_strings_and_half_days():
+    records = [
+        record(
+            morning_arrival="2024-03-05 08:45:00",
+            morning_departure="2024-03-05 12:00:00",
+            afternoon_arrival="2024-03-05 15:00:00",
+        ),
+    ]
+
+    stats = calculate_working_hours(records)
+
+    # L'après-midi sans départ ne compte ni en heures ni en retard
+    assert stats["total_hours"] == 3.25
+    assert stats["late_minutes"] == 45
+    assert stats["absent_days"] == 0
+
+
+def test_calculate_working_hours_empty():
+    stats = calculate_working_hours([])
+    assert stats == {
+        "total_hours": 0,
+        "late_minutes": 0,
+        "absent_days": 0,
+        "penalty_hours": 0,
+        "effective_hours": 0
+    }
@@ -0,0 +1,54 @@
+# tests/test_trends.py
+from datetime import date, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from app.models import Attendance
+from app.utils.sql_profiler import record_queries
+from app.utils.trends import bucket_column, choose_bucket
+
+
+def test_auto_bucket_follows_range_length():
+    assert [choose_bucket(days) for days in (7, 62, 90, 366, 730)] == ["day", "day", "week", "week", "month"]
+
+
+def test_week_truncation_for_postgresql():
+    sql = str(bucket_column(Attendance.date, "week", "postgresql").compile(dialect=postgresql.dialect()))
+    assert "date_trunc" in sql and "to_char" in sql
+
+
+def test_buckets_add_up_to_daily_points(client, db, engine, admin_headers, seed_employees):
+    seed_employees(6, days=70)
+
+    daily = client.get("/stats/attendance-trend", params={"days": 70, "bucket": "day"}, headers=admin_headers).json()
+    assert daily["bucket"] == "day" and len(daily["data"]) == 70
+
+    with record_queries(engine) as recorder:
+        weekly = client.get("/stats/attendance-trend", params={"days": 70}, headers=admin_headers).json()
+    # Une seule requête sur attendance, quelle que soit la durée
+    assert sum("FROM attendance" in statement for statement in recorder.statements) == 1
+    assert weekly["bucket"] == "week"
+    assert all(date.fromisoformat(point["date"]).weekday() == 0 for point in weekly["data"])
+
+    monthly = client.get("/stats/attendance-trend", params={"days": 70, "bucket": "month"}, headers=admin_headers).json()
+    assert all(point["date"].endswith("-01") for point in monthly["data"])
+
+    for trend in (weekly, monthly):
+        for field in ("present", "late", "absent"):
+            assert sum(point[field] for point in trend["data"]) == sum(point[field] for point in daily["data"])
+    assert sum(point["present"] for point in daily["data"]) == 6 * 70
+
+
+def test_service_filter_and_validation(client, db, admin_headers, seed_employees):
+    seed_employees(6, days=5)
+
+    trend = client.get(
+        "/stats/attendance-trend", params={"days": 10, "service": "Production"}, headers=admin_headers
+    ).json()
+    assert len(trend["data"]) == 10
+    assert sum(point["present"] for point in trend["data"]) == 2 * 5
+    # Jours sans pointage présents avec des zéros
+    assert trend["data"][0] == {"date": (date.today() - timedelta(days=9)).isoformat(), "present": 0, "late": 0, "absent": 0}
+
+    assert client.get("/stats/attendance-trend", params={"bucket": "year"}, headers=admin_headers).status_code == 400
+    assert client.get("/stats/attendance-trend", params={"days": 0}, headers=admin_headers).status_code == 400
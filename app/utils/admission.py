@@ -0,0 +1,236 @@
+# app/utils/admission.py
+# Contrôle d'admission par couloir : chaque requête est classée (pointage,
+# lecture interactive, rapport/export lourd) et attend une place dans son
+# couloir, dont la concurrence est bornée. Les couloirs interactif et lourd
+# sont dimensionnés pour laisser `admission_clockin_reserved` connexions du
+# pool aux pointages : une rafale de PDF annuels ne peut plus épuiser le pool
+# à 8 h. Les requêtes lourdes passent aussi par un seau à jetons par
+# utilisateur. En surcharge (file pleine, attente trop longue, seau vide) la
+# réponse est un 429 avec Retry-After plutôt qu'un timeout.
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from app.config import settings
+from app.utils.metrics import Counter, Histogram, registry
+from app.utils.responses import ORJSONResponse
+
+CLOCKIN = "clockin"
+INTERACTIVE = "interactive"
+HEAVY = "heavy"
+
+CLOCKIN_PATHS = ("/attendance/record",)
+HEAVY_PREFIXES = ("/reports/", "/exports/")
+HEAVY_SUFFIXES = ("/pdf", "/excel")
+
+# Requêtes en attente au-delà desquelles un couloir refuse d'emblée
+MAX_QUEUE = {CLOCKIN: 1000, INTERACTIVE: 200, HEAVY: 20}
+# Nombre de seaux à partir duquel les seaux pleins sont oubliés (clients anonymes nombreux)
+BUCKET_SWEEP_MIN = 1024
+
+ADMISSION_REJECTED = registry.register(Counter(
+    "http_admission_rejected_total", "Requêtes refusées en 429 par le contrôle d'admission", ("lane", "reason")
+))
+ADMISSION_WAIT = registry.register(Histogram(
+    "http_admission_wait_seconds", "Attente d'une place dans le couloir", ("lane",)
+))
+
+
+def classify(path: str) -> str:
+    """Couloir d'une requête d'après son chemin (avant le routage)"""
+    if path in CLOCKIN_PATHS:
+        return CLOCKIN
+    if path.startswith(HEAVY_PREFIXES) or path.endswith(HEAVY_SUFFIXES) or "/export/" in path:
+        return HEAVY
+    return INTERACTIVE
+
+
+class Overloaded(Exception):
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"{lane}: {reason}")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Lane:
+    """Sémaphore FIFO avec file bornée et attente maximale"""
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout_s: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max_queue
+        self.timeout_s = timeout_s
+        self.active = 0
+        self._waiters = deque()
+        self._average_s = 0.5  # Durée moyenne (lissée) d'une requête, pour Retry-After
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._average_s * (len(self._waiters) + 1) / self.limit))
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise Overloaded(self.name, "queue_full", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            # La place est transmise par release() : active ne change pas
+            await asyncio.wait_for(future, self.timeout_s)
+        except asyncio.TimeoutError:
+            raise Overloaded(self.name, "timeout", self.retry_after())
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Place déjà transmise par release() : elle passe au suivant
+                self._hand_over()
+            raise
+        finally:
+            if not future.done() or future.cancelled():
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+
+    def release(self, elapsed: float) -> None:
+        self._average_s = 0.8 * self._average_s + 0.2 * elapsed
+        self._hand_over()
+
+    def _hand_over(self) -> None:
+        """Donne la place au premier en attente, sinon la libère"""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class TokenBucket:
+    """Seau à jetons : `burst` requêtes d'affilée, puis `rate` par seconde"""
+
+    def __init__(self, burst: int, rate: float):
+        self.burst = burst
+        self.rate = rate
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """0 si un jeton est pris, sinon le délai (s) avant le prochain"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 60.0
+
+    def is_full(self, now: float) -> bool:
+        """Vrai si le seau s'est rempli depuis le dernier passage (équivalent à un seau neuf)"""
+        return self.rate > 0 and self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+class AdmissionController:
+    """Couloirs et seaux à jetons du processus, dimensionnés d'après la configuration"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        pool = settings.db_pool_size + settings.db_max_overflow
+        heavy = settings.admission_heavy_concurrency
+        interactive = pool - settings.admission_clockin_reserved - heavy
+        if settings.admission_enabled and (heavy < 1 or interactive < 1):
+            # Arrondir à 1 entamerait en silence la réserve des pointages
+            raise ValueError(
+                f"Contrôle d'admission incohérent : pool de {pool} connexions (DB_POOL_SIZE + DB_MAX_OVERFLOW) "
+                f"pour {settings.admission_clockin_reserved} réservées aux pointages "
+                f"(ADMISSION_CLOCKIN_RESERVED) et {heavy} aux requêtes lourdes (ADMISSION_HEAVY_CONCURRENCY, "
+                f"au moins 1) : il n'en reste aucune pour les requêtes interactives"
+            )
+        timeout = settings.admission_queue_timeout_s
+        self.lanes: Dict[str, Lane] = {
+            # Les pointages peuvent utiliser tout le pool, réserve comprise
+            CLOCKIN: Lane(CLOCKIN, pool, MAX_QUEUE[CLOCKIN], timeout),
+            INTERACTIVE: Lane(INTERACTIVE, interactive, MAX_QUEUE[INTERACTIVE], timeout),
+            HEAVY: Lane(HEAVY, heavy, MAX_QUEUE[HEAVY], timeout),
+        }
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._sweep_at = BUCKET_SWEEP_MIN
+
+    def check_rate(self, user: str) -> Optional[int]:
+        """Retry-After (s) si l'utilisateur a épuisé ses requêtes lourdes, sinon None"""
+        bucket = self.buckets.get(user)
+        if bucket is None:
+            if len(self.buckets) >= self._sweep_at:
+                self._sweep()
+            bucket = self.buckets[user] = TokenBucket(
+                settings.admission_heavy_burst, settings.admission_heavy_per_minute / 60
+            )
+        wait = bucket.take()
+        return max(1, math.ceil(wait)) if wait else None
+
+    def _sweep(self) -> None:
+        """Oublie les seaux pleins (un seau neuf les remplace à l'identique) ; coût amorti constant"""
+        now = time.monotonic()
+        self.buckets = {user: bucket for user, bucket in self.buckets.items() if not bucket.is_full(now)}
+        self._sweep_at = max(BUCKET_SWEEP_MIN, 2 * len(self.buckets))
+
+
+admission = AdmissionController()
+
+
+def _user_key(scope) -> str:
+    """Utilisateur du jeton (sub), à défaut l'adresse du client"""
+    from app.utils.auth import decode_token
+
+    headers = dict(scope.get("headers") or [])
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    if authorization.lower().startswith("bearer "):
+        payload = decode_token(authorization[7:])
+        if payload and payload.get("sub"):
+            return payload["sub"]
+    client = scope.get("client")
+    return client[0] if client else "anonyme"
+
+
+class AdmissionMiddleware:
+    """Middleware ASGI : file d'attente par couloir, 429 + Retry-After en surcharge"""
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.admission_enabled or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.controller.lanes[classify(scope["path"])]
+        try:
+            if lane.name == HEAVY:
+                retry_after = self.controller.check_rate(_user_key(scope))
+                if retry_after is not None:
+                    raise Overloaded(lane.name, "rate_limited", retry_after)
+            started = time.perf_counter()
+            await lane.acquire()
+        except Overloaded as e:
+            ADMISSION_REJECTED.inc(lane=e.lane, reason=e.reason)
+            response = ORJSONResponse(
+                {"detail": f"Serveur occupé, réessayez dans {e.retry_after} s"},
+                status_code=429,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        admitted = time.perf_counter()
+        ADMISSION_WAIT.observe(admitted - started, lane=lane.name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release(time.perf_counter() - admitted)
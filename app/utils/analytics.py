@@ -0,0 +1,193 @@
+# app/utils/analytics.py
+# Moteur analytique optionnel (ANALYTICS_BACKEND=duckdb) : les agrégats des
+# longues périodes (trimestre, semestre, année, plages pluriannuelles) sont
+# calculés par DuckDB embarqué, en colonnes et sur plusieurs threads, hors de
+# la base transactionnelle — les pointages du matin n'attendent plus derrière
+# un rapport annuel. Source des données :
+#   - "sqlite"  : le fichier SQLite attaché en lecture seule (extension sqlite de DuckDB) ;
+#   - "parquet" : l'instantané exporté périodiquement (analytics_snapshot.py),
+#                 seule option avec PostgreSQL.
+# Les mois archivés (app.utils.archive) sont ajoutés dans les deux cas ; une
+# ligne archivée après l'export de l'instantané (ou pendant un archivage
+# interrompu) n'est comptée qu'une fois, côté archive. Les résultats sont ceux
+# de attendance_totals_columns, au même arrondi près.
+import glob
+import os
+import threading
+from datetime import date
+from types import SimpleNamespace
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.utils.archive import ARCHIVE_PREFIX, ARCHIVE_SUFFIX, TOTAL_NAMES, archive_directory
+
+SNAPSHOT_FILE = "attendance.parquet"
+SNAPSHOT_BATCH_SIZE = 50_000
+
+SOURCE_COLUMNS = (
+    "CAST(employee_id AS BIGINT) AS employee_id",
+    "CAST(date AS VARCHAR) AS date",
+    "CAST(is_late_morning AS BOOLEAN) AS is_late_morning",
+    "CAST(is_late_afternoon AS BOOLEAN) AS is_late_afternoon",
+    "CAST(is_absent AS BOOLEAN) AS is_absent",
+    "worked_minutes",
+    "late_minutes_morning",
+    "late_minutes_afternoon",
+)
+
+# Même sémantique que attendance_totals_columns (NULL ne compte ni comme vrai ni comme faux)
+TOTALS_SQL = """
+    SELECT employee_id,
+           count(*) - sum(CASE WHEN is_absent = true THEN 1 ELSE 0 END) AS present_days,
+           sum(CASE WHEN is_late_morning = true OR is_late_afternoon = true THEN 1 ELSE 0 END) AS late_days,
+           sum(CASE WHEN is_absent = true THEN 1 ELSE 0 END) AS absent_days,
+           sum(coalesce(worked_minutes, 0)) AS worked_minutes,
+           sum(coalesce(late_minutes_morning, 0) + coalesce(late_minutes_afternoon, 0)) AS late_minutes
+    FROM ({source})
+    WHERE date >= $start AND date <= $end {employees}
+    GROUP BY employee_id
+"""
+
+EMPLOYEE_CONDITIONS = {
+    "on_time": "is_late_morning = false AND is_late_afternoon = false AND is_absent = false",
+    "late": "is_late_morning = true OR is_late_afternoon = true",
+}
+
+_lock = threading.Lock()
+_connection = None
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise RuntimeError("duckdb est requis pour ANALYTICS_BACKEND=duckdb") from e
+    return duckdb
+
+
+def use_analytics(start_date: date, end_date: date) -> bool:
+    """Vrai si la période est assez longue pour passer par DuckDB"""
+    return (
+        settings.analytics_backend == "duckdb"
+        and (end_date - start_date).days + 1 >= settings.analytics_min_days
+    )
+
+
+def analytics_source() -> str:
+    if settings.analytics_source != "auto":
+        return settings.analytics_source
+    return "sqlite" if settings.database_url.startswith("sqlite") else "parquet"
+
+
+def snapshot_path() -> str:
+    return os.path.join(settings.analytics_snapshot_dir, SNAPSHOT_FILE)
+
+
+def _quote(path: str) -> str:
+    return "'" + path.replace("'", "''") + "'"
+
+
+def _cursor():
+    """Curseur sur une instance DuckDB partagée (un curseur par appel : thread-safe)"""
+    global _connection
+    with _lock:
+        if _connection is None:
+            connection = _duckdb().connect()
+            if analytics_source() == "sqlite":
+                database = make_url(settings.database_url).database
+                connection.execute(f"ATTACH {_quote(os.path.abspath(database))} AS oltp (TYPE sqlite, READ_ONLY)")
+            _connection = connection
+    return _connection.cursor()
+
+
+def reset_connection() -> None:
+    """Ferme l'instance DuckDB (changement de configuration, tests)"""
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+        _connection = None
+
+
+def _source_sql() -> str:
+    """Table chaude (SQLite attaché ou instantané) + mois archivés, colonnes normalisées, sans doublon"""
+    columns = ", ".join(SOURCE_COLUMNS)
+    if analytics_source() == "sqlite":
+        hot = "oltp.attendance"
+    else:
+        snapshot = snapshot_path()
+        if not os.path.exists(snapshot):
+            raise RuntimeError(f"Instantané analytique absent : {snapshot} (lancer analytics_snapshot.py)")
+        hot = f"read_parquet({_quote(snapshot)})"
+
+    archives = sorted(glob.glob(os.path.join(archive_directory(), f"{ARCHIVE_PREFIX}*{ARCHIVE_SUFFIX}")))
+    if not archives:
+        return f"SELECT {columns} FROM {hot}"
+    archived = f"read_parquet([{', '.join(_quote(path) for path in archives)}])"
+    # Les archives font foi : les lignes déjà déplacées sont écartées de la table chaude
+    return (
+        f"SELECT {columns} FROM {hot} WHERE id NOT IN (SELECT id FROM {archived}) "
+        f"UNION ALL SELECT {columns} FROM {archived}"
+    )
+
+
+def analytics_totals(start_date: date, end_date: date,
+                     employee_ids: Optional[Iterable[int]] = None) -> Dict[int, SimpleNamespace]:
+    """Agrégats de pointage par employé, calculés par DuckDB"""
+    parameters = {"start": start_date.isoformat(), "end": end_date.isoformat()}
+    employees = ""
+    if employee_ids is not None:
+        parameters["employees"] = [int(employee_id) for employee_id in employee_ids]
+        if not parameters["employees"]:
+            return {}
+        employees = "AND employee_id IN (SELECT unnest($employees))"
+
+    cursor = _cursor()
+    try:
+        rows = cursor.execute(TOTALS_SQL.format(source=_source_sql(), employees=employees), parameters).fetchall()
+    finally:
+        cursor.close()
+    return {row[0]: SimpleNamespace(**dict(zip(TOTAL_NAMES, row[1:]))) for row in rows}
+
+
+def analytics_count_employees(start_date: date, end_date: date, condition: str) -> int:
+    """Nombre d'employés distincts ayant au moins un pointage `condition` (on_time, late)"""
+    cursor = _cursor()
+    try:
+        return cursor.execute(
+            f"SELECT count(DISTINCT employee_id) FROM ({_source_sql()}) "
+            f"WHERE date >= $start AND date <= $end AND ({EMPLOYEE_CONDITIONS[condition]})",
+            {"start": start_date.isoformat(), "end": end_date.isoformat()}
+        ).fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def export_snapshot(db: Session) -> int:
+    """Exporte la table attendance en Parquet dans ANALYTICS_SNAPSHOT_DIR (par lots, remplacement atomique)"""
+    from app.models.attendance import Attendance
+    from app.utils.archive import attendance_arrow_schema, require_pyarrow
+
+    pa = require_pyarrow()
+    path = snapshot_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = path + ".tmp"
+    schema = attendance_arrow_schema()
+
+    count = 0
+    batch = []
+    with pa.parquet.ParquetWriter(temporary, schema, compression="zstd") as writer:
+        for row in db.query(*Attendance.__table__.columns).yield_per(SNAPSHOT_BATCH_SIZE):
+            batch.append(row._asdict())
+            if len(batch) == SNAPSHOT_BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    os.replace(temporary, path)
+    return count
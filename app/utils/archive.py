@@ -0,0 +1,218 @@
+# app/utils/archive.py
+# Archive froide des pointages : les mois plus anciens que l'horizon
+# (attendance_hot_months) sont écrits dans un fichier Parquet compressé zstd
+# par mois, puis supprimés de la table attendance. Les lectures par période
+# (statistiques, feuilles de temps, rapports) complètent les lignes de la
+# table avec celles des mois archivés ; une période récente ne touche aucun
+# fichier. pyarrow n'est importé qu'à l'archivage ou à la lecture d'archives.
+import os
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.utils.partitions import add_months, month_bounds
+
+ARCHIVE_PREFIX = "attendance_"
+ARCHIVE_SUFFIX = ".parquet"
+
+TOTAL_NAMES = ("present_days", "late_days", "absent_days", "worked_minutes", "late_minutes")
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("pyarrow est requis pour les archives Parquet des pointages") from e
+    return pyarrow
+
+
+def archive_directory() -> str:
+    """Répertoire unique des archives (ATTENDANCE_ARCHIVE_DIR), lu par toutes les lectures"""
+    return settings.attendance_archive_dir
+
+
+def archive_path(month: date) -> str:
+    return os.path.join(archive_directory(), f"{ARCHIVE_PREFIX}{month:%Y_%m}{ARCHIVE_SUFFIX}")
+
+
+def archive_horizon(today: Optional[date] = None) -> date:
+    """Premier jour conservé dans la table : tout ce qui précède est archivable"""
+    return add_months(today or date.today(), -settings.attendance_hot_months)
+
+
+def archived_months(start_date: date, end_date: date) -> List[date]:
+    """Mois archivés qui recoupent la période (un seul listdir, aucun fichier ouvert)"""
+    try:
+        files = set(os.listdir(archive_directory()))
+    except FileNotFoundError:
+        return []
+    months = []
+    month = add_months(start_date, 0)
+    while month <= end_date:
+        if os.path.basename(archive_path(month)) in files:
+            months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+@lru_cache(maxsize=None)
+def attendance_arrow_schema():
+    from app.models.attendance import Attendance
+
+    pa = require_pyarrow()
+    types = {
+        "id": pa.int64(),
+        "employee_id": pa.int64(),
+        "date": pa.string(),
+    }
+    fields = []
+    for column in Attendance.__table__.columns:
+        python_type = column.type.python_type
+        if column.name in types:
+            arrow_type = types[column.name]
+        elif python_type is bool:
+            arrow_type = pa.bool_()
+        elif python_type is int:
+            arrow_type = pa.int32()
+        else:
+            arrow_type = pa.timestamp("us")  # Pointages datetime.now() : microsecondes conservées
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _write_month(path: str, rows: List[dict]) -> None:
+    """Écrit (ou complète) le fichier d'un mois ; remplacement atomique"""
+    pa = require_pyarrow()
+    table = pa.Table.from_pylist(rows, schema=attendance_arrow_schema())
+    if os.path.exists(path):
+        # Relance après une interruption : les lignes déjà archivées sont remplacées
+        existing = pa.parquet.read_table(path).cast(attendance_arrow_schema())  # Relu tel quel, cast par prudence
+        ids = pa.array([row["id"] for row in rows], pa.int64())
+        keep = pa.compute.invert(pa.compute.is_in(existing["id"], value_set=ids))
+        table = pa.concat_tables([existing.filter(keep), table])
+    table = table.sort_by([("date", "ascending"), ("employee_id", "ascending")])
+
+    temporary = path + ".tmp"
+    pa.parquet.write_table(table, temporary, compression="zstd")
+    os.replace(temporary, path)
+
+
+def archive_attendance(db: Session, before: Optional[date] = None) -> Dict[str, int]:
+    """Déplace les pointages antérieurs à `before` (par défaut l'horizon) vers les archives.
+
+    Le fichier d'un mois est écrit avant la suppression des lignes : une
+    interruption laisse au pire des lignes en double, jamais de perte.
+    """
+    from app.models.attendance import Attendance
+
+    before = before or archive_horizon()
+    os.makedirs(archive_directory(), exist_ok=True)
+    columns = Attendance.__table__.columns
+
+    months = sorted(key for (key,) in db.query(func.substr(Attendance.date, 1, 7)).filter(
+        Attendance.date < before.isoformat()
+    ).distinct())
+
+    archived = {}
+    for key in months:
+        month = date.fromisoformat(f"{key}-01")
+        start, end = month_bounds(month)
+        in_month = (Attendance.date >= start, Attendance.date < min(end, before.isoformat()))
+
+        rows = [row._asdict() for row in db.query(*columns).filter(*in_month)]
+        _write_month(archive_path(month), rows)
+
+        db.query(Attendance).filter(*in_month).delete(synchronize_session=False)
+        db.commit()
+        archived[key] = len(rows)
+    return archived
+
+
+def read_archived_attendance(
+    start_date: date,
+    end_date: date,
+    columns: Sequence[str],
+    employee_ids: Optional[Iterable[int]] = None,
+) -> List[tuple]:
+    """Lignes archivées de la période, en tuples nommés (accès par nom ou par position)"""
+    months = archived_months(start_date, end_date)
+    if not months:
+        return []
+
+    pa = require_pyarrow()
+    filters = [("date", ">=", start_date.isoformat()), ("date", "<=", end_date.isoformat())]
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+        if not employee_ids:
+            return []
+        filters.append(("employee_id", "in", employee_ids))
+
+    row_type = _row_type(tuple(columns))
+    rows = []
+    for month in months:
+        table = pa.parquet.read_table(archive_path(month), columns=list(columns), filters=filters)
+        rows.extend(row_type(*values) for values in zip(*(table[name].to_pylist() for name in columns)))
+    return rows
+
+
+@lru_cache(maxsize=32)
+def _row_type(columns: tuple):
+    return namedtuple("ArchivedAttendance", columns)
+
+
+def load_attendance(db: Session, start_date: date, end_date: date, columns: Sequence[str],
+                    employee_ids: Optional[Iterable[int]] = None) -> List[tuple]:
+    """Lecteur unifié : pointages de la table et des archives, colonnes choisies"""
+    from app.models.attendance import Attendance
+
+    query = db.query(*(getattr(Attendance, name) for name in columns)).filter(
+        Attendance.date >= start_date.isoformat(),
+        Attendance.date <= end_date.isoformat()
+    )
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+        query = query.filter(Attendance.employee_id.in_(employee_ids))
+
+    rows = read_archived_attendance(start_date, end_date, columns, employee_ids) + query.all()
+    if "date" in columns:
+        position = list(columns).index("date")
+        rows.sort(key=lambda row: row[position])
+    return rows
+
+
+def archived_totals(start_date: date, end_date: date,
+                    employee_ids: Optional[Iterable[int]] = None) -> Dict[int, SimpleNamespace]:
+    """Mêmes agrégats que attendance_totals_columns, calculés sur les mois archivés"""
+    rows = read_archived_attendance(start_date, end_date, (
+        "employee_id", "is_absent", "is_late_morning", "is_late_afternoon",
+        "worked_minutes", "late_minutes_morning", "late_minutes_afternoon",
+    ), employee_ids)
+
+    totals = {}
+    for row in rows:
+        total = totals.setdefault(row.employee_id, SimpleNamespace(**dict.fromkeys(TOTAL_NAMES, 0)))
+        if row.is_absent:
+            total.absent_days += 1
+        else:
+            total.present_days += 1
+        if row.is_late_morning or row.is_late_afternoon:
+            total.late_days += 1
+        total.worked_minutes += row.worked_minutes or 0
+        total.late_minutes += (row.late_minutes_morning or 0) + (row.late_minutes_afternoon or 0)
+    return totals
+
+
+def merge_totals(*totals) -> SimpleNamespace:
+    """Additionne des agrégats (lignes SQL ou archives) ; None compte pour 0"""
+    return SimpleNamespace(**{
+        name: sum((getattr(total, name) or 0) for total in totals if total is not None)
+        for name in TOTAL_NAMES
+    })
@@ -0,0 +1,182 @@
+# app/utils/arrow_export.py
+# Extraction des pointages en Parquet ou en flux Arrow IPC pour les outils BI.
+# Les lignes sont lues par lots depuis un curseur côté serveur (stream_results)
+# puis depuis les mois archivés, converties en RecordBatch typés (date32,
+# timestamps, booléens) et écrites au fil de l'eau : la mémoire reste bornée à
+# un lot quelle que soit la période. Employé, matricule et service sont
+# encodés en dictionnaire, avec un dictionnaire unique pour tout le flux.
+from datetime import date
+from typing import Iterator, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.utils.archive import (
+    archive_path,
+    archived_months,
+    attendance_arrow_schema,
+    require_pyarrow,
+)
+
+EXPORT_BATCH_SIZE = 50_000
+
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class _ChunkSink:
+    """Fichier en écriture seule vidé après chaque lot (corps de réponse en flux)"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class AttendanceExport:
+    """Pointages d'une période, des employés choisis, en lots Arrow"""
+
+    def __init__(self, db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                 service: Optional[str] = None, directory=None):
+        from app.utils.employee_directory import employee_directory
+
+        self.pa = require_pyarrow()
+        self.db = db
+
+        # Annuaire en mémoire (une lecture de version au lieu de la table employees)
+        directory = directory or employee_directory.snapshot(db)
+        employees = directory.by_service.get(service, ()) if service else directory.records
+        employees = sorted(employees, key=lambda row: row.id)
+
+        # Dictionnaires communs à tous les lots ; les indices sont calculés en vectoriel
+        pa = self.pa
+        self.employee_ids = pa.array([row.id for row in employees], pa.int64())
+        self.names = pa.array([f"{row.first_name} {row.last_name}" for row in employees], pa.string())
+        self.matricules = pa.array([row.matricule for row in employees], pa.string())
+        services = sorted({row.service or "" for row in employees})
+        self.services = pa.array(services, pa.string())
+        self.service_indices = pa.array([services.index(row.service or "") for row in employees], pa.int32())
+        self.filtered = service is not None
+
+        self.start_date = start_date or self._first_date()
+        self.end_date = end_date or date.today()
+        self.raw_schema = attendance_arrow_schema()
+        self.schema = self._export_schema()
+
+    def _first_date(self) -> date:
+        from app.models.attendance import Attendance
+
+        first = self.db.query(func.min(Attendance.date)).scalar()
+        first = date.fromisoformat(first) if first else date.today()
+        archived = archived_months(date(first.year - 10, 1, 1), first)
+        return min([first] + archived)
+
+    def _export_schema(self):
+        pa = self.pa
+        fields = []
+        for field in self.raw_schema:
+            if field.name == "id":
+                fields.append(pa.field("attendance_id", pa.int64()))
+            elif field.name == "date":
+                fields.append(pa.field("date", pa.date32()))
+            elif field.name == "employee_id":
+                fields.append(field)
+                for name in ("employee", "matricule", "service"):
+                    fields.append(pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(field)
+        return pa.schema(fields)
+
+    def _convert(self, raw):
+        """RecordBatch brut (schéma des archives) -> RecordBatch d'export"""
+        pa = self.pa
+        positions = pa.compute.index_in(raw.column("employee_id"), value_set=self.employee_ids)
+        columns = []
+        for field in self.schema:
+            if field.name == "attendance_id":
+                columns.append(raw.column("id"))
+            elif field.name == "date":
+                columns.append(raw.column("date").cast(pa.date32()))
+            elif field.name in ("employee", "matricule"):
+                dictionary = self.names if field.name == "employee" else self.matricules
+                columns.append(pa.DictionaryArray.from_arrays(positions.cast(pa.int32()), dictionary))
+            elif field.name == "service":
+                indices = pa.compute.take(self.service_indices, positions)
+                columns.append(pa.DictionaryArray.from_arrays(indices, self.services))
+            else:
+                columns.append(raw.column(field.name))
+        return pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def batches(self) -> Iterator:
+        """Mois archivés puis table, dans l'ordre chronologique"""
+        from app.models.attendance import Attendance
+
+        pa = self.pa
+        ids = self.employee_ids.to_pylist()
+        if self.filtered and not ids:
+            return
+
+        filters = [("date", ">=", self.start_date.isoformat()), ("date", "<=", self.end_date.isoformat())]
+        if self.filtered:
+            filters.append(("employee_id", "in", ids))
+        for month in archived_months(self.start_date, self.end_date):
+            table = pa.parquet.read_table(archive_path(month), filters=filters).cast(self.raw_schema)
+            for raw in table.to_batches(max_chunksize=EXPORT_BATCH_SIZE):
+                yield self._convert(raw)
+
+        columns = Attendance.__table__.columns
+        statement = select(*columns).where(
+            Attendance.date >= self.start_date.isoformat(),
+            Attendance.date <= self.end_date.isoformat()
+        ).order_by(Attendance.date, Attendance.employee_id)
+        if self.filtered:
+            statement = statement.where(Attendance.employee_id.in_(ids))
+
+        # Curseur côté serveur (PostgreSQL) : les lignes arrivent par lots, jamais toutes en mémoire
+        result = self.db.execute(statement.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            arrays = [
+                pa.array(values, type=field.type)
+                for field, values in zip(self.raw_schema, zip(*rows))
+            ]
+            yield self._convert(pa.RecordBatch.from_arrays(arrays, schema=self.raw_schema))
+
+    def iter_parquet(self) -> Iterator[bytes]:
+        """Fichier Parquet (zstd) produit groupe de lignes par groupe de lignes"""
+        sink = _ChunkSink()
+        with self.pa.parquet.ParquetWriter(sink, self.schema, compression="zstd") as writer:
+            for batch in self.batches():
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    def iter_arrow_stream(self) -> Iterator[bytes]:
+        """Flux Arrow IPC (tampons compressés zstd), un message par lot"""
+        pa = self.pa
+        sink = _ChunkSink()
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.ipc.new_stream(sink, self.schema, options=options) as writer:
+            for batch in self.batches():
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
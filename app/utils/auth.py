@@ -6,8 +6,9 @@ from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.models.employee import Employee
 from app.schemas.auth import TokenData
+from app.utils.metrics import timed, BCRYPT_LATENCY
+from app.utils.employee_directory import EmployeeRecord, employee_directory
 from passlib.context import CryptContext
 # Configuration
 SECRET_KEY = "votre_secret_key_secure"
@@ -17,9 +18,11 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+@timed(BCRYPT_LATENCY, operation="verify")
 def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
+@timed(BCRYPT_LATENCY, operation="hash")
 def get_password_hash(password: str):
     return pwd_context.hash(password)
 
@@ -44,7 +47,7 @@ def decode_token(token: str):
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
     db: Session = Depends(get_db)
-) -> Employee:
+) -> EmployeeRecord:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -59,14 +62,15 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(Employee).filter(Employee.email == token_data.email).first()
+    # Annuaire en mémoire : pas de requête par appel authentifié
+    user = employee_directory.find_by_email(db, token_data.email)
     if user is None:
         raise credentials_exception
     return user
 
 async def get_current_admin(
-    current_user: Employee = Depends(get_current_user)
-) -> Employee:
+    current_user: EmployeeRecord = Depends(get_current_user)
+) -> EmployeeRecord:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, 
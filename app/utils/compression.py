@@ -0,0 +1,181 @@
+# app/utils/compression.py
+# Compression négociée des réponses (brotli si disponible, sinon gzip), en
+# flux : chaque morceau d'une StreamingResponse est compressé et envoyé dès
+# qu'il arrive, sans mettre tout le corps en mémoire. Les formats déjà
+# compressés (XLSX, PNG, ...) et les petites réponses passent tels quels.
+import time
+import zlib
+from typing import Optional
+
+from app.utils.metrics import Counter, registry, route_label
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip seulement
+    brotli = None
+
+# Types déjà compressés : les recompresser coûte du CPU pour ~0 % de gain
+SKIPPED_CONTENT_TYPES = (
+    "application/vnd.openxmlformats-officedocument",  # XLSX, DOCX (archives zip)
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/vnd.apache.parquet",  # Colonnes compressées zstd
+    "application/vnd.apache.arrow.stream",  # Tampons IPC compressés zstd
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "video/",
+    "audio/",
+)
+
+RESPONSE_BYTES = registry.register(Counter(
+    "http_response_bytes_total", "Octets des réponses avant (raw) et après (wire) compression",
+    ("route", "encoding", "stage")
+))
+COMPRESSION_SECONDS = registry.register(Counter(
+    "http_compression_seconds_total", "Temps passé à compresser les réponses", ("route", "encoding")
+))
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Choisit br ou gzip selon Accept-Encoding (q-values comprises), sinon None"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    def quality(name):
+        return accepted.get(name, accepted.get("*", 0.0))
+
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best = max(candidates, key=quality)  # À qualité égale, br (premier) l'emporte
+    return best if quality(best) > 0 else None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.seconds = 0.0
+
+    def compress(self, data: bytes) -> bytes:
+        started = time.perf_counter()
+        if self.encoding == "br":
+            output = self._compressor.process(data)
+        else:
+            output = self._compressor.compress(data)
+        self.seconds += time.perf_counter() - started
+        return output
+
+    def finish(self) -> bytes:
+        started = time.perf_counter()
+        output = self._compressor.finish() if self.encoding == "br" else self._compressor.flush()
+        self.seconds += time.perf_counter() - started
+        return output
+
+
+class CompressionMiddleware:
+    """Middleware ASGI de compression gzip / brotli avec seuil de taille"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+        raw_bytes = wire_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough, raw_bytes, wire_bytes
+
+            if message["type"] == "http.response.start":
+                response_headers = {key.lower(): value for key, value in message.get("headers", [])}
+                content_type = response_headers.get(b"content-type", b"").decode("latin-1")
+                passthrough = (
+                    b"content-encoding" in response_headers
+                    or message["status"] in (204, 304)
+                    or content_type.startswith(SKIPPED_CONTENT_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message  # Décision au premier morceau du corps
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                # Corps complet sous le seuil : envoyé tel quel
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                await send(self._compressed_start(start_message, encoding))
+
+            raw_bytes += len(body)
+            output = compressor.compress(body) if body else b""
+            if not more_body:
+                output += compressor.finish()
+                self._record(scope, encoding, raw_bytes, wire_bytes + len(output), compressor.seconds)
+            wire_bytes += len(output)
+            if output or not more_body:
+                await send({"type": "http.response.body", "body": output, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compressed_start(message, encoding: str):
+        headers = []
+        vary = [b"Accept-Encoding"]
+        for key, value in message.get("headers", []):
+            name = key.lower()
+            if name == b"content-length":
+                continue  # Taille compressée inconnue à l'avance : envoi en chunked
+            if name == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value  # Représentation différente : ETag faible
+            if name == b"vary":
+                vary.insert(0, value)
+                continue
+            headers.append((key, value))
+        headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"vary", b", ".join(vary)))
+        return {**message, "headers": headers}
+
+    @staticmethod
+    def _record(scope, encoding: str, raw_bytes: int, wire_bytes: int, seconds: float) -> None:
+        route = route_label(scope)
+        RESPONSE_BYTES.inc(raw_bytes, route=route, encoding=encoding, stage="raw")
+        RESPONSE_BYTES.inc(wire_bytes, route=route, encoding=encoding, stage="wire")
+        COMPRESSION_SECONDS.inc(seconds, route=route, encoding=encoding)
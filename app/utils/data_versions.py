@@ -0,0 +1,121 @@
+# app/utils/data_versions.py
+# Versions de données par table : chaque écriture ORM sur une table suivie
+# incrémente son compteur dans data_versions. Les ETag des endpoints de
+# lecture (et les caches) en sont dérivés.
+#
+# L'incrément a lieu après le commit, dans sa propre transaction très courte,
+# une fois la connexion de la session rendue au pool : la ligne d'une table
+# n'est verrouillée que le temps d'un UPDATE, pas pendant toute la transaction
+# d'écriture (sinon, sur PostgreSQL, tous les pointages simultanés attendraient
+# les uns derrière les autres). Un lecteur qui voit les nouvelles données sous
+# l'ancienne version ne fait que mettre en cache un résultat aussitôt remplacé ;
+# une transaction annulée n'incrémente rien. Un incrément en échec est journalisé
+# sans faire échouer le commit, déjà effectif : au pire, ETag et caches restent
+# périmés jusqu'à la prochaine écriture de la table.
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+
+from app.models.data_version import DataVersion
+
+logger = logging.getLogger("app.data_versions")
+
+BUMP_ATTEMPTS = 2
+
+TRACKED_TABLES = ("employees", "attendance", "leaves", "holidays", "global_qrcodes")
+
+_table = DataVersion.__table__
+
+
+def bump_versions(connection, tables: Iterable[str]) -> None:
+    """Incrémente la version des tables données (crée la ligne si elle manque)"""
+    now = datetime.utcnow()
+    for name in sorted(set(tables)):
+        result = connection.execute(
+            update(_table)
+            .where(_table.c.table_name == name)
+            .values(version=_table.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(_table).values(table_name=name, version=1, updated_at=now))
+
+
+def ensure_data_versions(db: Session) -> None:
+    """Crée les compteurs manquants (au démarrage)"""
+    existing = {name for (name,) in db.query(DataVersion.table_name)}
+    for name in TRACKED_TABLES:
+        if name not in existing:
+            db.add(DataVersion(table_name=name, version=0))
+    db.commit()
+
+
+def get_versions(db: Session, tables: Iterable[str]) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """Version et date de dernière écriture de chaque table, en une requête"""
+    tables = tuple(tables)
+    versions = {name: (0, None) for name in tables}
+    for name, version, updated_at in db.query(
+        DataVersion.table_name, DataVersion.version, DataVersion.updated_at
+    ).filter(DataVersion.table_name.in_(tables)):
+        versions[name] = (version, updated_at)
+    return versions
+
+
+def _tracked_table(obj) -> Optional[str]:
+    table = getattr(obj, "__table__", None)
+    return table.name if table is not None and table.name in TRACKED_TABLES else None
+
+
+def _mark_changed(session, tables: Iterable[str]) -> None:
+    session.info.setdefault("changed_tables", set()).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_after_flush(session, flush_context):
+    changed: Set[str] = set()
+    for obj in session.new | session.deleted:
+        changed.add(_tracked_table(obj))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            changed.add(_tracked_table(obj))
+    changed.discard(None)
+    if changed:
+        _mark_changed(session, changed)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_write(orm_execute_state):
+    # query(...).update() / .delete() contournent le flush
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and table.name in TRACKED_TABLES:
+        _mark_changed(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_changed(session):
+    changed = session.info.pop("changed_tables", None)
+    if changed:
+        session.info["committed_tables"] = changed
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _bump_after_commit(session, transaction):
+    if transaction.parent is not None:
+        return
+    # Fin de la transaction racine : connexion rendue au pool, rien n'est retenu pendant l'incrément
+    changed = session.info.pop("committed_tables", None)
+    session.info.pop("changed_tables", None)  # Annulée : rien à publier
+    if not changed:
+        return
+    for attempt in range(1, BUMP_ATTEMPTS + 1):
+        try:
+            with session.get_bind().begin() as connection:
+                bump_versions(connection, changed)
+            return
+        except Exception:
+            logger.warning("Incrément des versions %s en échec (essai %d/%d)", sorted(changed), attempt,
+                           BUMP_ATTEMPTS, exc_info=True)
@@ -0,0 +1,187 @@
+# app/utils/employee_directory.py
+# Annuaire des employés en mémoire : la table change quelques fois par jour
+# mais est lue à chaque requête (authentification, listes, filtres, exports).
+# Un instantané immuable (lignes + index par id, email, matricule, service)
+# est partagé par toutes les requêtes sans verrou ; chaque écriture construit
+# un nouvel instantané puis remplace la référence (copie sur écriture).
+#
+# Fraîcheur : l'instantané porte la version "employees" de data_versions.
+# Les lectures qui connaissent déjà cette version (ETag de conditional_get)
+# rechargent si elle a bougé ; l'authentification se contente du dernier
+# instantané, rafraîchi par le bus d'invalidation.
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.utils.data_versions import get_versions
+from app.utils.invalidation import invalidation_bus
+
+TABLE = "employees"
+
+
+class EmployeeRecord(NamedTuple):
+    """Employé sans mot de passe haché (colonnes de EmployeeResponse)"""
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    service: Optional[str]
+    fonction: Optional[str]
+    matricule: Optional[str]
+    date_embauche: Optional[date]
+    is_active: bool
+    is_admin: bool
+
+    @classmethod
+    def from_row(cls, row) -> "EmployeeRecord":
+        return cls(*(getattr(row, name) for name in cls._fields))
+
+
+def record_columns():
+    """Colonnes de EmployeeRecord, pour db.query(*record_columns())"""
+    from app.models.employee import Employee
+
+    return [getattr(Employee, name) for name in EmployeeRecord._fields]
+
+
+@dataclass(frozen=True)
+class DirectorySnapshot:
+    """Vue immuable de la table employees à une version donnée"""
+    version: int
+    records: Tuple[EmployeeRecord, ...]  # Triés par prénom puis nom
+    by_id: Dict[int, EmployeeRecord] = field(repr=False)
+    by_email: Dict[str, EmployeeRecord] = field(repr=False)
+    by_matricule: Dict[str, EmployeeRecord] = field(repr=False)
+    by_service: Dict[str, Tuple[EmployeeRecord, ...]] = field(repr=False)
+    # Champs de recherche en minuscules, séparés par \0 (une seule recherche de sous-chaîne)
+    search_text: Dict[int, str] = field(repr=False)
+
+    @classmethod
+    def build(cls, records: Iterable[EmployeeRecord], version: int) -> "DirectorySnapshot":
+        ordered = tuple(sorted(records, key=lambda record: (record.first_name, record.last_name, record.id)))
+        by_service: Dict[str, List[EmployeeRecord]] = {}
+        for record in ordered:
+            if record.service:
+                by_service.setdefault(record.service, []).append(record)
+        return cls(
+            version=version,
+            records=ordered,
+            by_id={record.id: record for record in ordered},
+            by_email={record.email: record for record in ordered},
+            by_matricule={record.matricule: record for record in ordered if record.matricule},
+            by_service={service: tuple(members) for service, members in sorted(by_service.items())},
+            search_text={
+                record.id: "\0".join(
+                    value.lower()
+                    for value in (record.first_name, record.last_name, record.email, record.matricule, record.service)
+                    if value
+                )
+                for record in ordered
+            }
+        )
+
+    @property
+    def services(self) -> List[str]:
+        return list(self.by_service)
+
+    @property
+    def active(self) -> List[EmployeeRecord]:
+        return [record for record in self.records if record.is_active]
+
+    def filter(self, service: Optional[str] = None, status: Optional[str] = None,
+               search: Optional[str] = None) -> List[EmployeeRecord]:
+        """Mêmes filtres que la liste des employés ("all" ou None : pas de filtre)"""
+        records = self.by_service.get(service, ()) if service and service != "all" else self.records
+
+        if status == "active":
+            wanted = True
+        elif status == "inactive":
+            wanted = False
+        else:
+            wanted = None
+
+        needle = search.lower() if search else None
+        search_text = self.search_text
+        return [
+            record
+            for record in records
+            if (wanted is None or record.is_active == wanted)
+            and (needle is None or needle in search_text[record.id])
+        ]
+
+
+class EmployeeDirectory:
+    """Instantané courant de l'annuaire, remplacé en bloc à chaque changement"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[DirectorySnapshot] = None
+
+    def load(self, db: Session, version: Optional[int] = None) -> DirectorySnapshot:
+        """Relit toute la table (premier accès ou changement venu d'ailleurs)"""
+        if version is None:
+            version = get_versions(db, [TABLE])[TABLE][0]
+        rows = db.query(*record_columns()).all()
+        snapshot = DirectorySnapshot.build((EmployeeRecord.from_row(row) for row in rows), version)
+        self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self, version: Optional[int] = None) -> None:
+        """Rechargement complet à la prochaine lecture, sauf si l'instantané est déjà à `version`"""
+        snapshot = self._snapshot
+        if version is None or snapshot is None or snapshot.version != version:
+            self._snapshot = None
+
+    def snapshot(self, db: Session, version: Optional[int] = None) -> DirectorySnapshot:
+        """Instantané à jour de `version` (lue dans data_versions si non fournie)"""
+        if version is None:
+            version = get_versions(db, [TABLE])[TABLE][0]
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = self.load(db, version)
+        return snapshot
+
+    def find_by_email(self, db: Session, email: str) -> Optional[EmployeeRecord]:
+        """Recherche pour l'authentification : dernier instantané, la base en dernier recours"""
+        snapshot = self._snapshot
+        record = snapshot.by_email.get(email) if snapshot is not None else None
+        if record is None:
+            # Annuaire pas encore chargé (il le sera par la première lecture versionnée)
+            # ou compte créé par un autre worker depuis le dernier rechargement
+            from app.models.employee import Employee
+
+            row = db.query(*record_columns()).filter(Employee.email == email).first()
+            record = EmployeeRecord.from_row(row) if row is not None else None
+        return record
+
+    def apply(self, db: Session, employee) -> None:
+        """Copie sur écriture après création ou modification d'un employé (après commit)"""
+        version = get_versions(db, [TABLE])[TABLE][0]
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return
+            if version != snapshot.version + 1:
+                # Une autre écriture s'est intercalée : rechargement complet à la prochaine lecture
+                self._snapshot = None
+                return
+            records = dict(snapshot.by_id)
+            records[employee.id] = EmployeeRecord.from_row(employee)
+            self._snapshot = DirectorySnapshot.build(records.values(), version)
+
+
+employee_directory = EmployeeDirectory()
+# Les écritures de ce worker sont déjà appliquées : seules les autres provoquent un rechargement
+invalidation_bus.subscribe([TABLE], lambda table, version: employee_directory.invalidate(version))
+
+
+def current_directory(request: Request, db: Session = Depends(get_db)) -> DirectorySnapshot:
+    """Dépendance FastAPI : instantané à jour, sans requête si conditional_get a déjà lu la version"""
+    versions = getattr(request.state, "data_versions", None) or {}
+    version = versions.get(TABLE, (None,))[0]
+    return employee_directory.snapshot(db, version)
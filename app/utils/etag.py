@@ -0,0 +1,54 @@
+# app/utils/etag.py
+# GET conditionnels : l'ETag d'un endpoint est dérivé des versions des tables
+# qu'il lit, de l'URL (chemin + paramètres) et de la date du jour (les
+# périodes « aujourd'hui », « ce mois » glissent avec elle). Si le client
+# renvoie un ETag identique, on répond 304 sans exécuter les requêtes.
+import hashlib
+from datetime import date, timezone
+from email.utils import format_datetime
+from typing import Dict
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.utils.data_versions import get_versions
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def conditional_get(*tables: str):
+    """Dépendance FastAPI : ETag / Last-Modified et 304 si If-None-Match correspond.
+
+    À déclarer après la dépendance d'authentification. Retourne les en-têtes à
+    joindre aux réponses construites à la main (StreamingResponse, rows_response).
+    """
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)) -> Dict[str, str]:
+        versions = get_versions(db, tables)
+        request.state.data_versions = versions  # Réutilisées par les caches versionnés (employee_directory)
+        key = "|".join([
+            request.url.path,
+            "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items())),
+            date.today().isoformat(),
+            *(f"{name}:{versions[name][0]}" for name in sorted(versions)),
+        ])
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        modified = [updated_at for _, updated_at in versions.values() if updated_at]
+        if modified:
+            headers["Last-Modified"] = format_datetime(max(modified).replace(tzinfo=timezone.utc), usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return headers
+
+    return dependency
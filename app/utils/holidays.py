@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import List, Dict
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Set
 
 def fetch_gregorian_holidays(year: int) -> List[Dict]:
     """Récupère les jours fériés du calendrier grégorien"""
@@ -14,4 +14,31 @@ def fetch_gregorian_holidays(year: int) -> List[Dict]:
 def is_holiday(date: str) -> bool:
     """Vérifie si une date est un jour férié"""
     # Implémentation à compléter
-    return False
\ No newline at end of file
+    return False
+
+def get_holiday_dates(db, start: date, end: date) -> Set[str]:
+    """Dates (YYYY-MM-DD) des jours fériés de la période, récurrents compris"""
+    from app.models.holiday import Holiday
+
+    dates = set()
+    for holiday_date, is_recurring in db.query(Holiday.date, Holiday.is_recurring).all():
+        if is_recurring:
+            # Un jour férié récurrent revient chaque année au même jour et mois
+            for year in range(start.year, end.year + 1):
+                dates.add(f"{year}{holiday_date[4:]}")
+        else:
+            dates.add(holiday_date)
+    return {d for d in dates if start.isoformat() <= d <= end.isoformat()}
+
+
+def count_working_days_by_year(db, start: date, end: date, holidays: Set[str] = None) -> Dict[int, int]:
+    """Nombre de jours ouvrés (hors week-ends et jours fériés) par année civile"""
+    if holidays is None:
+        holidays = get_holiday_dates(db, start, end)
+    counts: Dict[int, int] = {}
+    current = start
+    while current <= end:
+        if current.weekday() < 5 and current.isoformat() not in holidays:
+            counts[current.year] = counts.get(current.year, 0) + 1
+        current += timedelta(days=1)
+    return counts
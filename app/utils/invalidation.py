@@ -0,0 +1,75 @@
+# app/utils/invalidation.py
+# Bus d'invalidation entre workers, sans service externe : chaque écriture ORM
+# incrémente la version de sa table dans data_versions (juste après le commit,
+# voir app.utils.data_versions). Chaque processus relit ces quelques lignes toutes
+# les `invalidation_poll_s` secondes et prévient les caches locaux abonnés aux
+# tables dont la version a changé. Staleness bornée par l'intervalle de
+# sondage ; une seule petite requête par worker et par intervalle.
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+
+from app.models.data_version import DataVersion
+from app.utils.data_versions import bump_versions
+
+logger = logging.getLogger("app.invalidation")
+
+Callback = Callable[[str, int], None]
+
+_table = DataVersion.__table__
+
+
+class InvalidationBus:
+    """Abonnements des caches locaux aux changements de version des tables"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Callback]] = {}
+        self._seen: Optional[Dict[str, int]] = None
+
+    def subscribe(self, tables: Iterable[str], callback: Callback) -> None:
+        """`callback(table, version)` est appelé quand une autre écriture change la table"""
+        with self._lock:
+            for table in tables:
+                self._subscribers.setdefault(table, []).append(callback)
+
+    def notify(self, engine, *tables: str) -> None:
+        """Publie un changement hors ORM (SQL brut, fichier, rotation externe)"""
+        with engine.begin() as connection:
+            bump_versions(connection, tables)
+
+    def poll(self, engine) -> List[str]:
+        """Compare les versions à celles vues au dernier passage ; retourne les tables changées"""
+        with engine.connect() as connection:
+            versions = dict(connection.execute(select(_table.c.table_name, _table.c.version)).all())
+
+        with self._lock:
+            seen, self._seen = self._seen, versions
+            if seen is None:
+                return []  # Premier passage : référence seulement
+            changed = [name for name, version in versions.items() if seen.get(name) != version]
+            callbacks = [(name, callback) for name in changed for callback in self._subscribers.get(name, ())]
+
+        for name, callback in callbacks:
+            try:
+                callback(name, versions[name])
+            except Exception:
+                logger.exception("Invalidation de %s en échec", name)
+        return changed
+
+    async def run(self, engine, interval_s: float) -> None:
+        """Boucle de sondage (tâche de fond du lifespan)"""
+        from starlette.concurrency import run_in_threadpool
+
+        while True:
+            try:
+                await run_in_threadpool(self.poll, engine)
+            except Exception:
+                logger.exception("Sondage des versions de données en échec")
+            await asyncio.sleep(interval_s)
+
+
+invalidation_bus = InvalidationBus()
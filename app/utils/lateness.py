@@ -0,0 +1,239 @@
+# app/utils/lateness.py
+# Distribution des minutes de retard à l'arrivée (p50, p90, p99) sans relire
+# les pointages : chaque arrivée incrémente un intervalle DDSketch de son
+# service, pour le jour et pour le mois (table lateness_bins). Les esquisses
+# se fusionnent par simple addition des compteurs ; une période quelconque se
+# décompose en mois entiers plus au plus deux morceaux de mois, donc le nombre
+# de lignes lues ne dépend presque pas de sa longueur.
+#
+# DDSketch : l'intervalle k couvre ]γ^(k-1), γ^k] avec γ = (1+α)/(1-α) ; tout
+# quantile est estimé à α près en valeur relative (1 %). Les arrivées à
+# l'heure (0 minute) ont leur propre compteur.
+import math
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, insert, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.lateness import LatenessBin
+from app.utils.partitions import add_months
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+ZERO_BIN = -1  # Arrivées à l'heure
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+_table = LatenessBin.__table__
+
+
+def bin_for(minutes: float) -> int:
+    """Intervalle DDSketch d'une durée de retard en minutes"""
+    if minutes <= 0:
+        return ZERO_BIN
+    return math.ceil(math.log(minutes) / _LOG_GAMMA)
+
+
+def bin_value(key: int) -> float:
+    """Valeur représentative d'un intervalle (erreur relative ≤ α)"""
+    if key == ZERO_BIN:
+        return 0.0
+    return 2 * GAMMA ** key / (GAMMA + 1)
+
+
+class LatenessSketch:
+    """Esquisse DDSketch fusionnable (compteurs par intervalle)"""
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None):
+        self.counts: Dict[int, int] = dict(counts or {})
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, minutes: float, count: int = 1) -> None:
+        key = bin_for(minutes)
+        self.counts[key] = self.counts.get(key, 0) + count
+
+    def merge(self, other: "LatenessSketch") -> "LatenessSketch":
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen > rank:
+                return bin_value(key)
+        return bin_value(max(self.counts))
+
+    def summary(self) -> dict:
+        """Nombre d'arrivées, arrivées en retard et quantiles arrondis au dixième de minute"""
+        summary = {"count": self.count, "late": self.count - self.counts.get(ZERO_BIN, 0)}
+        for name, q in QUANTILES.items():
+            value = self.quantile(q)
+            summary[name] = round(value, 1) if value is not None else None
+        return summary
+
+
+def arrival_lateness(attendance) -> List[Tuple[str, int]]:
+    """Arrivées renseignées d'un pointage : (créneau, minutes de retard)"""
+    arrivals = []
+    if attendance.morning_arrival:
+        arrivals.append(("morning", attendance.late_minutes_morning or 0))
+    if attendance.afternoon_arrival:
+        arrivals.append(("afternoon", attendance.late_minutes_afternoon or 0))
+    return arrivals
+
+
+def record_arrivals(db: Session, service: Optional[str], day: str,
+                    before: Dict[str, int], after: Dict[str, int]) -> None:
+    """Reporte dans les esquisses les arrivées ajoutées ou corrigées d'un pointage"""
+    for slot, minutes in after.items():
+        if slot in before:
+            if before[slot] == minutes:
+                continue
+            bump_lateness(db, service, day, before[slot], -1)  # Arrivée pointée une seconde fois
+        bump_lateness(db, service, day, minutes)
+
+
+def _month_key(day: str) -> str:
+    return day[:8] + "01"
+
+
+def _bump_statement(dialect: str):
+    """INSERT … ON CONFLICT DO UPDATE du dialecte (même syntaxe sur SQLite et PostgreSQL)"""
+    statement = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(_table)
+    return statement.on_conflict_do_update(
+        index_elements=[_table.c.service, _table.c.granularity, _table.c.period, _table.c.bin],
+        set_={"count": _table.c.count + statement.excluded.count}
+    )
+
+
+def bump_lateness(db: Session, service: Optional[str], day: str, minutes: int, count: int = 1) -> None:
+    """Ajoute (ou retire, count < 0) une arrivée aux esquisses du jour et du mois, dans la transaction courante.
+
+    Les lignes naissent au fil des pointages : un seul INSERT … ON CONFLICT DO UPDATE
+    par compteur, pour que deux premières arrivées simultanées dans le même
+    intervalle s'additionnent au lieu de se heurter sur la clé primaire.
+    """
+    key = bin_for(minutes)
+    if count < 0:
+        # Correction d'une arrivée déjà comptée : la ligne existe forcément
+        for granularity, period in (("day", day), ("month", _month_key(day))):
+            db.execute(update(_table).where(and_(
+                _table.c.service == (service or ""),
+                _table.c.granularity == granularity,
+                _table.c.period == period,
+                _table.c.bin == key
+            )).values(count=_table.c.count + count))
+        return
+
+    db.execute(_bump_statement(db.get_bind().dialect.name), [
+        {"service": service or "", "granularity": granularity, "period": period, "bin": key, "count": count}
+        for granularity, period in (("day", day), ("month", _month_key(day)))
+    ])
+
+
+def _spans(start_date: date, end_date: date) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Mois entiers de la période et morceaux de mois restants (au plus deux)"""
+    months, days = [], []
+    current = start_date
+    while current <= end_date:
+        next_month = add_months(current, 1)
+        month_end = next_month - timedelta(days=1)
+        if current.day == 1 and month_end <= end_date:
+            months.append(current.isoformat())
+        else:
+            days.append((current.isoformat(), min(month_end, end_date).isoformat()))
+        current = next_month
+    return months, days
+
+
+def lateness_by_service(db: Session, start_date: date, end_date: date,
+                        service: Optional[str] = None) -> Dict[str, LatenessSketch]:
+    """Esquisses fusionnées par service sur une période (mois entiers + jours de bord)"""
+    months, days = _spans(start_date, end_date)
+    spans = [and_(_table.c.granularity == "month", _table.c.period.in_(months))] if months else []
+    spans += [
+        and_(_table.c.granularity == "day", _table.c.period >= first, _table.c.period <= last)
+        for first, last in days
+    ]
+    query = db.query(_table.c.service, _table.c.bin, func.sum(_table.c.count)).filter(or_(*spans))
+    if service is not None:
+        query = query.filter(_table.c.service == service)
+
+    sketches: Dict[str, LatenessSketch] = {}
+    for name, key, count in query.group_by(_table.c.service, _table.c.bin):
+        if count:
+            sketches.setdefault(name, LatenessSketch()).counts[key] = count
+    return sketches
+
+
+def lateness_by_week(db: Session, start_date: date, end_date: date,
+                     service: Optional[str] = None) -> Dict[str, LatenessSketch]:
+    """Esquisses fusionnées par semaine (clé : lundi de la semaine), services confondus ou un seul"""
+    query = db.query(_table.c.period, _table.c.bin, func.sum(_table.c.count)).filter(
+        _table.c.granularity == "day",
+        _table.c.period >= start_date.isoformat(),
+        _table.c.period <= end_date.isoformat()
+    )
+    if service is not None:
+        query = query.filter(_table.c.service == service)
+
+    sketches: Dict[str, LatenessSketch] = {}
+    for period, key, count in query.group_by(_table.c.period, _table.c.bin):
+        day = date.fromisoformat(period)
+        week = (day - timedelta(days=day.weekday())).isoformat()
+        sketch = sketches.setdefault(week, LatenessSketch())
+        sketch.counts[key] = sketch.counts.get(key, 0) + count
+    return dict(sorted(sketches.items()))
+
+
+def rebuild_lateness(db: Session, start_date: date, end_date: date) -> int:
+    """Recalcule les esquisses des mois couvrant la période à partir des pointages (archives comprises).
+
+    Le service retenu est le service actuel de l'employé. Retourne le nombre d'arrivées comptées.
+    """
+    from app.models.employee import Employee
+    from app.utils.archive import load_attendance
+
+    first = add_months(start_date, 0)
+    last = add_months(end_date, 1) - timedelta(days=1)
+    services = dict(db.query(Employee.id, Employee.service))
+    rows = load_attendance(db, first, last, (
+        "employee_id", "date", "morning_arrival", "afternoon_arrival", "late_minutes_morning", "late_minutes_afternoon"
+    ))
+
+    counts: Dict[Tuple[str, str, str, int], int] = {}
+    arrivals = 0
+    for row in rows:
+        employee_id, day, morning, afternoon, late_morning, late_afternoon = row
+        day = day.isoformat() if isinstance(day, date) else day
+        service = services.get(employee_id) or ""
+        for arrival, minutes in ((morning, late_morning), (afternoon, late_afternoon)):
+            if not arrival:
+                continue
+            arrivals += 1
+            key = bin_for(minutes or 0)
+            for granularity, period in (("day", day), ("month", _month_key(day))):
+                counts[(service, granularity, period, key)] = counts.get((service, granularity, period, key), 0) + 1
+
+    db.query(LatenessBin).filter(
+        LatenessBin.period >= first.isoformat(),
+        LatenessBin.period <= last.isoformat()
+    ).delete(synchronize_session=False)
+    if counts:
+        db.execute(insert(_table), [
+            {"service": service, "granularity": granularity, "period": period, "bin": key, "count": count}
+            for (service, granularity, period, key), count in counts.items()
+        ])
+    db.commit()
+    return arrivals
@@ -0,0 +1,123 @@
+# app/utils/leave_balances.py
+from datetime import date
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+from app.models.leave_balance import LeaveBalance
+from app.utils.holidays import count_working_days_by_year, get_holiday_dates
+
+ANNUAL_LEAVE_DAYS = 25
+DEDUCTED_LEAVE_TYPES = ("congé",)  # Les permissions ne sont pas décomptées du solde
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def leave_working_days(db: Session, leave, holidays: Optional[Set[str]] = None) -> Dict[int, int]:
+    """Jours ouvrés d'un congé, ventilés par année civile"""
+    return count_working_days_by_year(db, _as_date(leave.start_date), _as_date(leave.end_date), holidays)
+
+
+def _load_balances(db: Session, keys: Set[Tuple[int, int]]) -> Dict[Tuple[int, int], LeaveBalance]:
+    """Charge (et verrouille) les soldes concernés en une requête, crée ceux qui manquent"""
+    employee_ids = {employee_id for employee_id, _ in keys}
+    years = {year for _, year in keys}
+    balances = {
+        (balance.employee_id, balance.year): balance
+        for balance in db.query(LeaveBalance).filter(
+            LeaveBalance.employee_id.in_(employee_ids),
+            LeaveBalance.year.in_(years)
+        ).with_for_update()
+    }
+    for key in keys - balances.keys():
+        balance = LeaveBalance(
+            employee_id=key[0],
+            year=key[1],
+            entitled_days=ANNUAL_LEAVE_DAYS,
+            taken_days=0
+        )
+        db.add(balance)
+        balances[key] = balance
+    return balances
+
+
+def apply_status_changes(db: Session, changes: Iterable[Tuple[object, int]]) -> None:
+    """Débite (direction=1) ou recrédite (direction=-1) les soldes pour une série de congés.
+
+    Ne fait pas de commit : l'écriture est validée dans la même transaction
+    que le changement de statut des congés.
+    """
+    changes = [(leave, direction) for leave, direction in changes if leave.leave_type in DEDUCTED_LEAVE_TYPES]
+    if not changes:
+        return
+
+    # Calendrier des jours fériés chargé une seule fois pour tout le lot
+    holidays = get_holiday_dates(
+        db,
+        min(_as_date(leave.start_date) for leave, _ in changes),
+        max(_as_date(leave.end_date) for leave, _ in changes)
+    )
+    deltas: Dict[Tuple[int, int], int] = {}
+    for leave, direction in changes:
+        for year, days in leave_working_days(db, leave, holidays).items():
+            key = (leave.employee_id, year)
+            deltas[key] = deltas.get(key, 0) + direction * days
+
+    balances = _load_balances(db, set(deltas))
+    for key, delta in deltas.items():
+        balances[key].taken_days = (balances[key].taken_days or 0) + delta
+
+
+def status_change_direction(old_status: str, new_status: str) -> int:
+    """+1 si le congé devient approuvé, -1 s'il ne l'est plus, 0 sinon"""
+    if new_status == "approved" and old_status != "approved":
+        return 1
+    if old_status == "approved" and new_status != "approved":
+        return -1
+    return 0
+
+
+def set_leave_status(db: Session, leave, status: str) -> None:
+    """Change le statut d'un congé en tenant le grand livre des soldes à jour"""
+    direction = status_change_direction(leave.status, status)
+    leave.status = status
+    if direction:
+        apply_status_changes(db, [(leave, direction)])
+
+
+def get_leave_balance(db: Session, employee_id: int, year: int) -> Dict:
+    """Solde de congés d'un employé pour une année (une lecture par clé unique)"""
+    balance = db.query(LeaveBalance.entitled_days, LeaveBalance.taken_days).filter(
+        LeaveBalance.employee_id == employee_id,
+        LeaveBalance.year == year
+    ).first()
+    entitled, taken = balance if balance else (ANNUAL_LEAVE_DAYS, 0)
+    return {
+        "employee_id": employee_id,
+        "year": year,
+        "entitled_days": entitled,
+        "taken_days": taken,
+        "remaining_days": entitled - taken
+    }
+
+
+def total_remaining_leaves(db: Session, year: int, employee_ids: Optional[Iterable[int]] = None) -> int:
+    """Somme des soldes restants des employés actifs, en une requête agrégée"""
+    query = db.query(
+        func.sum(
+            func.coalesce(LeaveBalance.entitled_days, ANNUAL_LEAVE_DAYS) -
+            func.coalesce(LeaveBalance.taken_days, 0)
+        )
+    ).select_from(Employee).outerjoin(
+        LeaveBalance,
+        (LeaveBalance.employee_id == Employee.id) & (LeaveBalance.year == year)
+    )
+    if employee_ids is None:
+        query = query.filter(Employee.is_active == True)
+    else:
+        query = query.filter(Employee.id.in_(list(employee_ids)))
+    return query.scalar() or 0
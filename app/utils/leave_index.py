@@ -0,0 +1,185 @@
+# app/utils/leave_index.py
+import threading
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.utils.invalidation import invalidation_bus
+
+DateLike = Union[date, str]
+
+
+def _iso(value: DateLike) -> str:
+    # Les dates sont stockées au format YYYY-MM-DD : l'ordre lexicographique est l'ordre chronologique
+    return value.isoformat() if isinstance(value, date) else value
+
+
+@dataclass(frozen=True)
+class _EmployeeIntervals:
+    """Congés approuvés d'un employé, triés par date de début"""
+    starts: Tuple[str, ...]
+    ends: Tuple[str, ...]
+    max_ends: Tuple[str, ...]  # max(ends[:i + 1]) pour tolérer les chevauchements
+
+    @classmethod
+    def build(cls, intervals: Iterable[Tuple[str, str]]) -> "_EmployeeIntervals":
+        ordered = sorted(intervals)
+        max_ends = []
+        current = ""
+        for _, end in ordered:
+            current = max(current, end)
+            max_ends.append(current)
+        return cls(
+            tuple(start for start, _ in ordered),
+            tuple(end for _, end in ordered),
+            tuple(max_ends)
+        )
+
+    def overlaps(self, start: str, end: str) -> bool:
+        """Vrai si un congé chevauche [start, end] (O(log n))"""
+        i = bisect_right(self.starts, end)
+        return i > 0 and self.max_ends[i - 1] >= start
+
+    def days_in(self, start: str, end: str) -> List[Tuple[str, str]]:
+        """Congés chevauchant [start, end], bornés à la période"""
+        i = bisect_right(self.starts, end)
+        return [
+            (max(s, start), min(e, end))
+            for s, e in zip(self.starts[:i], self.ends[:i])
+            if e >= start
+        ]
+
+
+class LeaveIndex:
+    """Index en mémoire des congés approuvés, par employé.
+
+    Les lectures ne prennent pas de verrou : chaque modification reconstruit
+    la structure de l'employé concerné puis remplace la référence.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._leaves: Dict[int, Tuple[int, str, str]] = {}
+        self._by_employee: Dict[int, _EmployeeIntervals] = {}
+        # Débuts et fins de tous les congés, triés séparément, pour compter les chevauchements
+        self._bounds: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ())
+        self.loaded = False
+
+    def load(self, db: Session) -> None:
+        """Charge tous les congés approuvés (au démarrage)"""
+        from app.models.leave import Leave
+
+        rows = db.query(Leave.id, Leave.employee_id, Leave.start_date, Leave.end_date).filter(
+            Leave.status == "approved"
+        ).all()
+
+        leaves = {row.id: (row.employee_id, row.start_date, row.end_date) for row in rows}
+        grouped: Dict[int, List[Tuple[str, str]]] = {}
+        for employee_id, start, end in leaves.values():
+            grouped.setdefault(employee_id, []).append((start, end))
+
+        with self._lock:
+            self._leaves = leaves
+            self._by_employee = {
+                employee_id: _EmployeeIntervals.build(intervals)
+                for employee_id, intervals in grouped.items()
+            }
+            self._rebuild_totals()
+            self.loaded = True
+
+    def ensure_loaded(self, db: Session) -> None:
+        if not self.loaded:
+            self.load(db)
+
+    def invalidate(self) -> None:
+        """Rechargement complet à la prochaine lecture (congés modifiés par un autre worker)"""
+        self.loaded = False
+
+    def _rebuild_totals(self) -> None:
+        self._bounds = (
+            tuple(sorted(start for _, start, _ in self._leaves.values())),
+            tuple(sorted(end for _, _, end in self._leaves.values()))
+        )
+
+    def _rebuild_employee(self, employee_id: int) -> None:
+        intervals = [
+            (start, end)
+            for emp_id, start, end in self._leaves.values()
+            if emp_id == employee_id
+        ]
+        by_employee = dict(self._by_employee)
+        if intervals:
+            by_employee[employee_id] = _EmployeeIntervals.build(intervals)
+        else:
+            by_employee.pop(employee_id, None)
+        self._by_employee = by_employee
+
+    def apply(self, leave) -> None:
+        """Met à jour l'index après création, approbation ou refus d'un congé"""
+        self.apply_many([(leave.id, leave.employee_id, leave.start_date, leave.end_date, leave.status)])
+
+    def apply_many(self, leaves: Iterable[Tuple[int, int, DateLike, DateLike, str]]) -> None:
+        """Met à jour l'index pour une série de (id, employé, début, fin, statut)"""
+        with self._lock:
+            touched = set()
+            for leave_id, employee_id, start, end, status in leaves:
+                if status == "approved":
+                    self._leaves[leave_id] = (employee_id, _iso(start), _iso(end))
+                elif self._leaves.pop(leave_id, None) is None:
+                    continue
+                touched.add(employee_id)
+            if not touched:
+                return
+            for employee_id in touched:
+                self._rebuild_employee(employee_id)
+            self._rebuild_totals()
+
+    def is_on_leave(self, employee_id: int, day: DateLike) -> bool:
+        """L'employé est-il en congé approuvé ce jour-là ?"""
+        intervals = self._by_employee.get(employee_id)
+        day = _iso(day)
+        return intervals is not None and intervals.overlaps(day, day)
+
+    def employees_on_leave(
+        self,
+        start: DateLike,
+        end: DateLike,
+        employee_ids: Optional[Iterable[int]] = None
+    ) -> Set[int]:
+        """Employés ayant au moins un congé approuvé chevauchant la période"""
+        start, end = _iso(start), _iso(end)
+        by_employee = self._by_employee
+        candidates = by_employee.keys() if employee_ids is None else employee_ids
+        return {
+            employee_id
+            for employee_id in candidates
+            if employee_id in by_employee and by_employee[employee_id].overlaps(start, end)
+        }
+
+    def overlaps_many(self, queries: Iterable[Tuple[int, DateLike, DateLike]]) -> List[bool]:
+        """Version groupée de la recherche de chevauchement (employé, début, fin)"""
+        by_employee = self._by_employee
+        results = []
+        for employee_id, start, end in queries:
+            intervals = by_employee.get(employee_id)
+            results.append(intervals is not None and intervals.overlaps(_iso(start), _iso(end)))
+        return results
+
+    def leave_periods(self, employee_id: int, start: DateLike, end: DateLike) -> List[Tuple[str, str]]:
+        """Congés approuvés d'un employé sur la période, bornés à celle-ci"""
+        intervals = self._by_employee.get(employee_id)
+        return intervals.days_in(_iso(start), _iso(end)) if intervals else []
+
+    def count_leaves(self, start: DateLike, end: DateLike) -> int:
+        """Nombre de congés approuvés chevauchant la période (O(log n))"""
+        starts, ends = self._bounds
+        ended_before = bisect_left(ends, _iso(start))
+        started_after = len(starts) - bisect_right(starts, _iso(end))
+        return len(starts) - ended_before - started_after
+
+
+leave_index = LeaveIndex()
+invalidation_bus.subscribe(["leaves"], lambda table, version: leave_index.invalidate())
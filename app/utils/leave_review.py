@@ -0,0 +1,100 @@
+# app/utils/leave_review.py
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, aliased
+
+from app.models.leave import Leave
+from app.utils.leave_balances import apply_status_changes, status_change_direction
+from app.utils.leave_index import leave_index
+
+
+def find_leave_conflicts(db: Session, approve_ids: Set[int], reject_ids: Set[int]) -> Dict[int, List[int]]:
+    """Congés à approuver qui chevauchent un autre congé approuvé du même employé.
+
+    Une seule auto-jointure, servie par l'index (employee_id, start_date, end_date).
+    Les demandes du lot sont ensuite examinées par id croissant : chacune est
+    comparée aux congés déjà approuvés et aux demandes du lot retenues avant
+    elle, jamais à une demande elle-même écartée pour conflit.
+    """
+    if not approve_ids:
+        return {}
+
+    other = aliased(Leave)
+    rows = db.query(Leave.id, other.id, other.status).join(
+        other,
+        and_(
+            other.employee_id == Leave.employee_id,
+            other.id != Leave.id,
+            other.start_date <= Leave.end_date,
+            other.end_date >= Leave.start_date
+        )
+    ).filter(
+        Leave.id.in_(approve_ids),
+        or_(
+            and_(other.status == "approved", other.id.notin_(reject_ids)),
+            other.id.in_(approve_ids)
+        )
+    ).all()
+
+    overlaps: Dict[int, List[Tuple[int, str]]] = {}
+    for leave_id, other_id, status in rows:
+        overlaps.setdefault(leave_id, []).append((other_id, status))
+
+    conflicts: Dict[int, List[int]] = {}
+    for leave_id in sorted(approve_ids):
+        blocking = sorted(
+            other_id
+            for other_id, status in overlaps.get(leave_id, ())
+            if (status == "approved" and other_id not in reject_ids)
+            or (other_id in approve_ids and other_id < leave_id and other_id not in conflicts)
+        )
+        if blocking:
+            conflicts[leave_id] = blocking
+    return conflicts
+
+
+def apply_bulk_decision(db: Session, approve_ids: List[int], reject_ids: List[int]) -> Dict:
+    """Approuve et refuse des congés par lots (un UPDATE ... WHERE id IN par décision)"""
+    approve_ids, reject_ids = set(approve_ids), set(reject_ids) - set(approve_ids)
+    requested = approve_ids | reject_ids
+
+    leaves = {
+        row.id: row
+        for row in db.query(
+            Leave.id, Leave.employee_id, Leave.start_date, Leave.end_date, Leave.leave_type, Leave.status
+        ).filter(Leave.id.in_(requested))
+    }
+    not_found = sorted(requested - leaves.keys())
+    approve_ids &= leaves.keys()
+    reject_ids &= leaves.keys()
+
+    conflicts = find_leave_conflicts(db, approve_ids, reject_ids)
+    approve_ids -= conflicts.keys()
+
+    decisions = [(leave_id, "approved") for leave_id in approve_ids] + \
+        [(leave_id, "rejected") for leave_id in reject_ids]
+    apply_status_changes(db, [
+        (leaves[leave_id], status_change_direction(leaves[leave_id].status, status))
+        for leave_id, status in decisions
+        if status_change_direction(leaves[leave_id].status, status)
+    ])
+
+    for status, ids in (("approved", approve_ids), ("rejected", reject_ids)):
+        if ids:
+            db.query(Leave).filter(Leave.id.in_(ids)).update(
+                {Leave.status: status}, synchronize_session=False
+            )
+    db.commit()
+
+    leave_index.apply_many(
+        (leave_id, leaves[leave_id].employee_id, leaves[leave_id].start_date, leaves[leave_id].end_date, status)
+        for leave_id, status in decisions
+    )
+
+    return {
+        "approved": sorted(approve_ids),
+        "rejected": sorted(reject_ids),
+        "conflicts": conflicts,
+        "not_found": not_found
+    }
@@ -0,0 +1,289 @@
+# app/utils/metrics.py
+# Métriques au format texte Prometheus, sans dépendance externe : le middleware
+# mesure chaque requête HTTP, les hooks SQLAlchemy comptent les requêtes SQL,
+# et le tout est exposé sur /metrics.
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Par jeu d'étiquettes : [compteurs par seau (non cumulés), somme, nombre]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(float(bound))}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP par route", ("method", "route")
+))
+REQUESTS_TOTAL = registry.register(Counter(
+    "http_requests_total", "Requêtes HTTP par route et code de statut", ("method", "route", "status")
+))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement"
+))
+SQL_STATEMENTS_TOTAL = registry.register(Counter(
+    "db_statements_total", "Requêtes SQL exécutées par route", ("route",)
+))
+SQL_STATEMENT_LATENCY = registry.register(Histogram(
+    "db_statement_duration_seconds", "Durée des requêtes SQL"
+))
+SQL_STATEMENTS_PER_REQUEST = registry.register(Histogram(
+    "db_statements_per_request", "Nombre de requêtes SQL par requête HTTP", ("route",), buckets=COUNT_BUCKETS
+))
+SQL_TIME_PER_REQUEST = registry.register(Histogram(
+    "db_time_per_request_seconds", "Temps SQL cumulé par requête HTTP", ("route",)
+))
+POOL_CHECKOUT_WAIT = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Attente pour obtenir une connexion du pool"
+))
+BCRYPT_LATENCY = registry.register(Histogram(
+    "bcrypt_duration_seconds", "Durée des opérations bcrypt", ("operation",)
+))
+PDF_RENDER_LATENCY = registry.register(Histogram(
+    "pdf_render_duration_seconds", "Durée de génération des PDF", ("report",)
+))
+
+
+@dataclass
+class RequestSQLStats:
+    """Coût SQL de la requête HTTP en cours"""
+    count: int = 0
+    duration: float = 0.0
+    statements: Optional[List[str]] = None  # Conservées seulement en mode debug SQL
+
+
+current_sql_stats: ContextVar[Optional[RequestSQLStats]] = ContextVar("current_sql_stats", default=None)
+
+
+def install_sql_hooks(engine) -> None:
+    """Branche le comptage des requêtes SQL et la mesure du pool sur un moteur SQLAlchemy"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    # engine.dispose() remplace le pool : la mesure est rebranchée sur le nouveau
+    event.listen(engine, "engine_disposed", lambda disposed: _time_pool_checkout(disposed.pool))
+    _time_pool_checkout(engine.pool)
+
+
+def _time_pool_checkout(pool) -> None:
+    """Attente de chaque sortie réelle du pool (l'événement checkout n'a lieu qu'une fois la
+    connexion obtenue : c'est l'appel lui-même qui est chronométré)"""
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _handle_error(exception_context):
+    # Requête en échec : pas d'after_cursor_execute, le départ est retiré ici
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    SQL_STATEMENT_LATENCY.observe(elapsed)
+    stats = current_sql_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        if stats.statements is not None:
+            stats.statements.append(statement)
+
+
+def timed(histogram: Histogram, **labels):
+    """Décorateur : mesure la durée d'appel d'une fonction"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def route_label(scope) -> str:
+    """Gabarit de la route (/employees/{employee_id}) plutôt que le chemin réel"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI : latence, requêtes en cours et coût SQL par route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestSQLStats()
+        token = current_sql_stats.set(stats)
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+            current_sql_stats.reset(token)
+
+            route = route_label(scope)
+            method = scope["method"]
+            REQUEST_LATENCY.observe(elapsed, method=method, route=route)
+            REQUESTS_TOTAL.inc(method=method, route=route, status=status_code)
+            SQL_STATEMENTS_TOTAL.inc(stats.count, route=route)
+            SQL_STATEMENTS_PER_REQUEST.observe(stats.count, route=route)
+            SQL_TIME_PER_REQUEST.observe(stats.duration, route=route)
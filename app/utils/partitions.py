@@ -0,0 +1,93 @@
+# app/utils/partitions.py
+# Partitionnement mensuel de la table attendance.
+# PostgreSQL : partitions déclaratives (PARTITION BY RANGE (date), voir la
+# migration c4e9a7b1f352), une par mois, créées d'avance au démarrage puis
+# chaque jour. Les requêtes filtrent Attendance.date par chaînes ISO, ce qui
+# permet au planificateur d'élaguer les mois hors période.
+# SQLite : pas de partitionnement natif ni de routage mensuel ; l'index
+# (date, employee_id) borne les lectures par période à la plage demandée, et
+# rien n'est créé ni entretenu au démarrage (voir README).
+import logging
+from datetime import date
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger("app.partitions")
+
+PARTITIONED_TABLE = "attendance"
+
+
+def add_months(day: date, months: int) -> date:
+    """Premier jour du mois situé `months` mois après celui de `day`"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITIONED_TABLE}_p{month:%Y_%m}"
+
+
+def month_bounds(month: date) -> Tuple[str, str]:
+    """Bornes [début, fin) d'une partition mensuelle, au format de la colonne date"""
+    start = add_months(month, 0)
+    return start.isoformat(), add_months(start, 1).isoformat()
+
+
+def partitions_for_period(start_date: date, end_date: date) -> List[str]:
+    """Partitions mensuelles couvrant une période (celles que lit une requête élaguée)"""
+    names = []
+    month = add_months(start_date, 0)
+    while month <= end_date:
+        names.append(partition_name(month))
+        month = add_months(month, 1)
+    return names
+
+
+def is_partitioned(connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+    ), {"table": PARTITIONED_TABLE}).first() is not None
+
+
+def ensure_partitions(engine, months_ahead: int = 3, months_behind: int = 1, today: date = None) -> List[str]:
+    """Crée les partitions mensuelles manquantes autour du mois courant.
+
+    Sans effet (liste vide) si la table n'est pas partitionnée, SQLite compris.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    today = today or date.today()
+    created = []
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            return created
+
+        existing = {name for (name,) in connection.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ), {"table": PARTITIONED_TABLE})}
+
+        for offset in range(-months_behind, months_ahead + 1):
+            month = add_months(today, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            start, end = month_bounds(month)
+            try:
+                with connection.begin_nested():
+                    connection.execute(text(
+                        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARTITIONED_TABLE} '
+                        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                    ))
+                created.append(name)
+            except Exception as e:
+                # Typiquement : des lignes de ce mois sont déjà dans la partition par défaut
+                logger.warning("Partition %s non créée : %s", name, e)
+
+    if created:
+        logger.info("Partitions créées : %s", ", ".join(created))
+    return created
@@ -1,5 +1,4 @@
 # app/utils/qrcode.py
-import qrcode
 from io import BytesIO
 import base64
 import secrets
@@ -15,7 +14,7 @@ def generate_qr_code_data(employee_id: int) -> str:
 def verify_qr_code(qr_data: str, employee_id: int) -> bool:
     """Vérifie si le QR code est valide pour un employé spécifique"""
     try:
-        parts = qr_data.split(":")
+        parts = qr_data.split(":", 2)  # L'expiration ISO contient elle-même des ":"
         if len(parts) != 3:
             return False
             
@@ -47,11 +46,16 @@ def generate_global_qr_code_data(qr_type: str) -> str:
 def verify_global_qr_code(qr_data: str, qr_type: str) -> bool:
     """Vérifie si le QR code partagé est valide"""
     try:
-        parts = qr_data.split(":")
-        if len(parts) != 4:
+        parts = qr_data.split(":", 2)  # Les deux dates ISO contiennent elles-mêmes des ":"
+        if len(parts) != 3:
             return False
             
-        stored_type, token, valid_from_str, valid_to_str = parts
+        stored_type, token, validity = parts
+        # Dates locales sans fuseau (HH:MM:SS) : deux ":" chacune, séparées par le 3e
+        pieces = validity.split(":")
+        if len(pieces) != 6:
+            return False
+        valid_from_str, valid_to_str = ":".join(pieces[:3]), ":".join(pieces[3:])
         if stored_type != qr_type:
             return False
             
@@ -68,6 +72,8 @@ def verify_global_qr_code(qr_data: str, qr_type: str) -> bool:
 
 def create_qr_code_image(qr_data: str) -> str:
     """Crée une image QR code et retourne en base64"""
+    import qrcode  # Chargé (avec PIL) à la première image générée
+    
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
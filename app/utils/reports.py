@@ -1,35 +1,52 @@
 # app/utils/reports.py
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, mm
+# ReportLab est importé par _reportlab() au premier rapport : la bibliothèque
+# n'est pas chargée au démarrage des workers.
+from functools import lru_cache
 from io import BytesIO
 from datetime import datetime
+from types import SimpleNamespace
 from typing import List, Dict
-import pandas as pd
+from app.utils.metrics import timed, PDF_RENDER_LATENCY
 
+@lru_cache(maxsize=None)
+def _reportlab() -> SimpleNamespace:
+    """Modules ReportLab utilisés par les rapports, importés une seule fois à la demande"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    return SimpleNamespace(
+        colors=colors, A4=A4, getSampleStyleSheet=getSampleStyleSheet, inch=inch,
+        SimpleDocTemplate=SimpleDocTemplate, Table=Table, TableStyle=TableStyle,
+        Paragraph=Paragraph, Spacer=Spacer
+    )
+
+@timed(PDF_RENDER_LATENCY, report="employees")
 def generate_employees_report_pdf(employees_data: List[Dict], start_date: str, end_date: str) -> BytesIO:
     """Génère un PDF avec la liste des employés et leurs statistiques"""
+    rl = _reportlab()
+    
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc = rl.SimpleDocTemplate(buffer, pagesize=rl.A4)
     
-    styles = getSampleStyleSheet()
+    styles = rl.getSampleStyleSheet()
     elements = []
     
     # Titre
-    title = Paragraph("RAPPORT DES EMPLOYÉS", styles['Title'])
+    title = rl.Paragraph("RAPPORT DES EMPLOYÉS", styles['Title'])
     elements.append(title)
     
     # Période
-    period_text = Paragraph(f"Période: {start_date} au {end_date}", styles['Normal'])
+    period_text = rl.Paragraph(f"Période: {start_date} au {end_date}", styles['Normal'])
     elements.append(period_text)
     
     # Date de génération
-    gen_date = Paragraph(f"Généré le: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal'])
+    gen_date = rl.Paragraph(f"Généré le: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal'])
     elements.append(gen_date)
     
-    elements.append(Spacer(1, 20))
+    elements.append(rl.Spacer(1, 20))
     
     # Tableau des employés
     if employees_data:
@@ -49,43 +66,46 @@ def generate_employees_report_pdf(employees_data: List[Dict], start_date: str, e
                 str(stats.get('worked_hours', 0))
             ])
         
-        table = Table(table_data, colWidths=[0.5*inch, 1*inch, 1*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        table = rl.Table(table_data, colWidths=[0.5*rl.inch, 1*rl.inch, 1*rl.inch, 0.8*rl.inch, 0.8*rl.inch, 0.8*rl.inch, 0.8*rl.inch])
+        table.setStyle(rl.TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl.colors.HexColor('#2c3e50')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl.colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, 0), 9),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+            ('BACKGROUND', (0, 1), (-1, -1), rl.colors.HexColor('#ecf0f1')),
+            ('GRID', (0, 0), (-1, -1), 1, rl.colors.HexColor('#bdc3c7')),
             ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9f9f9')]),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [rl.colors.white, rl.colors.HexColor('#f9f9f9')]),
         ]))
         
         elements.append(table)
     else:
-        elements.append(Paragraph("Aucun employé trouvé.", styles['Normal']))
+        elements.append(rl.Paragraph("Aucun employé trouvé.", styles['Normal']))
     
     doc.build(elements)
     buffer.seek(0)
     return buffer
 
+@timed(PDF_RENDER_LATENCY, report="attendance")
 def generate_attendance_report_pdf(attendance_data: List[Dict], employee_name: str = None) -> BytesIO:
     """Génère un PDF avec les pointages"""
+    rl = _reportlab()
+    
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc = rl.SimpleDocTemplate(buffer, pagesize=rl.A4)
     
-    styles = getSampleStyleSheet()
+    styles = rl.getSampleStyleSheet()
     elements = []
     
     # Titre
     title = "RAPPORT DES POINTAGES"
     if employee_name:
         title += f" - {employee_name}"
-    elements.append(Paragraph(title, styles['Title']))
+    elements.append(rl.Paragraph(title, styles['Title']))
     
-    elements.append(Spacer(1, 20))
+    elements.append(rl.Spacer(1, 20))
     
     # Tableau des pointages
     if attendance_data:
@@ -101,37 +121,40 @@ def generate_attendance_report_pdf(attendance_data: List[Dict], employee_name: s
                 get_attendance_status(att)
             ])
         
-        table = Table(table_data, colWidths=[1*inch, 1*inch, 1*inch, 1*inch, 1*inch, 1*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        table = rl.Table(table_data, colWidths=[1*rl.inch, 1*rl.inch, 1*rl.inch, 1*rl.inch, 1*rl.inch, 1*rl.inch])
+        table.setStyle(rl.TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl.colors.HexColor('#2c3e50')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl.colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, 0), 8),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+            ('BACKGROUND', (0, 1), (-1, -1), rl.colors.HexColor('#ecf0f1')),
+            ('GRID', (0, 0), (-1, -1), 1, rl.colors.HexColor('#bdc3c7')),
             ('FONTSIZE', (0, 1), (-1, -1), 7),
         ]))
         
         elements.append(table)
     else:
-        elements.append(Paragraph("Aucun pointage trouvé.", styles['Normal']))
+        elements.append(rl.Paragraph("Aucun pointage trouvé.", styles['Normal']))
     
     doc.build(elements)
     buffer.seek(0)
     return buffer
 
+@timed(PDF_RENDER_LATENCY, report="leaves")
 def generate_leaves_report_pdf(leaves_data: List[Dict]) -> BytesIO:
     """Génère un PDF avec la liste des congés"""
+    rl = _reportlab()
+    
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc = rl.SimpleDocTemplate(buffer, pagesize=rl.A4)
     
-    styles = getSampleStyleSheet()
+    styles = rl.getSampleStyleSheet()
     elements = []
     
-    elements.append(Paragraph("RAPPORT DES CONGÉS ET PERMISSIONS", styles['Title']))
-    elements.append(Spacer(1, 20))
+    elements.append(rl.Paragraph("RAPPORT DES CONGÉS ET PERMISSIONS", styles['Title']))
+    elements.append(rl.Spacer(1, 20))
     
     if leaves_data:
         table_data = [["Employé", "Type", "Début", "Fin", "Statut", "Raison"]]
@@ -146,37 +169,40 @@ def generate_leaves_report_pdf(leaves_data: List[Dict]) -> BytesIO:
                 leave.get('reason', '') or '-'
             ])
         
-        table = Table(table_data, colWidths=[1.2*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        table = rl.Table(table_data, colWidths=[1.2*rl.inch, 0.8*rl.inch, 0.8*rl.inch, 0.8*rl.inch, 0.8*rl.inch, 1.5*rl.inch])
+        table.setStyle(rl.TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), rl.colors.HexColor('#2c3e50')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), rl.colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, 0), 8),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+            ('BACKGROUND', (0, 1), (-1, -1), rl.colors.HexColor('#ecf0f1')),
+            ('GRID', (0, 0), (-1, -1), 1, rl.colors.HexColor('#bdc3c7')),
             ('FONTSIZE', (0, 1), (-1, -1), 7),
         ]))
         
         elements.append(table)
     else:
-        elements.append(Paragraph("Aucun congé trouvé.", styles['Normal']))
+        elements.append(rl.Paragraph("Aucun congé trouvé.", styles['Normal']))
     
     doc.build(elements)
     buffer.seek(0)
     return buffer
 
+@timed(PDF_RENDER_LATENCY, report="stats")
 def generate_stats_report_pdf(stats_data: Dict) -> BytesIO:
     """Génère un PDF avec les statistiques"""
+    rl = _reportlab()
+    
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc = rl.SimpleDocTemplate(buffer, pagesize=rl.A4)
     
-    styles = getSampleStyleSheet()
+    styles = rl.getSampleStyleSheet()
     elements = []
     
-    elements.append(Paragraph("RAPPORT STATISTIQUES", styles['Title']))
-    elements.append(Spacer(1, 20))
+    elements.append(rl.Paragraph("RAPPORT STATISTIQUES", styles['Title']))
+    elements.append(rl.Spacer(1, 20))
     
     # Tableau des statistiques
     table_data = [
@@ -188,16 +214,16 @@ def generate_stats_report_pdf(stats_data: Dict) -> BytesIO:
         ["Jours fériés", str(stats_data.get('holidays', 0)), "-"]
     ]
     
-    table = Table(table_data, colWidths=[2*inch, 1.5*inch, 1.5*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    table = rl.Table(table_data, colWidths=[2*rl.inch, 1.5*rl.inch, 1.5*rl.inch])
+    table.setStyle(rl.TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), rl.colors.HexColor('#2c3e50')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), rl.colors.whitesmoke),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
         ('FONTSIZE', (0, 0), (-1, 0), 10),
         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#ecf0f1')),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
+        ('BACKGROUND', (0, 1), (-1, -1), rl.colors.HexColor('#ecf0f1')),
+        ('GRID', (0, 0), (-1, -1), 1, rl.colors.HexColor('#bdc3c7')),
     ]))
     
     elements.append(table)
@@ -205,22 +231,25 @@ def generate_stats_report_pdf(stats_data: Dict) -> BytesIO:
     buffer.seek(0)
     return buffer
 
+@timed(PDF_RENDER_LATENCY, report="global_qr")
 def generate_global_qr_pdf(qr_data: str, qr_type: str) -> BytesIO:
     """Génère un PDF avec le QR code global"""
+    rl = _reportlab()
+    
     buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    doc = rl.SimpleDocTemplate(buffer, pagesize=rl.A4)
     
-    styles = getSampleStyleSheet()
+    styles = rl.getSampleStyleSheet()
     elements = []
     
     title = f"QR CODE {qr_type.upper()}"
-    elements.append(Paragraph(title, styles['Title']))
-    elements.append(Paragraph(f"Généré le: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-    elements.append(Spacer(1, 40))
+    elements.append(rl.Paragraph(title, styles['Title']))
+    elements.append(rl.Paragraph(f"Généré le: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
+    elements.append(rl.Spacer(1, 40))
     
     # Ici vous devrez ajouter la logique pour insérer l'image du QR code
     # Pour l'instant, on affiche juste les données textuelles
-    elements.append(Paragraph(f"Données QR: {qr_data}", styles['Normal']))
+    elements.append(rl.Paragraph(f"Données QR: {qr_data}", styles['Normal']))
     
     doc.build(elements)
     buffer.seek(0)
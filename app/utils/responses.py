@@ -0,0 +1,38 @@
+# app/utils/responses.py
+# Sérialisation JSON rapide : orjson pour toutes les réponses de l'API, et
+# listes renvoyées directement depuis les lignes SQL (sans objets ORM ni
+# validation Pydantic ligne par ligne).
+from decimal import Decimal
+from typing import Iterable
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Repli sur le JSONResponse standard
+    orjson = None
+
+
+def _default(value):
+    """Types qu'orjson ne sérialise pas nativement"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError
+
+
+class ORJSONResponse(JSONResponse):
+    """Réponse JSON par défaut de l'application, encodée avec orjson"""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def rows_response(rows: Iterable, **kwargs) -> ORJSONResponse:
+    """Sérialise des lignes de requête par colonnes (db.query(Model.col, ...)) telles quelles"""
+    return ORJSONResponse([row._asdict() for row in rows], **kwargs)
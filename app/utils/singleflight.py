@@ -0,0 +1,89 @@
+# app/utils/singleflight.py
+# Regroupement des calculs identiques (single-flight) : les requêtes
+# concurrentes de même clé attendent un seul calcul, exécuté dans le pool de
+# threads, et en partagent le résultat, gardé ensuite quelques secondes. La
+# clé contient les versions des tables lues (l'ETag de conditional_get) :
+# une écriture change la clé, jamais de résultat périmé après modification.
+# join_inflight est le regroupement seul, partagé avec Cache.get_or_set.
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.utils.metrics import Counter, registry
+
+SINGLEFLIGHT_CALLS = registry.register(Counter(
+    "singleflight_calls_total", "Appels regroupés : calcul, attente d'un calcul en cours, résultat en cache",
+    ("name", "outcome")
+))
+
+
+def join_inflight(inflight: Dict[Hashable, asyncio.Future], key: Hashable,
+                  start: Callable[[], Awaitable]) -> Tuple[asyncio.Future, bool]:
+    """Calcul en cours pour `key`, lancé par `start()` s'il n'y en a pas ;
+    renvoie la tâche (à attendre via asyncio.shield) et si elle vient d'être lancée"""
+    task = inflight.get(key)
+    if task is not None:
+        return task, False
+
+    def finish(done: asyncio.Future) -> None:
+        if inflight.get(key) is done:
+            del inflight[key]
+
+    # Tâche indépendante : l'annulation d'un appelant ne prive pas les autres du résultat
+    task = asyncio.ensure_future(start())
+    inflight[key] = task
+    task.add_done_callback(finish)
+    return task, True
+
+
+class SingleFlight:
+    """Un calcul par clé à la fois, résultat partagé puis conservé `ttl_s` secondes"""
+
+    instances: List["SingleFlight"] = []
+
+    def __init__(self, name: str, ttl_s: float = None, max_entries: int = 256):
+        SingleFlight.instances.append(self)
+        self.name = name
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def ttl(self) -> float:
+        return settings.result_cache_ttl_s if self.ttl_s is None else self.ttl_s
+
+    def clear(self) -> None:
+        self._inflight.clear()
+        self._results.clear()
+
+    @classmethod
+    def clear_all(cls) -> None:
+        for instance in cls.instances:
+            instance.clear()
+
+    async def do(self, key: Hashable, function: Callable, *args) -> Any:
+        cached = self._results.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            SINGLEFLIGHT_CALLS.inc(name=self.name, outcome="cached")
+            return cached[1]
+
+        task, started = join_inflight(self._inflight, key, lambda: run_in_threadpool(function, *args))
+        if started:
+            SINGLEFLIGHT_CALLS.inc(name=self.name, outcome="computed")
+            task.add_done_callback(lambda done: self._remember(key, done))
+        else:
+            SINGLEFLIGHT_CALLS.inc(name=self.name, outcome="coalesced")
+        return await asyncio.shield(task)
+
+    def _remember(self, key: Hashable, task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+        self._results[key] = (time.monotonic() + self.ttl, task.result())
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
@@ -0,0 +1,132 @@
+# app/utils/sql_profiler.py
+# Instrumentation SQL de debug : empreinte de chaque requête, en-têtes
+# X-SQL-Count / X-SQL-Time et détection des motifs N+1 (même forme de requête
+# répétée dans une seule requête HTTP). Les tests s'en servent pour borner le
+# nombre de requêtes SQL par endpoint.
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+from app.utils.metrics import Counter as MetricCounter, RequestSQLStats, current_sql_stats, registry, route_label
+
+logger = logging.getLogger("app.sql")
+
+N_PLUS_ONE_TOTAL = registry.register(MetricCounter(
+    "db_n_plus_one_total", "Motifs N+1 détectés par route", ("route",)
+))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|%s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Forme normalisée d'une requête : littéraux et listes IN (...) effacés"""
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PARAM_LIST.sub("(...)", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def n_plus_one_suspects(fingerprints: Counter, threshold: int) -> List[tuple]:
+    """Formes de requêtes exécutées au moins `threshold` fois"""
+    return [(shape, count) for shape, count in fingerprints.most_common() if count >= threshold]
+
+
+class SQLDebugMiddleware:
+    """Middleware ASGI de debug : en-têtes X-SQL-* et alerte N+1 par requête"""
+
+    def __init__(self, app, threshold: int = 10):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = current_sql_stats.get()
+        token = None
+        if stats is None:
+            stats = RequestSQLStats()
+            token = current_sql_stats.set(stats)
+        stats.statements = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-sql-count", str(stats.count).encode()))
+                headers.append((b"x-sql-time", f"{stats.duration * 1000:.2f}ms".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                current_sql_stats.reset(token)
+            route = route_label(scope)
+            fingerprints = Counter(fingerprint(statement) for statement in stats.statements)
+            for shape, count in n_plus_one_suspects(fingerprints, self.threshold):
+                N_PLUS_ONE_TOTAL.inc(route=route)
+                logger.warning("N+1 suspect sur %s %s : %d x %s", scope["method"], route, count, shape)
+
+
+class QueryRecorder:
+    """Enregistre toutes les requêtes d'un moteur, quel que soit le thread"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self.duration = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def fingerprints(self) -> Counter:
+        return Counter(fingerprint(statement) for statement in self.statements)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["recorder_started"] = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self.duration += time.perf_counter() - conn.info.pop("recorder_started", time.perf_counter())
+        self.statements.append(statement)
+
+
+@contextmanager
+def record_queries(engine):
+    recorder = QueryRecorder()
+    event.listen(engine, "before_cursor_execute", recorder._before)
+    event.listen(engine, "after_cursor_execute", recorder._after)
+    try:
+        yield recorder
+    finally:
+        event.remove(engine, "before_cursor_execute", recorder._before)
+        event.remove(engine, "after_cursor_execute", recorder._after)
+
+
+@contextmanager
+def sql_budget(engine, max_queries: int, threshold: int = None):
+    """Échoue si le bloc dépasse `max_queries` requêtes SQL ou répète une même forme.
+
+    Utilisation dans les tests :
+        with sql_budget(engine, 5):
+            client.get("/admin/employees")
+    """
+    with record_queries(engine) as recorder:
+        yield recorder
+
+    detail = "\n".join(f"  {count} x {shape}" for shape, count in recorder.fingerprints().most_common())
+    assert recorder.count <= max_queries, (
+        f"{recorder.count} requêtes SQL pour un budget de {max_queries} :\n{detail}"
+    )
+    if threshold is not None:
+        suspects = n_plus_one_suspects(recorder.fingerprints(), threshold)
+        assert not suspects, f"Motif N+1 détecté :\n{detail}"
@@ -1,67 +1,72 @@
 from sqlalchemy.orm import Session
 from datetime import date
 from app.models import Employee, Attendance, Leave, Holiday
+from app.utils.time_calculations import period_totals, stats_from_totals
+from app.utils.archive import archived_months, merge_totals, read_archived_attendance
+from app.utils.analytics import analytics_count_employees, use_analytics
+from app.utils.leave_index import leave_index
 
 def calculate_total_employees(db: Session) -> int:
     """Calcule le nombre total d'employés"""
     return db.query(Employee).count()
 
+def _count_employees(db: Session, start_date: date, end_date: date, query, condition: str, matches) -> int:
+    """Compte distinct des employés, archives comprises si la période en recoupe"""
+    if use_analytics(start_date, end_date):
+        return analytics_count_employees(start_date, end_date, condition)
+    if not archived_months(start_date, end_date):
+        return query.distinct().count()
+    employee_ids = {employee_id for (employee_id,) in query.with_entities(Employee.id).distinct()}
+    employee_ids.update(row.employee_id for row in read_archived_attendance(
+        start_date, end_date, ("employee_id", "is_absent", "is_late_morning", "is_late_afternoon")
+    ) if matches(row))
+    return len(employee_ids)
+
 def calculate_on_time_employees(db: Session, start_date: date, end_date: date) -> int:
     """Calcule le nombre d'employés à l'heure"""
-    return db.query(Employee).join(Attendance).filter(
-        Attendance.date >= start_date,
-        Attendance.date <= end_date,
+    query = db.query(Employee).join(Attendance).filter(
+        Attendance.date >= start_date.isoformat(),
+        Attendance.date <= end_date.isoformat(),
         Attendance.is_late_morning == False,
         Attendance.is_late_afternoon == False,
         Attendance.is_absent == False
-    ).distinct().count()
+    )
+    return _count_employees(db, start_date, end_date, query, "on_time", lambda row: not (
+        row.is_late_morning or row.is_late_afternoon or row.is_absent
+    ))
 
 def calculate_late_employees(db: Session, start_date: date, end_date: date) -> int:
     """Calcule le nombre d'employés en retard"""
-    return db.query(Employee).join(Attendance).filter(
-        Attendance.date >= start_date,
-        Attendance.date <= end_date,
+    query = db.query(Employee).join(Attendance).filter(
+        Attendance.date >= start_date.isoformat(),
+        Attendance.date <= end_date.isoformat(),
         (Attendance.is_late_morning == True) | (Attendance.is_late_afternoon == True)
-    ).distinct().count()
+    )
+    return _count_employees(db, start_date, end_date, query, "late", lambda row: row.is_late_morning or row.is_late_afternoon)
 
 def calculate_total_leaves(db: Session, start_date: date, end_date: date) -> int:
     """Calcule le nombre total de congés"""
     return db.query(Leave).filter(
-        Leave.start_date <= end_date,
-        Leave.end_date >= start_date
+        Leave.start_date <= end_date.isoformat(),
+        Leave.end_date >= start_date.isoformat()
     ).count()
 
 def calculate_holidays(db: Session, start_date: date, end_date: date) -> int:
     """Calcule le nombre de jours fériés"""
     return db.query(Holiday).filter(
-        Holiday.date >= start_date,
-        Holiday.date <= end_date
+        Holiday.date >= start_date.isoformat(),
+        Holiday.date <= end_date.isoformat()
     ).count()
 
 def calculate_employee_stats(db: Session, employee_id: int, start_date: date, end_date: date) -> dict:
     """Calcule les statistiques pour un employé spécifique"""
-    attendances = db.query(Attendance).filter(
-        Attendance.employee_id == employee_id,
-        Attendance.date >= start_date,
-        Attendance.date <= end_date
-    ).all()
-    
-    present_days = sum(1 for a in attendances if not a.is_absent)
-    late_days = sum(1 for a in attendances if a.is_late_morning or a.is_late_afternoon)
-    absent_days = sum(1 for a in attendances if a.is_absent)
-    
-    worked_hours = sum(
-        (a.morning_departure - a.morning_arrival).total_seconds() / 3600 +
-        (a.afternoon_departure - a.afternoon_arrival).total_seconds() / 3600
-        for a in attendances 
-        if a.morning_arrival and a.morning_departure and a.afternoon_arrival and a.afternoon_departure
-    )
+    totals = period_totals(db, start_date, end_date, [employee_id]).get(employee_id) or merge_totals()
     
     return {
-        "present_days": present_days,
-        "late_days": late_days,
-        "absent_days": absent_days,
-        "worked_hours": round(worked_hours, 2)
+        "present_days": totals.present_days or 0,
+        "late_days": totals.late_days or 0,
+        "absent_days": totals.absent_days or 0,
+        "worked_hours": round((totals.worked_minutes or 0) / 60, 2)
     }
 def calculate_worked_hours(attendances: list) -> float:
     total = 0
@@ -70,4 +75,54 @@ def calculate_worked_hours(attendances: list) -> float:
             total += (a.morning_departure - a.morning_arrival).total_seconds() / 3600
         if a.afternoon_arrival and a.afternoon_departure:
             total += (a.afternoon_departure - a.afternoon_arrival).total_seconds() / 3600
-    return round(total, 2)
\ No newline at end of file
+    return round(total, 2)
+
+def _service_totals(service, members, totals: dict, on_leave: set) -> dict:
+    """Cumul d'un service à partir des agrégats par employé"""
+    merged = merge_totals(*(totals.get(member.id) for member in members))
+    return {
+        "service": service,
+        "employees": sum(1 for member in members if member.is_active),
+        "on_leave_employees": sum(1 for member in members if member.id in on_leave),
+        **stats_from_totals(merged)
+    }
+
+def calculate_service_stats(db: Session, directory, start_date: date, end_date: date) -> list:
+    """Statistiques par service : une requête groupée par employé, cumulée par service en mémoire"""
+    totals = period_totals(db, start_date, end_date)
+    leave_index.ensure_loaded(db)
+    on_leave = leave_index.employees_on_leave(start_date, end_date)
+    
+    groups = list(directory.by_service.items())
+    unassigned = [record for record in directory.records if not record.service]
+    if unassigned:
+        groups.append((None, unassigned))
+    return [_service_totals(service, members, totals, on_leave) for service, members in groups]
+
+def calculate_service_breakdown(db: Session, directory, service: str, start_date: date, end_date: date):
+    """Détail par employé d'un seul service (None si le service est inconnu)"""
+    members = directory.by_service.get(service)
+    if not members:
+        return None
+    
+    # Seuls les pointages des employés du service sont lus
+    employee_ids = [member.id for member in members]
+    totals = period_totals(db, start_date, end_date, employee_ids)
+    leave_index.ensure_loaded(db)
+    on_leave = leave_index.employees_on_leave(start_date, end_date, employee_ids)
+    
+    return {
+        "service": _service_totals(service, members, totals, on_leave),
+        "employees": [
+            {
+                "id": member.id,
+                "first_name": member.first_name,
+                "last_name": member.last_name,
+                "matricule": member.matricule,
+                "is_active": member.is_active,
+                "on_leave": member.id in on_leave,
+                "stats": stats_from_totals(totals.get(member.id) or merge_totals())
+            }
+            for member in members
+        ]
+    }
@@ -2,8 +2,12 @@
 from datetime import datetime, time, timedelta, date
 from dateutil import rrule
 from typing import Dict, List, Tuple
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
+from app.utils.analytics import analytics_totals, use_analytics
+from app.utils.archive import archived_totals, merge_totals
+
 WORK_HOURS_PER_DAY = 8
 WORK_HOURS_PER_WEEK = 40
 WORK_HOURS_PER_MONTH = 160
@@ -15,50 +19,27 @@ AFTERNOON_START = time(14, 30)
 
 def calculate_working_hours(attendance_records: List[Dict]) -> Dict:
     """Calcule les heures de travail avec les retards et absences"""
-    total_seconds = 0
-    late_minutes = 0
-    absent_days = 0
-    
-    for record in attendance_records:
-        if record["is_holiday"] or record["is_on_leave"]:
-            continue
-            
-        if record["is_absent"]:
-            absent_days += 1
-            continue
-            
-        # Calcul du temps de travail le matin
-        if record["morning_arrival"] and record["morning_departure"]:
-            arrival = datetime.strptime(record["morning_arrival"], "%Y-%m-%d %H:%M:%S")
-            departure = datetime.strptime(record["morning_departure"], "%Y-%m-%d %H:%M:%S")
-            total_seconds += (departure - arrival).total_seconds()
-            
-            # Vérifier retard matin
-            if arrival.time() > MORNING_START:
-                late_minutes += (arrival.time().hour - MORNING_START.hour) * 60
-                late_minutes += arrival.time().minute - MORNING_START.minute
-                
-        # Calcul du temps de travail l'après-midi
-        if record["afternoon_arrival"] and record["afternoon_departure"]:
-            arrival = datetime.strptime(record["afternoon_arrival"], "%Y-%m-%d %H:%M:%S")
-            departure = datetime.strptime(record["afternoon_departure"], "%Y-%m-%d %H:%M:%S")
-            total_seconds += (departure - arrival).total_seconds()
-            
-            # Vérifier retard après-midi
-            if arrival.time() > AFTERNOON_START:
-                late_minutes += (arrival.time().hour - AFTERNOON_START.hour) * 60
-                late_minutes += arrival.time().minute - AFTERNOON_START.minute
-                
-    total_hours = total_seconds / 3600
-    penalty_hours = calculate_penalty(absent_days, late_minutes)
+    from app.utils.timesheet import timesheet_from_rows, compute_timesheet_stats
+
+    return compute_timesheet_stats(timesheet_from_rows(attendance_records))
+
+def late_minutes(arrival: datetime, start: time) -> int:
+    """Minutes de retard d'une arrivée par rapport à l'heure de début (secondes ignorées)"""
+    if not arrival or arrival.time() <= start:
+        return 0
+    return (arrival.hour - start.hour) * 60 + arrival.minute - start.minute
+
+def compute_attendance_metrics(attendance) -> None:
+    """Renseigne les colonnes calculées d'un pointage (durée travaillée et retards)"""
+    worked_seconds = 0
+    if attendance.morning_arrival and attendance.morning_departure:
+        worked_seconds += (attendance.morning_departure - attendance.morning_arrival).total_seconds()
+    if attendance.afternoon_arrival and attendance.afternoon_departure:
+        worked_seconds += (attendance.afternoon_departure - attendance.afternoon_arrival).total_seconds()
     
-    return {
-        "total_hours": round(total_hours, 2),
-        "late_minutes": late_minutes,
-        "absent_days": absent_days,
-        "penalty_hours": penalty_hours,
-        "effective_hours": round(total_hours - penalty_hours, 2)
-    }
+    attendance.worked_minutes = int(worked_seconds // 60)
+    attendance.late_minutes_morning = late_minutes(attendance.morning_arrival, MORNING_START)
+    attendance.late_minutes_afternoon = late_minutes(attendance.afternoon_arrival, AFTERNOON_START)
 
 def calculate_penalty(absent_days: int, late_minutes: int) -> float:
     """Calcule les heures de pénalité"""
@@ -102,26 +83,25 @@ def get_time_periods(period_type: str, custom_start: date = None, custom_end: da
     else:
         raise ValueError("Période invalide")
 
-def calculate_employee_stats(db: Session, employee_id: int, start_date: date, end_date: date) -> dict:
-    """Calcule les statistiques pour un employé spécifique"""
+def attendance_totals_columns():
+    """Agrégats SQL d'un ensemble de pointages, calculés à partir des colonnes pré-calculées"""
     from app.models.attendance import Attendance
     
-    attendances = db.query(Attendance).filter(
-        Attendance.employee_id == employee_id,
-        Attendance.date >= start_date.isoformat(),
-        Attendance.date <= end_date.isoformat()
-    ).all()
-    
-    present_days = sum(1 for a in attendances if not a.is_absent)
-    late_days = sum(1 for a in attendances if a.is_late_morning or a.is_late_afternoon)
-    absent_days = sum(1 for a in attendances if a.is_absent)
-    
-    worked_hours = 0
-    for a in attendances:
-        if a.morning_arrival and a.morning_departure:
-            worked_hours += (a.morning_departure - a.morning_arrival).total_seconds() / 3600
-        if a.afternoon_arrival and a.afternoon_departure:
-            worked_hours += (a.afternoon_departure - a.afternoon_arrival).total_seconds() / 3600
+    absent = func.sum(case((Attendance.is_absent == True, 1), else_=0))
+    return (
+        (func.count(Attendance.id) - absent).label("present_days"),
+        func.sum(case(((Attendance.is_late_morning == True) | (Attendance.is_late_afternoon == True), 1), else_=0)).label("late_days"),
+        absent.label("absent_days"),
+        func.sum(func.coalesce(Attendance.worked_minutes, 0)).label("worked_minutes"),
+        func.sum(
+            func.coalesce(Attendance.late_minutes_morning, 0) + func.coalesce(Attendance.late_minutes_afternoon, 0)
+        ).label("late_minutes"),
+    )
+
+def stats_from_totals(totals) -> dict:
+    present_days = totals.present_days or 0
+    late_days = totals.late_days or 0
+    absent_days = totals.absent_days or 0
     
     # Calcul simplifié des pénalités
     penalty_hours = absent_days * 8 + late_days * 0.5  # 8h par jour absent, 0.5h par retard
@@ -130,6 +110,52 @@ def calculate_employee_stats(db: Session, employee_id: int, start_date: date, en
         "present_days": present_days,
         "late_days": late_days,
         "absent_days": absent_days,
-        "worked_hours": round(worked_hours, 2),
+        "worked_hours": round((totals.worked_minutes or 0) / 60, 2),
+        "late_minutes": totals.late_minutes or 0,
         "penalty_hours": round(penalty_hours, 2)
-    }
\ No newline at end of file
+    }
+
+def period_totals(db: Session, start_date: date, end_date: date, employee_ids: List[int] = None) -> Dict[int, object]:
+    """Agrégats de pointage par employé sur une période, archives comprises.
+    
+    Les longues périodes passent par le moteur analytique (DuckDB) s'il est
+    activé : le calcul se fait hors de la base transactionnelle.
+    """
+    from app.models.attendance import Attendance
+    
+    if use_analytics(start_date, end_date):
+        return analytics_totals(start_date, end_date, employee_ids)
+    
+    query = db.query(Attendance.employee_id, *attendance_totals_columns()).filter(
+        Attendance.date >= start_date.isoformat(),
+        Attendance.date <= end_date.isoformat()
+    )
+    if employee_ids is not None:
+        query = query.filter(Attendance.employee_id.in_(employee_ids))
+    
+    totals = {row.employee_id: row for row in query.group_by(Attendance.employee_id).all()}
+    # Mois archivés de la période (aucun fichier lu pour une période récente)
+    for employee_id, archived in archived_totals(start_date, end_date, employee_ids).items():
+        totals[employee_id] = merge_totals(totals.get(employee_id), archived)
+    return totals
+
+def calculate_employee_stats(db: Session, employee_id: int, start_date: date, end_date: date) -> dict:
+    """Calcule les statistiques pour un employé spécifique"""
+    totals = period_totals(db, start_date, end_date, [employee_id]).get(employee_id)
+    return stats_from_totals(totals or merge_totals())
+
+def calculate_employees_stats(db: Session, start_date: date, end_date: date, employee_ids: List[int] = None) -> Dict[int, dict]:
+    """Calcule les statistiques de tous les employés en une seule requête groupée"""
+    totals = period_totals(db, start_date, end_date, employee_ids)
+    return {employee_id: stats_from_totals(row) for employee_id, row in totals.items()}
+
+def empty_employee_stats() -> dict:
+    """Statistiques d'un employé sans pointage (nouveau dict à chaque appel : modifiable sans risque)"""
+    return {
+        "present_days": 0,
+        "late_days": 0,
+        "absent_days": 0,
+        "worked_hours": 0,
+        "late_minutes": 0,
+        "penalty_hours": 0
+    }
@@ -0,0 +1,119 @@
+# app/utils/timesheet.py
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.utils.time_calculations import calculate_penalty, MORNING_START, AFTERNOON_START
+
+TIMESTAMP_COLUMNS = (
+    "morning_arrival",
+    "morning_departure",
+    "afternoon_arrival",
+    "afternoon_departure",
+)
+FLAG_COLUMNS = ("is_holiday", "is_on_leave", "is_absent")
+
+
+@dataclass
+class Timesheet:
+    """Pointages d'une période chargés en tableaux typés (une ligne par jour)"""
+    morning_arrival: np.ndarray
+    morning_departure: np.ndarray
+    afternoon_arrival: np.ndarray
+    afternoon_departure: np.ndarray
+    is_holiday: np.ndarray
+    is_on_leave: np.ndarray
+    is_absent: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.is_absent)
+
+
+def _timestamps(values: Sequence) -> np.ndarray:
+    # None devient NaT ; les chaînes "YYYY-MM-DD HH:MM:SS" sont acceptées
+    return np.asarray(values, dtype="datetime64[s]")
+
+
+def _flags(values: Sequence) -> np.ndarray:
+    # None (colonne nullable) devient False
+    return np.asarray(values, dtype=bool)
+
+
+def timesheet_from_columns(columns: Dict[str, Sequence]) -> Timesheet:
+    """Construit un Timesheet à partir de colonnes (listes ou tableaux)"""
+    return Timesheet(
+        **{name: _timestamps(columns[name]) for name in TIMESTAMP_COLUMNS},
+        **{name: _flags(columns[name]) for name in FLAG_COLUMNS},
+    )
+
+
+def timesheet_from_rows(rows: Iterable) -> Timesheet:
+    """Construit un Timesheet à partir de dicts ou d'objets Attendance"""
+    names = TIMESTAMP_COLUMNS + FLAG_COLUMNS
+    columns = {name: [] for name in names}
+    for row in rows:
+        get = row.get if isinstance(row, dict) else lambda name: getattr(row, name)
+        for name in names:
+            columns[name].append(get(name))
+    return timesheet_from_columns(columns)
+
+
+def load_timesheet(db: Session, employee_id: int, start_date: date, end_date: date) -> Timesheet:
+    """Charge uniquement les colonnes utiles au calcul, sans instancier d'objets ORM"""
+    from app.utils.archive import load_attendance
+
+    # Table et mois archivés de la période
+    rows = load_attendance(db, start_date, end_date, TIMESTAMP_COLUMNS + FLAG_COLUMNS, [employee_id])
+
+    columns = dict(zip(TIMESTAMP_COLUMNS + FLAG_COLUMNS, zip(*rows))) if rows else {
+        name: () for name in TIMESTAMP_COLUMNS + FLAG_COLUMNS
+    }
+    return timesheet_from_columns(columns)
+
+
+def _late_minutes(arrivals: np.ndarray, start: time) -> np.ndarray:
+    """Minutes de retard (secondes ignorées), 0 si à l'heure ou non pointé"""
+    minute_of_day = arrivals.view(np.int64) % 86400 // 60
+    late = minute_of_day - (start.hour * 60 + start.minute)
+    return np.where(np.isnat(arrivals), 0, np.maximum(late, 0))
+
+
+def _worked_seconds(arrivals: np.ndarray, departures: np.ndarray) -> np.ndarray:
+    complete = ~(np.isnat(arrivals) | np.isnat(departures))
+    return np.where(complete, departures.view(np.int64) - arrivals.view(np.int64), 0)
+
+
+def compute_timesheet_stats(timesheet: Timesheet) -> Dict:
+    """Heures travaillées, retards, absences et pénalités calculés en vectoriel"""
+    # Jours fériés et congés ne comptent ni comme travail ni comme absence
+    counted = ~(timesheet.is_holiday | timesheet.is_on_leave)
+    absent = counted & timesheet.is_absent
+    worked = counted & ~timesheet.is_absent
+
+    total_seconds = int((
+        _worked_seconds(timesheet.morning_arrival, timesheet.morning_departure) +
+        _worked_seconds(timesheet.afternoon_arrival, timesheet.afternoon_departure)
+    )[worked].sum())
+
+    # Comme pour le temps de travail, le retard n'est compté que si la demi-journée est complète
+    morning_complete = ~(np.isnat(timesheet.morning_arrival) | np.isnat(timesheet.morning_departure))
+    afternoon_complete = ~(np.isnat(timesheet.afternoon_arrival) | np.isnat(timesheet.afternoon_departure))
+    late_minutes = int(
+        _late_minutes(timesheet.morning_arrival, MORNING_START)[worked & morning_complete].sum() +
+        _late_minutes(timesheet.afternoon_arrival, AFTERNOON_START)[worked & afternoon_complete].sum()
+    )
+
+    absent_days = int(absent.sum())
+    total_hours = total_seconds / 3600
+    penalty_hours = calculate_penalty(absent_days, late_minutes)
+
+    return {
+        "total_hours": round(total_hours, 2),
+        "late_minutes": late_minutes,
+        "absent_days": absent_days,
+        "penalty_hours": penalty_hours,
+        "effective_hours": round(total_hours - penalty_hours, 2)
+    }
@@ -0,0 +1,98 @@
+# app/utils/trends.py
+# Tendance des pointages agrégée côté serveur : une seule requête groupée par
+# tranche (jour, semaine ou mois) au lieu d'une requête par jour. La colonne
+# date étant une chaîne YYYY-MM-DD, la troncature s'écrit selon le dialecte ;
+# chaque tranche est identifiée par son premier jour (lundi pour une semaine).
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Date, String, case, cast, func
+from sqlalchemy.orm import Session
+
+from app.utils.archive import archived_months, read_archived_attendance
+from app.utils.partitions import add_months
+
+BUCKETS = ("day", "week", "month")
+
+
+def choose_bucket(days: int) -> str:
+    """Tranche automatique : quelques dizaines de points, jamais un par jour sur un an"""
+    if days <= 62:
+        return "day"
+    if days <= 366:
+        return "week"
+    return "month"
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucket_column(column, bucket: str, dialect: str):
+    """Premier jour de la tranche, au format YYYY-MM-DD, calculé par la base"""
+    if bucket == "month":
+        return func.substr(column, 1, 7, type_=String) + "-01"
+    if bucket == "week":
+        if dialect == "postgresql":
+            return func.to_char(func.date_trunc("week", cast(column, Date)), "YYYY-MM-DD")
+        # SQLite : lundi de la semaine = premier lundi à partir de J-6
+        return func.date(column, "-6 days", "weekday 1")
+    return column
+
+
+def _empty_buckets(start_date: date, end_date: date, bucket: str) -> Dict[str, Dict[str, int]]:
+    points = {}
+    current = bucket_start(start_date, bucket)
+    while current <= end_date:
+        points[current.isoformat()] = {"present": 0, "late": 0, "absent": 0}
+        if bucket == "month":
+            current = add_months(current, 1)
+        else:
+            current += timedelta(days=7 if bucket == "week" else 1)
+    return points
+
+
+def attendance_trend(db: Session, start_date: date, end_date: date, bucket: str,
+                     employee_ids: Optional[Iterable[int]] = None) -> List[dict]:
+    """Présents, retards et absents par tranche, tranches vides comprises"""
+    from app.models.attendance import Attendance
+
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+    points = _empty_buckets(start_date, end_date, bucket)
+
+    key = bucket_column(Attendance.date, bucket, db.get_bind().dialect.name).label("bucket")
+    late = (Attendance.is_late_morning == True) | (Attendance.is_late_afternoon == True)
+    query = db.query(
+        key,
+        func.sum(case((Attendance.is_absent == True, 0), else_=1)).label("present"),
+        func.sum(case((late, 1), else_=0)).label("late"),
+        func.sum(case((Attendance.is_absent == True, 1), else_=0)).label("absent")
+    ).filter(
+        Attendance.date >= start_date.isoformat(),
+        Attendance.date <= end_date.isoformat()
+    )
+    if employee_ids is not None:
+        query = query.filter(Attendance.employee_id.in_(employee_ids))
+
+    for row in query.group_by(key):
+        point = points.setdefault(row.bucket, {"present": 0, "late": 0, "absent": 0})
+        point["present"] += row.present or 0
+        point["late"] += row.late or 0
+        point["absent"] += row.absent or 0
+
+    # Mois archivés de la période (aucun fichier lu pour une période récente)
+    if archived_months(start_date, end_date):
+        for row in read_archived_attendance(
+            start_date, end_date, ("date", "is_absent", "is_late_morning", "is_late_afternoon"), employee_ids
+        ):
+            day = row.date if isinstance(row.date, date) else date.fromisoformat(row.date)
+            point = points.setdefault(bucket_start(day, bucket).isoformat(), {"present": 0, "late": 0, "absent": 0})
+            point["absent" if row.is_absent else "present"] += 1
+            point["late"] += 1 if (row.is_late_morning or row.is_late_afternoon) else 0
+
+    return [{"date": start, **counts} for start, counts in sorted(points.items())]
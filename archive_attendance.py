@@ -0,0 +1,44 @@
+# archive_attendance.py
+"""Archive les pointages plus anciens que l'horizon dans des fichiers Parquet mensuels.
+
+Usage : python archive_attendance.py [--before AAAA-MM-JJ]
+
+Les fichiers sont écrits dans ATTENDANCE_ARCHIVE_DIR (variable d'environnement
+ou .env, défaut ./archive/attendance), le répertoire que lisent les
+statistiques, les exports et le moteur analytique.
+
+À lancer périodiquement (cron, une fois par mois suffit). Par défaut, tout ce
+qui précède les ATTENDANCE_HOT_MONTHS derniers mois quitte la table.
+"""
+import argparse
+import sys
+from datetime import date
+
+sys.path.append('.')
+
+from app.database import SessionLocal
+from app.utils.archive import archive_attendance, archive_directory, archive_horizon
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--before", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    before = args.before or archive_horizon()
+    db = SessionLocal()
+    try:
+        archived = archive_attendance(db, before)
+    finally:
+        db.close()
+
+    if not archived:
+        print(f"Aucun pointage antérieur au {before.isoformat()} à archiver")
+        return
+    for month, count in archived.items():
+        print(f"{month} : {count} pointages archivés")
+    print(f"✅ {sum(archived.values())} pointages déplacés vers {archive_directory()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/bench_compression.py
+"""Octets sur le réseau et coût CPU de la compression, endpoint par endpoint.
+
+Usage : python benchmarks/bench_compression.py [--employees 1000] [--json resultats.json]
+
+Pour chaque endpoint, le corps non compressé est compressé en gzip (niveaux 1,
+6 et 9) et en brotli (si installé), et la réponse réelle du middleware est
+vérifiée avec Accept-Encoding.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+from datetime import date
+
+sys.path.append('.')
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import get_db
+from app.main import app
+from app.models import Employee
+from app.utils.auth import create_access_token
+from app.utils.compression import SKIPPED_CONTENT_TYPES, brotli
+from datagen import generate_workforce
+
+ENDPOINTS = [
+    "/employees/",
+    "/admin/employees",
+    "/admin/leaves?period=year",
+    "/activity/recent?limit=500",
+    "/stats/dashboard",
+    "/employees/export/pdf",
+    "/employees/export/excel",
+]
+
+
+def _timed(function, data: bytes, repeat: int = 5):
+    best, output = float("inf"), b""
+    for _ in range(repeat):
+        started = time.process_time()
+        output = function(data)
+        best = min(best, time.process_time() - started)
+    return len(output), best
+
+
+def _gzip(level):
+    return lambda data: zlib.compress(data, level)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--json")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'compression.db')}", connect_args={"check_same_thread": False})
+    generate_workforce(engine, employees=args.employees, years=0.25)
+    Session = sessionmaker(bind=engine)
+
+    db = Session()
+    db.add(Employee(
+        first_name="Admin", last_name="System", email="admin@pointagepro.com", hashed_password="-",
+        service="Administration", fonction="Administrateur", matricule="ADM001",
+        date_embauche=date(2020, 1, 1), is_admin=True, is_active=True
+    ))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    token = create_access_token({"sub": "admin@pointagepro.com", "role": "admin", "is_admin": True})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    codecs = {"gzip-1": _gzip(1), "gzip-6": _gzip(6), "gzip-9": _gzip(9)}
+    if brotli is not None:
+        codecs["br-4"] = lambda data: brotli.compress(data, quality=4)
+        codecs["br-11"] = lambda data: brotli.compress(data, quality=11)
+
+    results = []
+    for url in ENDPOINTS:
+        identity = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+        body = identity.content
+        content_type = identity.headers.get("content-type", "")
+        negotiated = client.get(url, headers={**headers, "Accept-Encoding": "br, gzip"}, )
+        row = {
+            "endpoint": url,
+            "content_type": content_type.split(";")[0],
+            "raw_bytes": len(body),
+            "served_encoding": negotiated.headers.get("content-encoding", "identity"),
+            "skipped": content_type.startswith(SKIPPED_CONTENT_TYPES),
+            "codecs": {},
+        }
+        for name, codec in codecs.items():
+            size, cpu = _timed(codec, body)
+            row["codecs"][name] = {
+                "bytes": size,
+                "ratio": round(size / len(body), 3) if body else 1.0,
+                "cpu_ms": round(cpu * 1000, 2),
+            }
+        results.append(row)
+
+    print(f"{'endpoint':<32}{'type':<22}{'brut':>10}{'servi':>9}  " + "".join(f"{name:>22}" for name in codecs))
+    for row in results:
+        cells = "".join(
+            f"{row['codecs'][name]['bytes']:>10} {row['codecs'][name]['ratio']:>5.0%} {row['codecs'][name]['cpu_ms']:>4.1f}ms"
+            for name in codecs
+        )
+        print(f"{row['endpoint']:<32}{row['content_type'][:21]:<22}{row['raw_bytes']:>10}{row['served_encoding']:>9}  {cells}")
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump({"employees": args.employees, "results": results}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_endpoints.py
+"""Benchmarks des endpoints chauds sur 100, 1 000 et 10 000 employés.
+
+Usage : python -m pytest benchmarks [-k dashboard] (BENCH_SIZES=100,1000 pour réduire)
+Les résultats sont enregistrés en JSON dans .benchmarks/ (voir benchmarks/pytest.ini).
+"""
+import itertools
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from app.utils.qrcode import generate_qr_code_data
+
+# Les exports PDF/XLSX à 10 000 employés prennent plusieurs secondes : peu de tours
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", "5"))
+
+READ_ENDPOINTS = [
+    "/stats/dashboard",
+    "/admin/employees",
+    "/admin/stats",
+    "/employees/stats",
+    "/employees/export/pdf",
+    "/employees/export/excel",
+    "/admin/employees/pdf",
+    "/reports/leaves",
+    "/exports/attendance.parquet",
+    "/exports/attendance.arrow",
+    # /reports/employees et /reports/attendance/{id} appellent leurs générateurs PDF
+    # avec une signature incorrecte (TypeError, erreur 500) : à ajouter une fois corrigés
+]
+
+
+def _get(client, url, headers):
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, (url, response.status_code, response.text[:200])
+    return response
+
+
+@pytest.mark.parametrize("url", READ_ENDPOINTS)
+def test_read_endpoint(benchmark, bench_client, bench_admin_headers, url):
+    benchmark.group = url
+    benchmark.pedantic(_get, args=(bench_client, url, bench_admin_headers), rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_record_attendance(benchmark, bench_client, bench_admin_headers, workforce):
+    _, size = workforce
+    employee_ids = itertools.cycle(range(1, size + 1))
+
+    def record():
+        employee_id = next(employee_ids)
+        response = bench_client.post("/attendance/record", headers=bench_admin_headers, json={
+            "employee_id": employee_id,
+            "attendance_type": "morning_arrival",
+            "qr_data": generate_qr_code_data(employee_id)
+        })
+        assert response.status_code == 200, response.text[:200]
+
+    benchmark.group = "/attendance/record"
+    benchmark.pedantic(record, rounds=max(ROUNDS, 50), warmup_rounds=1)
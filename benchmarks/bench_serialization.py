@@ -0,0 +1,102 @@
+# benchmarks/bench_serialization.py
+"""Temps de sérialisation d'une liste de 10 000 employés : chemin historique
+(objets ORM, jsonable_encoder, json) contre lignes SQL encodées avec orjson.
+
+Usage : python -m pytest benchmarks/bench_serialization.py
+"""
+import json
+from datetime import date
+from typing import List
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Employee
+from app.utils.employee_directory import record_columns
+from app.schemas.employee import EmployeeResponse
+from app.utils.responses import ORJSONResponse, rows_response
+
+ROWS = 10_000
+
+
+@pytest.fixture(scope="module")
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Employee.__table__), [
+            {
+                "first_name": f"Prenom{i}",
+                "last_name": f"Nom{i}",
+                "email": f"employe{i}@pointagepro.com",
+                "hashed_password": "-",
+                "service": "Informatique",
+                "fonction": "Agent",
+                "matricule": f"EMP{i:05d}",
+                "date_embauche": date(2020, 1, 1),
+                "is_active": True,
+                "is_admin": False,
+            }
+            for i in range(ROWS)
+        ])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_orm_validated_json(benchmark, session):
+    """Avant : objets Employee validés par response_model puis jsonable_encoder + json"""
+    adapter = TypeAdapter(List[EmployeeResponse])
+
+    def serialize():
+        employees = session.query(Employee).all()
+        session.expunge_all()
+        content = adapter.dump_python(adapter.validate_python(employees, from_attributes=True), mode="json")
+        return json.dumps(jsonable_encoder(content)).encode()
+
+    benchmark.group = "serialization-10k"
+    assert len(json.loads(benchmark(serialize))) == ROWS
+
+
+def test_orm_pydantic_dump_json(benchmark, session):
+    """Objets Employee, validation puis encodage JSON par Pydantic (voie rapide de FastAPI)"""
+    adapter = TypeAdapter(List[EmployeeResponse])
+
+    def serialize():
+        employees = session.query(Employee).all()
+        session.expunge_all()
+        return adapter.dump_json(adapter.validate_python(employees, from_attributes=True))
+
+    benchmark.group = "serialization-10k"
+    assert len(json.loads(benchmark(serialize))) == ROWS
+
+
+def test_rows_orjson(benchmark, session):
+    """Après : lignes par colonnes sérialisées directement avec orjson"""
+    def serialize():
+        return rows_response(session.query(*record_columns())).body
+
+    benchmark.group = "serialization-10k"
+    assert len(json.loads(benchmark(serialize))) == ROWS
+
+
+def test_encode_only_orjson(benchmark, session):
+    """Encodage seul (sans la requête SQL) des 10 000 lignes"""
+    rows = [row._asdict() for row in session.query(*record_columns())]
+    benchmark.group = "serialization-10k-encode"
+    assert len(json.loads(benchmark(lambda: ORJSONResponse(rows).body))) == ROWS
+
+
+def test_encode_only_jsonable_encoder(benchmark, session):
+    rows = [row._asdict() for row in session.query(*record_columns())]
+    benchmark.group = "serialization-10k-encode"
+    assert len(json.loads(benchmark(lambda: json.dumps(jsonable_encoder(rows)).encode()))) == ROWS
@@ -0,0 +1,113 @@
+# benchmarks/bench_timesheet.py
+"""Compare la boucle historique de calculate_working_hours au moteur vectoriel.
+
+Usage : python benchmarks/bench_timesheet.py [nombre_de_lignes]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.append('.')
+
+from app.utils.time_calculations import calculate_penalty, MORNING_START, AFTERNOON_START
+from app.utils.timesheet import timesheet_from_columns, compute_timesheet_stats
+
+
+def legacy_loop(records):
+    """Boucle d'origine (sur des datetime au lieu de chaînes)"""
+    total_seconds = 0
+    late_minutes = 0
+    absent_days = 0
+    for record in records:
+        if record["is_holiday"] or record["is_on_leave"]:
+            continue
+        if record["is_absent"]:
+            absent_days += 1
+            continue
+        if record["morning_arrival"] and record["morning_departure"]:
+            arrival = record["morning_arrival"]
+            total_seconds += (record["morning_departure"] - arrival).total_seconds()
+            if arrival.time() > MORNING_START:
+                late_minutes += (arrival.time().hour - MORNING_START.hour) * 60
+                late_minutes += arrival.time().minute - MORNING_START.minute
+        if record["afternoon_arrival"] and record["afternoon_departure"]:
+            arrival = record["afternoon_arrival"]
+            total_seconds += (record["afternoon_departure"] - arrival).total_seconds()
+            if arrival.time() > AFTERNOON_START:
+                late_minutes += (arrival.time().hour - AFTERNOON_START.hour) * 60
+                late_minutes += arrival.time().minute - AFTERNOON_START.minute
+    total_hours = total_seconds / 3600
+    penalty_hours = calculate_penalty(absent_days, late_minutes)
+    return {
+        "total_hours": round(total_hours, 2),
+        "late_minutes": late_minutes,
+        "absent_days": absent_days,
+        "penalty_hours": penalty_hours,
+        "effective_hours": round(total_hours - penalty_hours, 2)
+    }
+
+
+def synthetic_columns(n: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    days = np.datetime64("2020-01-01") + np.arange(n).astype("timedelta64[D]")
+    days = days.astype("datetime64[s]")
+
+    def at(hour, minute, spread):
+        offsets = rng.normal(0, spread, n).astype(np.int64)
+        return days + np.timedelta64(hour * 3600 + minute * 60, "s") + offsets.astype("timedelta64[s]")
+
+    columns = {
+        "morning_arrival": at(8, 0, 600),
+        "morning_departure": at(12, 0, 300),
+        "afternoon_arrival": at(14, 30, 600),
+        "afternoon_departure": at(18, 0, 300),
+        "is_absent": rng.random(n) < 0.05,
+        "is_holiday": rng.random(n) < 0.03,
+        "is_on_leave": rng.random(n) < 0.04,
+    }
+    # Quelques demi-journées non pointées
+    missing = rng.random(n) < 0.02
+    columns["afternoon_departure"][missing] = np.datetime64("NaT")
+    return columns
+
+
+def to_records(columns, n):
+    def py(value):
+        return None if np.isnat(value) else value.astype(datetime)
+
+    return [
+        {
+            "morning_arrival": py(columns["morning_arrival"][i]),
+            "morning_departure": py(columns["morning_departure"][i]),
+            "afternoon_arrival": py(columns["afternoon_arrival"][i]),
+            "afternoon_departure": py(columns["afternoon_departure"][i]),
+            "is_absent": bool(columns["is_absent"][i]),
+            "is_holiday": bool(columns["is_holiday"][i]),
+            "is_on_leave": bool(columns["is_on_leave"][i]),
+        }
+        for i in range(n)
+    ]
+
+
+def main(n: int = 1_000_000):
+    columns = synthetic_columns(n)
+    records = to_records(columns, n)
+
+    started = time.perf_counter()
+    expected = legacy_loop(records)
+    loop_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = compute_timesheet_stats(timesheet_from_columns(columns))
+    vector_time = time.perf_counter() - started
+
+    assert result == expected, (result, expected)
+    print(f"{n} lignes")
+    print(f"boucle Python : {loop_time:.3f} s")
+    print(f"vectoriel     : {vector_time:.3f} s  (x{loop_time / vector_time:.1f})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,82 @@
+# benchmarks/conftest.py
+import os
+import sys
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append('.')
+
+from app.config import settings
+from app.database import get_db
+from app.main import app
+from app.models import Employee
+from app.utils.auth import create_access_token
+from app.utils.leave_index import leave_index
+from datagen import generate_workforce
+
+# Tailles d'effectif mesurées, surchargeables : BENCH_SIZES=100,1000
+SIZES = [int(size) for size in os.environ.get("BENCH_SIZES", "100,1000,10000").split(",")]
+# Historique généré par employé, en années
+YEARS = float(os.environ.get("BENCH_YEARS", "0.25"))
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}emp")
+def workforce(request, tmp_path_factory):
+    """Base SQLite fichier peuplée par datagen, partagée par tous les benchmarks d'une taille"""
+    path = tmp_path_factory.mktemp("bench") / f"workforce_{request.param}.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    generate_workforce(engine, employees=request.param, years=YEARS, end=date.today())
+    yield engine, request.param
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def bench_client(workforce):
+    engine, _ = workforce
+    BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = BenchSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    leave_index.loaded = False
+    # Mesure du coût des endpoints : ni limitation de débit, ni résultats partagés
+    settings.admission_enabled = False
+    settings.result_cache_ttl_s = 0
+    yield TestClient(app)
+    settings.admission_enabled = True
+    settings.result_cache_ttl_s = 5.0
+    app.dependency_overrides.clear()
+    leave_index.loaded = False
+
+
+@pytest.fixture(scope="session")
+def bench_admin_headers(workforce):
+    engine, _ = workforce
+    session = sessionmaker(bind=engine)()
+    admin = session.query(Employee).filter(Employee.email == "admin@pointagepro.com").first()
+    if not admin:
+        session.add(Employee(
+            first_name="Admin",
+            last_name="System",
+            email="admin@pointagepro.com",
+            hashed_password="-",
+            service="Administration",
+            fonction="Administrateur",
+            matricule="ADM001",
+            date_embauche=date(2020, 1, 1),
+            is_admin=True,
+            is_active=True
+        ))
+        session.commit()
+    session.close()
+    token = create_access_token({"sub": "admin@pointagepro.com", "role": "admin", "is_admin": True})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,211 @@
+# benchmarks/datagen.py
+"""Générateur déterministe de données de pointage réalistes.
+
+Usage : python benchmarks/datagen.py --employees 1000 --years 2 [--database-url sqlite:///./bench.db]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Set
+
+sys.path.append('.')
+
+from sqlalchemy import create_engine, insert
+
+from app.database import Base
+from app.models import Attendance, Employee, Holiday, Leave, LeaveBalance
+from app.utils.auth import get_password_hash
+from app.utils.time_calculations import late_minutes, MORNING_START, AFTERNOON_START
+
+SERVICES = (
+    "Administration", "Comptabilité", "Informatique", "Logistique",
+    "Production", "Qualité", "Ressources Humaines", "Commercial",
+)
+FONCTIONS = ("Agent", "Technicien", "Assistant", "Chef d'équipe", "Responsable")
+FIRST_NAMES = ("Awa", "Moussa", "Fatou", "Ibrahim", "Aminata", "Kader", "Mariam", "Oumar", "Salif", "Aïcha")
+LAST_NAMES = ("Traoré", "Diallo", "Koné", "Ouédraogo", "Sawadogo", "Compaoré", "Kaboré", "Zongo", "Barry", "Sanou")
+
+# (mois, jour, nom) des jours fériés fixes
+FIXED_HOLIDAYS = (
+    (1, 1, "Nouvel An"),
+    (5, 1, "Fête du Travail"),
+    (8, 15, "Assomption"),
+    (11, 1, "Toussaint"),
+    (12, 25, "Noël"),
+)
+
+ABSENCE_RATE = 0.03
+LEAVES_PER_YEAR = 2
+BATCH_SIZE = 5000
+
+# Toutes les lignes d'un même executemany doivent avoir les mêmes clés
+EMPTY_DAY = {
+    "morning_arrival": None, "morning_departure": None,
+    "afternoon_arrival": None, "afternoon_departure": None,
+    "is_late_morning": False, "is_late_afternoon": False,
+    "is_absent": False, "is_holiday": False, "is_on_leave": False,
+    "worked_minutes": 0, "late_minutes_morning": 0, "late_minutes_afternoon": 0,
+}
+
+
+def _holidays(start: date, end: date) -> List[Dict]:
+    return [
+        {"date": date(year, month, day).isoformat(), "name": name, "is_recurring": False}
+        for year in range(start.year, end.year + 1)
+        for month, day, name in FIXED_HOLIDAYS
+        if start <= date(year, month, day) <= end
+    ]
+
+
+def _at(day: date, minutes: float) -> datetime:
+    return datetime(day.year, day.month, day.day) + timedelta(seconds=int(minutes * 60))
+
+
+def _attendance_row(rng: random.Random, employee_id: int, day: date, punctuality: float) -> Dict:
+    """Une journée de pointage ; `punctuality` décale l'heure d'arrivée moyenne de l'employé"""
+    if rng.random() < ABSENCE_RATE:
+        return {**EMPTY_DAY, "employee_id": employee_id, "date": day.isoformat(), "is_absent": True}
+
+    # Arrivées autour de l'heure de début, avec une queue de retards
+    morning_arrival = _at(day, MORNING_START.hour * 60 + MORNING_START.minute + rng.gauss(punctuality, 6))
+    morning_departure = _at(day, 12 * 60 + rng.gauss(0, 5))
+    afternoon_arrival = _at(day, AFTERNOON_START.hour * 60 + AFTERNOON_START.minute + rng.gauss(punctuality / 2, 5))
+    afternoon_departure = _at(day, 18 * 60 + rng.gauss(0, 8))
+    worked = (morning_departure - morning_arrival) + (afternoon_departure - afternoon_arrival)
+
+    return {
+        "employee_id": employee_id,
+        "date": day.isoformat(),
+        "morning_arrival": morning_arrival,
+        "morning_departure": morning_departure,
+        "afternoon_arrival": afternoon_arrival,
+        "afternoon_departure": afternoon_departure,
+        "is_late_morning": morning_arrival.time() > MORNING_START,
+        "is_late_afternoon": afternoon_arrival.time() > AFTERNOON_START,
+        "is_absent": False,
+        "is_holiday": False,
+        "is_on_leave": False,
+        "worked_minutes": int(worked.total_seconds() // 60),
+        "late_minutes_morning": late_minutes(morning_arrival, MORNING_START),
+        "late_minutes_afternoon": late_minutes(afternoon_arrival, AFTERNOON_START),
+    }
+
+
+def _flush(conn, table, rows: List[Dict]) -> None:
+    if rows:
+        conn.execute(insert(table), rows)
+        rows.clear()
+
+
+def generate_workforce(engine, employees: int = 100, years: float = 1.0, seed: int = 42, end: date = None) -> Dict:
+    """Crée `employees` employés et `years` années de pointages, congés et jours fériés.
+
+    Même graine, même jeu de données. Les insertions se font par lots (executemany).
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=int(365 * years) - 1)
+    Base.metadata.create_all(bind=engine)
+
+    # Un seul hachage bcrypt partagé : le coût bcrypt n'est pas ce qu'on mesure ici
+    password_hash = get_password_hash("password123")
+    holidays = _holidays(start, end)
+    holiday_dates: Set[str] = {h["date"] for h in holidays}
+    working_days = [
+        start + timedelta(days=offset)
+        for offset in range((end - start).days + 1)
+        if (start + timedelta(days=offset)).weekday() < 5
+        and (start + timedelta(days=offset)).isoformat() not in holiday_dates
+    ]
+
+    counts = {"employees": employees, "attendance": 0, "leaves": 0, "holidays": len(holidays)}
+    with engine.begin() as conn:
+        _flush(conn, Holiday.__table__, list(holidays))
+        first_id = (conn.execute(Employee.__table__.select().with_only_columns(
+            Employee.__table__.c.id).order_by(Employee.__table__.c.id.desc()).limit(1)).scalar() or 0) + 1
+
+        employee_rows = [
+            {
+                "id": first_id + i,
+                "first_name": rng.choice(FIRST_NAMES),
+                "last_name": rng.choice(LAST_NAMES),
+                "email": f"employe{seed}.{i}@pointagepro.com",
+                "hashed_password": password_hash,
+                "service": SERVICES[i % len(SERVICES)],
+                "fonction": rng.choice(FONCTIONS),
+                "matricule": f"EMP{seed:03d}{i:06d}",
+                "date_embauche": start - timedelta(days=rng.randint(0, 3650)),
+                "is_active": rng.random() > 0.02,
+                "is_admin": False,
+            }
+            for i in range(employees)
+        ]
+        _flush(conn, Employee.__table__, employee_rows)
+
+        attendance_rows: List[Dict] = []
+        leave_rows: List[Dict] = []
+        balances: Dict[tuple, int] = {}
+        for i in range(employees):
+            employee_id = first_id + i
+            punctuality = rng.gauss(-4, 4)  # Certains arrivent toujours en avance, d'autres non
+
+            # Congés approuvés : périodes d'une à deux semaines ouvrées
+            leave_days: Set[date] = set()
+            for _ in range(max(1, int(LEAVES_PER_YEAR * years))):
+                first = rng.randrange(len(working_days))
+                period = working_days[first:first + rng.randint(5, 10)]
+                if not period or leave_days.intersection(period):
+                    continue  # Pas de congés qui se chevauchent
+                leave_days.update(period)
+                leave_rows.append({
+                    "employee_id": employee_id,
+                    "start_date": period[0].isoformat(),
+                    "end_date": period[-1].isoformat(),
+                    "leave_type": "congé",
+                    "status": "approved",
+                    "reason": "Congés annuels",
+                    "created_at": datetime.combine(period[0] - timedelta(days=30), datetime.min.time()),
+                })
+                for day in period:
+                    balances[(employee_id, day.year)] = balances.get((employee_id, day.year), 0) + 1
+
+            for day in working_days:
+                if day in leave_days:
+                    attendance_rows.append({
+                        **EMPTY_DAY, "employee_id": employee_id, "date": day.isoformat(), "is_on_leave": True
+                    })
+                else:
+                    attendance_rows.append(_attendance_row(rng, employee_id, day, punctuality))
+                if len(attendance_rows) >= BATCH_SIZE:
+                    counts["attendance"] += len(attendance_rows)
+                    _flush(conn, Attendance.__table__, attendance_rows)
+
+        counts["attendance"] += len(attendance_rows)
+        counts["leaves"] = len(leave_rows)
+        _flush(conn, Attendance.__table__, attendance_rows)
+        _flush(conn, Leave.__table__, leave_rows)
+        _flush(conn, LeaveBalance.__table__, [
+            {"employee_id": employee_id, "year": year, "entitled_days": 25, "taken_days": taken}
+            for (employee_id, year), taken in balances.items()
+        ])
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=100)
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    started = time.perf_counter()
+    counts = generate_workforce(engine, args.employees, args.years, args.seed)
+    print(f"{counts} en {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/startup_budget.py
+"""Mesure le coût de démarrage d'un worker : import de app.main, démarrage
+(lifespan : schéma + préchauffage) et mémoire résidente maximale. Chaque mesure
+se fait dans un processus neuf ; le script échoue si le budget est dépassé.
+
+Usage : python benchmarks/startup_budget.py [--runs 5] [--import-budget 1.0] [--rss-budget 90]
+
+Référence (avant imports paresseux) : ~1,2 s d'import et ~125 Mo de RSS par worker,
+pandas, numpy, ReportLab et qrcode/PIL étant chargés à l'import.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORT_BUDGET_S = 1.0
+RSS_BUDGET_MB = 90
+HEAVY_MODULES = ("pandas", "numpy", "reportlab", "qrcode", "PIL", "openpyxl")
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter() - started
+rss_import = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+heavy = sorted({name.split('.')[0] for name in sys.modules} & set(%r))
+
+from fastapi.testclient import TestClient
+started = time.perf_counter()
+with TestClient(app.main.app):
+    startup = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"import_s": imported, "startup_s": startup, "rss_import_mb": rss_import, "rss_mb": rss, "heavy": heavy}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(database_url: str) -> dict:
+    env = {**os.environ, "DATABASE_URL": database_url}
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budget de démarrage par worker")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_S, help="secondes")
+    parser.add_argument("--rss-budget", type=float, default=RSS_BUDGET_MB, help="Mo après import")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'startup.db')}"
+        runs = [measure(database_url) for _ in range(args.runs)]
+
+    import_s = statistics.median(run["import_s"] for run in runs)
+    startup_s = statistics.median(run["startup_s"] for run in runs)
+    rss_import = statistics.median(run["rss_import_mb"] for run in runs)
+    rss = statistics.median(run["rss_mb"] for run in runs)
+    heavy = runs[0]["heavy"]
+
+    print(f"import app.main : {import_s:.3f} s (budget {args.import_budget} s)")
+    print(f"démarrage       : {startup_s:.3f} s (lifespan : schéma et préchauffage)")
+    print(f"RSS après import: {rss_import:.1f} Mo (budget {args.rss_budget} Mo)")
+    print(f"RSS démarré     : {rss:.1f} Mo")
+    print(f"modules lourds  : {', '.join(heavy) or 'aucun'}")
+
+    over = import_s > args.import_budget or rss_import > args.rss_budget or heavy
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
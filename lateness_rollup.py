@@ -0,0 +1,51 @@
+# lateness_rollup.py
+"""Recalcule les esquisses de retard (lateness_bins) à partir des pointages, archives comprises.
+
+Usage : python lateness_rollup.py [--start AAAA-MM-JJ] [--end AAAA-MM-JJ]
+
+À lancer après la migration qui crée lateness_bins, ou après une correction
+de pointages hors API. Les mois entiers couvrant la période sont recalculés
+(par défaut : depuis le premier pointage, archives comprises).
+"""
+import argparse
+import sys
+from datetime import date
+
+sys.path.append('.')
+
+from sqlalchemy import func
+
+from app.database import SessionLocal
+from app.models.attendance import Attendance
+from app.utils.archive import archived_months
+from app.utils.lateness import rebuild_lateness
+
+
+def first_attendance_day(db, end: date) -> date:
+    """Premier jour pointé, dans la table ou dans les archives"""
+    candidates = archived_months(date(2000, 1, 1), end)[:1]
+    first = db.query(func.min(Attendance.date)).scalar()
+    if first:
+        candidates.append(date.fromisoformat(first))
+    return min(candidates, default=end)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--end", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    end = args.end or date.today()
+    db = SessionLocal()
+    try:
+        start = args.start or first_attendance_day(db, end)
+        arrivals = rebuild_lateness(db, start, end)
+    finally:
+        db.close()
+
+    print(f"✅ {arrivals} arrivées reportées dans les esquisses du {start.isoformat()} au {end.isoformat()}")
+
+
+if __name__ == "__main__":
+    main()